@@ -0,0 +1,42 @@
+"""feat(events): append-only game event log, with the state column kept as a periodic snapshot
+
+Revision ID: 5a8c3e1f7b42
+Revises: 9e2b5c7a1d34
+Create Date: 2026-10-19 17:05:12.481930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a8c3e1f7b42'
+down_revision: Union[str, None] = '9e2b5c7a1d34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing games start with an empty log; their current state is their snapshot.
+    op.add_column('games', sa.Column('revision', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('games', sa.Column('snapshot', sa.Integer(), nullable=False, server_default='0'))
+
+    op.create_table('game_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('game', sa.String(length=50), nullable=True),
+    sa.Column('revision', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=50), nullable=False),
+    sa.Column('data', sa.JSON(), nullable=False),
+    sa.Column('created', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['game'], ['games.id'], name='fk_game_events_games_id_game', onupdate='CASCADE', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('game', 'revision', name='uc_game_events_game_revision')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('game_events')
+    op.drop_column('games', 'snapshot')
+    op.drop_column('games', 'revision')
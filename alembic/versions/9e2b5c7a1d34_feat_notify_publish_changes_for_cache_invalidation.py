@@ -0,0 +1,86 @@
+"""feat(notify): publish row changes for cross-process cache invalidation, and record each reminder's guild
+
+Revision ID: 9e2b5c7a1d34
+Revises: 4c8d0e6a91f2
+Create Date: 2026-10-19 14:22:41.907315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e2b5c7a1d34'
+down_revision: Union[str, None] = '4c8d0e6a91f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Each table publishes only the columns that identify what changed; listeners reload anything else they need.
+WATCHED = {
+    'games': ('id', 'guild', 'channel'),
+    'active_games': ('id', 'game'),
+    'participants': ('game', 'member'),
+    'threads': ('id', 'game'),
+    'reminders': ('id', 'guild'),
+}
+
+
+def upgrade() -> None:
+    op.add_column('reminders', sa.Column('guild', sa.BigInteger(), nullable=True))
+
+    # Reminders made through a game belong to that game's guild; older standalone reminders can't be placed.
+    op.execute(
+        """
+        UPDATE reminders SET guild = games.guild
+        FROM game_reminders JOIN games ON games.id = game_reminders.game
+        WHERE game_reminders.reminder = reminders.id
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bureaucrat_notify() RETURNS trigger AS $$
+        DECLARE
+            data jsonb;
+            keys jsonb := '{}';
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                data := to_jsonb(OLD);
+            ELSE
+                data := to_jsonb(NEW);
+            END IF;
+
+            FOR i IN 0 .. TG_NARGS - 1 LOOP
+                keys := keys || jsonb_build_object(TG_ARGV[i], data -> TG_ARGV[i]);
+            END LOOP;
+
+            PERFORM pg_notify('bureaucrat_invalidate', jsonb_build_object(
+                'table', TG_TABLE_NAME,
+                'op', TG_OP,
+                'origin', current_setting('application_name', true),
+                'row', keys
+            )::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    for table, keys in WATCHED.items():
+        arguments = ", ".join(f"'{key}'" for key in keys)
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_notify AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION bureaucrat_notify({arguments})
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in WATCHED:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_notify ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bureaucrat_notify()")
+    op.drop_column('reminders', 'guild')
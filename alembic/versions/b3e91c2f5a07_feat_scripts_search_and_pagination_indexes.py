@@ -0,0 +1,35 @@
+"""feat(scripts): search and pagination indexes
+
+Revision ID: b3e91c2f5a07
+Revises: 6671717ca2c6
+Create Date: 2026-10-19 10:12:41.207113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e91c2f5a07'
+down_revision: Union[str, None] = '6671717ca2c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Substring searches (ILIKE '%...%') can only use a trigram index.
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_scripts_name_trgm', 'scripts', ['name'], unique=False,
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+    op.create_index('ix_scripts_author_created', 'scripts', ['author', 'created'], unique=False)
+    op.create_index('ix_scripts_created_id', 'scripts', ['created', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scripts_created_id', table_name='scripts')
+    op.drop_index('ix_scripts_author_created', table_name='scripts')
+    op.drop_index('ix_scripts_name_trgm', table_name='scripts')
@@ -0,0 +1,35 @@
+"""feat(days): cold storage for each game's finished days
+
+Revision ID: c71e4b9d2a08
+Revises: 5a8c3e1f7b42
+Create Date: 2026-10-19 18:31:47.106254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71e4b9d2a08'
+down_revision: Union[str, None] = '5a8c3e1f7b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Games already running keep their past days in their state until their next dusk, which moves them all out.
+    op.create_table('game_days',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('game', sa.String(length=50), nullable=True),
+    sa.Column('day', sa.Integer(), nullable=False),
+    sa.Column('state', sa.JSON(), nullable=False),
+    sa.ForeignKeyConstraint(['game'], ['games.id'], name='fk_game_days_games_id_game', onupdate='CASCADE', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('game', 'day', name='uc_game_days_game_day')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('game_days')
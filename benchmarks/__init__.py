@@ -0,0 +1,17 @@
+"""
+Benchmarks for Bureaucrat's state, rendering and command paths.
+
+Run them from the repository root, e.g. `poetry run python -m benchmarks.run --out bench.json`,
+and compare two runs with `poetry run python -m benchmarks.compare old.json new.json`.
+"""
+
+import os
+import sys
+
+# Bureaucrat lives under src/, which isn't on the path when running from the repository root.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+# Importing Bureaucrat configures the database without connecting to it, which needs some URL; benchmarks that do connect
+# need a scratch database named by DATABASE_URL, and check DATABASE rather than the placeholder.
+DATABASE = bool(os.getenv("DATABASE_URL"))
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/bureaucrat")
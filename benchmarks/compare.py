@@ -0,0 +1,43 @@
+import argparse
+import json
+import sys
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark runs and flag regressions.")
+    parser.add_argument("old", help="results from the baseline commit")
+    parser.add_argument("new", help="results from the commit under test")
+    parser.add_argument("--metric", help="which statistic to compare", default="p50_us")
+    parser.add_argument("--threshold", help="relative slowdown that counts as a regression", type=float, default=0.10)
+    args = parser.parse_args()
+
+    with open(args.old) as file:
+        old = json.load(file)
+    with open(args.new) as file:
+        new = json.load(file)
+
+    print(f"{old.get('commit')} -> {new.get('commit')} ({args.metric})\n")
+    print(f"{'benchmark':<40} {'old':>12} {'new':>12} {'change':>9}")
+
+    regressions = []
+    for name in sorted(set(old["results"]) | set(new["results"])):
+        before = old["results"].get(name, {}).get(args.metric)
+        after = new["results"].get(name, {}).get(args.metric)
+        if before is None or after is None:
+            print(f"{name:<40} {before if before is not None else '-':>12} {after if after is not None else '-':>12} {'':>9}")
+            continue
+
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > args.threshold:
+            regressions.append(name)
+            flag = "  <-- slower"
+        print(f"{name:<40} {before:>12.1f} {after:>12.1f} {change:>+8.1%}{flag}")
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+import asyncio
+import itertools
+
+from bureaucrat import Bureaucrat, Config
+from bureaucrat.utility import metrics
+from discord.utils import MISSING
+from dotmap import DotMap
+from typing import Any, Dict, List, Optional
+
+
+EMOJI = {
+    "alive": "🟢",
+    "dead": "💀",
+    "spent": "⚫",
+    "thief": "🦹",
+    "bureaucrat": "📜",
+    "marked": "🪦",
+    "guilds": [],
+}
+
+_snowflakes = itertools.count(9 * 10**17)
+
+
+def snowflake():
+    return next(_snowflakes)
+
+
+class RenderBot:
+    """
+    Just enough of a bot for the state renderers, which only read emoji config.
+    """
+
+    def __init__(self):
+        self.config = DotMap({"emoji": EMOJI})
+        self.emojis = []
+
+
+class Latency:
+    """
+    Simulated Discord REST latency. Every fake REST call sleeps for this long and is charged to the rest phase.
+    """
+
+    def __init__(self, seconds: float = 0.0):
+        self.seconds = seconds
+
+    async def __call__(self):
+        with metrics.phase("rest"):
+            await asyncio.sleep(self.seconds)
+
+
+class FakeAsset:
+
+    def __init__(self, url: str):
+        self.url = url
+
+
+class FakeUser:
+
+    def __init__(self, id: int, name: str, *, latency: Latency):
+        self.id = id
+        self.name = name
+        self.display_name = name
+        self.global_name = name
+        self.bot = False
+        self.avatar = FakeAsset(f"https://cdn.discordapp.com/embed/avatars/{id % 5}.png")
+        self.latency = latency
+
+    @property
+    def mention(self):
+        return f"<@{self.id}>"
+
+
+class FakeRole:
+
+    def __init__(self, id: int, name: str):
+        self.id = id
+        self.name = name
+
+    @property
+    def mention(self):
+        return f"<@&{self.id}>"
+
+
+class FakeMember(FakeUser):
+
+    def __init__(self, id: int, name: str, *, guild: "FakeGuild", latency: Latency):
+        super().__init__(id, name, latency=latency)
+        self.guild = guild
+        self.roles: List[FakeRole] = []
+
+    async def add_roles(self, *roles, **kwargs):
+        await self.latency()
+        self.roles.extend(role for role in roles if role is not None and role not in self.roles)
+
+    async def remove_roles(self, *roles, **kwargs):
+        await self.latency()
+        self.roles = [role for role in self.roles if role not in roles]
+
+
+class FakeMessage:
+
+    def __init__(self, channel: Any, *, content: Optional[str] = None, embed: Any = None, **kwargs):
+        self.id = snowflake()
+        self.channel = channel
+        self.content = content
+        self.embed = embed
+
+    async def edit(self, *, content: Optional[str] = MISSING, embed: Any = MISSING, **kwargs):
+        await self.channel.latency()
+        if content is not MISSING:
+            self.content = content
+        if embed is not MISSING:
+            self.embed = embed
+        return self
+
+    async def delete(self, **kwargs):
+        await self.channel.latency()
+
+
+class FakeChannel:
+
+    def __init__(self, id: int, name: str, *, guild: "FakeGuild", latency: Latency):
+        self.id = id
+        self.name = name
+        self.guild = guild
+        self.latency = latency
+        self.messages: List[FakeMessage] = []
+
+    @property
+    def mention(self):
+        return f"<#{self.id}>"
+
+    async def send(self, content: Optional[str] = None, **kwargs):
+        await self.latency()
+        message = FakeMessage(self, content=content, **kwargs)
+        self.messages.append(message)
+        return message
+
+    async def fetch_message(self, id: int):
+        await self.latency()
+        return next(message for message in self.messages if message.id == id)
+
+    async def create_thread(self, *, name: str, **kwargs):
+        await self.latency()
+        thread = FakeThread(snowflake(), name, parent=self, latency=self.latency)
+        self.guild.channels[thread.id] = thread
+        return thread
+
+
+class FakeThread(FakeChannel):
+
+    def __init__(self, id: int, name: str, *, parent: FakeChannel, latency: Latency):
+        super().__init__(id, name, guild=parent.guild, latency=latency)
+        self.parent = parent
+        self.members: set[int] = set()
+
+    async def add_user(self, user):
+        await self.latency()
+        self.members.add(user.id)
+
+    async def remove_user(self, user):
+        await self.latency()
+        self.members.discard(user.id)
+
+
+class FakeGuild:
+
+    def __init__(self, id: int, *, latency: Latency):
+        self.id = id
+        self.name = f"Guild {id}"
+        self.latency = latency
+        self.filesize_limit = 25 * 1024 * 1024
+        self.members: Dict[int, FakeMember] = {}
+        self.channels: Dict[int, FakeChannel] = {}
+        self.roles: Dict[int, FakeRole] = {}
+
+    def add_member(self, id: int, name: str) -> FakeMember:
+        member = FakeMember(id, name, guild=self, latency=self.latency)
+        self.members[id] = member
+        return member
+
+    def add_channel(self, id: int, name: str) -> FakeChannel:
+        channel = FakeChannel(id, name, guild=self, latency=self.latency)
+        self.channels[id] = channel
+        return channel
+
+    def add_role(self, id: int, name: str) -> FakeRole:
+        role = FakeRole(id, name)
+        self.roles[id] = role
+        return role
+
+    def get_member(self, id: int):
+        return self.members.get(id)
+
+    async def fetch_member(self, id: int):
+        await self.latency()
+        return self.members[id]
+
+    def get_channel(self, id: int):
+        return self.channels.get(id)
+
+    async def fetch_channel(self, id: int):
+        await self.latency()
+        return self.channels[id]
+
+    def get_role(self, id: int):
+        return self.roles.get(id)
+
+    async def fetch_roles(self):
+        await self.latency()
+        return list(self.roles.values())
+
+
+class FakeResponse:
+
+    def __init__(self, interaction: "FakeInteraction"):
+        self.interaction = interaction
+        self.done = False
+
+    def is_done(self):
+        return self.done
+
+    async def _respond(self):
+        if self.done:
+            raise RuntimeError("This interaction has already been responded to before.")
+        self.done = True
+        await self.interaction.latency()
+
+    async def send_message(self, content: Optional[str] = None, **kwargs):
+        await self._respond()
+        self.interaction.messages.append(FakeMessage(self.interaction.channel, content=content, **kwargs))
+
+    async def defer(self, **kwargs):
+        await self._respond()
+
+    async def edit_message(self, **kwargs):
+        await self._respond()
+
+    async def send_modal(self, modal):
+        await self._respond()
+
+
+class FakeFollowup:
+
+    def __init__(self, interaction: "FakeInteraction"):
+        self.interaction = interaction
+
+    async def send(self, content: Optional[str] = None, **kwargs):
+        await self.interaction.latency()
+        message = FakeMessage(self.interaction.channel, content=content, **kwargs)
+        self.interaction.messages.append(message)
+        return message
+
+
+class FakeInteraction:
+    """
+    A stand-in for discord.Interaction, recording everything that was sent in response.
+    """
+
+    def __init__(self, *, user: FakeMember, channel: FakeChannel):
+        self.id = snowflake()
+        self.user = user
+        self.guild = channel.guild
+        self.guild_id = channel.guild.id
+        self.channel = channel
+        self.channel_id = channel.id
+        self.latency = channel.latency
+        self.messages: List[FakeMessage] = []
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+
+    async def edit_original_response(self, **kwargs):
+        await self.latency()
+
+    async def original_response(self):
+        await self.latency()
+        return self.messages[0] if self.messages else None
+
+
+class HarnessBot(Bureaucrat):
+    """
+    A Bureaucrat that never connects to the gateway. Channels and members come from the fake guilds registered on it,
+    and the cogs are driven by invoking their command callbacks directly.
+    """
+
+    def __init__(self, *, config: Optional[dict] = None, latency: Optional[Latency] = None):
+        options = {"log_level": "warn", "owners": [], "prefix": "$", "home_guild": 0, "emoji": EMOJI}
+        options.update(config or {})
+        super().__init__(config=Config(**options))
+        self.latency_model = latency or Latency()
+        self.guilds_by_id: Dict[int, FakeGuild] = {}
+        self._user = FakeUser(snowflake(), "Bureaucrat", latency=self.latency_model)
+        self._commands = None
+
+    @property
+    def user(self):
+        return self._user
+
+    @property
+    def emojis(self):
+        return []
+
+    def add_guild(self) -> FakeGuild:
+        guild = FakeGuild(snowflake(), latency=self.latency_model)
+        self.guilds_by_id[guild.id] = guild
+        return guild
+
+    def get_channel(self, id: int):
+        return next((g.channels[id] for g in self.guilds_by_id.values() if id in g.channels), None)
+
+    async def fetch_channel(self, id: int):
+        await self.latency_model()
+        return self.get_channel(id)
+
+    def get_channel_id(self, channel):
+        return channel.parent.id if isinstance(channel, FakeThread) else channel.id
+
+    async def start_harness(self):
+        """
+        Connects to the database and loads every cog, as setup_hook would on login.
+        """
+        await self.setup_hook()
+
+    async def invoke(self, name: str, interaction: FakeInteraction, **params):
+        """
+        Runs an app command by its qualified name (e.g. "nominations vote lock"), as the command tree would.
+        Optional parameters that aren't given are passed as their defaults.
+        """
+        if self._commands is None:
+            self._commands = {command.qualified_name: command for command in self.tree.walk_commands()}
+
+        command = self._commands[name]
+        for param in command.parameters:
+            if param.name not in params:
+                params[param.name] = None if param.default is MISSING else param.default
+        return await command.callback(command.binding, interaction, **params)
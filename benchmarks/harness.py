@@ -0,0 +1,121 @@
+import inspect
+import json
+import platform
+import statistics
+import subprocess
+import time
+
+from bureaucrat.utility.metrics import quantile
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    """
+    Reduces a list of timings (in seconds) to the statistics recorded for each benchmark, in microseconds.
+    """
+    timings = sorted(timings)
+    return {
+        "n": len(timings),
+        "mean_us": statistics.fmean(timings) * 1e6,
+        "p50_us": quantile(timings, 0.50) * 1e6,
+        "p95_us": quantile(timings, 0.95) * 1e6,
+        "p99_us": quantile(timings, 0.99) * 1e6,
+        "min_us": timings[0] * 1e6,
+    }
+
+
+class Suite:
+    """
+    Collects benchmark results, and writes them out alongside enough context to compare runs across commits.
+    """
+
+    def __init__(self, *, repeat: int = 200, warmup: int = 20, filter: Optional[str] = None):
+        self.repeat = repeat
+        self.warmup = warmup
+        self.filter = filter
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    def wants(self, name: str):
+        return self.filter is None or self.filter in name
+
+    def bench(self, name: str, func: Callable[[Any], Any], *, setup: Callable[[], Any] = lambda: None, repeat: Optional[int] = None):
+        """
+        Times a synchronous function. The setup function runs before every call, and its result is passed in untimed.
+        """
+        if not self.wants(name):
+            return
+
+        repeat = repeat if repeat is not None else self.repeat
+        timings = []
+        for i in range(self.warmup + repeat):
+            arg = setup()
+            start = time.perf_counter()
+            func(arg)
+            elapsed = time.perf_counter() - start
+            if i >= self.warmup:
+                timings.append(elapsed)
+        self.record(name, summarize(timings))
+
+    async def bench_async(
+        self,
+        name: str,
+        func: Callable[[Any], Awaitable[Any]],
+        *,
+        setup: Callable[[], Any] = lambda: None,
+        repeat: Optional[int] = None,
+        extra: Optional[Callable[[], Dict[str, Any]]] = None,
+    ):
+        """
+        Times a coroutine function; the setup function may itself be a coroutine function.
+        """
+        if not self.wants(name):
+            return
+
+        repeat = repeat if repeat is not None else self.repeat
+        timings = []
+        for i in range(self.warmup + repeat):
+            arg = setup()
+            if inspect.isawaitable(arg):
+                arg = await arg
+            start = time.perf_counter()
+            await func(arg)
+            elapsed = time.perf_counter() - start
+            if i >= self.warmup:
+                timings.append(elapsed)
+
+        result = summarize(timings)
+        if extra is not None:
+            result.update(extra())
+        self.record(name, result)
+
+    def record(self, name: str, result: Dict[str, Any]):
+        self.results[name] = result
+        print(f"{name:<48} p50 {result['p50_us']:>10.1f} us   p95 {result['p95_us']:>10.1f} us   n={result['n']}")
+
+    def dump(self, path: str):
+        """
+        Writes the results, tagged with the commit and interpreter they were measured on.
+        """
+        document = {
+            "commit": git_commit(),
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "repeat": self.repeat,
+            "results": self.results,
+        }
+        with open(path, "w") as file:
+            json.dump(document, file, indent=2, sort_keys=True)
+
+
+def git_commit() -> Optional[str]:
+    """
+    Gets the current commit, marking it dirty if the tree has uncommitted changes.
+    """
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+        dirty = subprocess.check_output(["git", "status", "--porcelain", "--untracked-files=no"], text=True).strip()
+        return f"{commit}-dirty" if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,75 @@
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from .harness import Suite, summarize
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# What startup imports before connecting: the package, and then every cog module. The cogs are imported with import
+# statements, since -X importtime doesn't see importlib.import_module.
+STARTUP = "import bureaucrat; exec(';'.join(f'import bureaucrat.{name}' for name in bureaucrat.Bureaucrat.COG_MODULES))"
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def profile() -> Dict[str, Tuple[int, int]]:
+    """
+    Imports the bot in a fresh interpreter under -X importtime, and gets each module's (self, cumulative) time in us.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.path.join(ROOT, "src"), env.get("PYTHONPATH")]))
+    # The database is only configured at import time, never connected to, so any URL will do.
+    env.setdefault("DATABASE_URL", "postgresql://localhost/bureaucrat")
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP], env=env, capture_output=True, text=True, check=True
+    )
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            modules[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile how long Bureaucrat takes to import, using python -X importtime.")
+    parser.add_argument("--out", help="where to write the results", default="importtime.json")
+    parser.add_argument("--repeat", help="number of fresh interpreters to profile", type=int, default=10)
+    parser.add_argument("--top", help="how many of the slowest modules to list", type=int, default=20)
+    args = parser.parse_args()
+
+    runs: List[Dict[str, Tuple[int, int]]] = [profile() for _ in range(args.repeat)]
+
+    # Track the package and each of its top-level modules (the cogs, models and utilities) across commits;
+    # everything else is listed for context.
+    suite = Suite(repeat=args.repeat, warmup=0)
+    tracked = sorted(name for name in runs[0] if re.fullmatch(r"bureaucrat(\.\w+)?", name))
+    for name in tracked:
+        timings = [run[name][1] / 1e6 for run in runs if name in run]
+        if timings:
+            suite.record(f"import {name}", summarize(timings))
+
+    self_times = defaultdict(list)
+    for run in runs:
+        for name, (own, _) in run.items():
+            self_times[name].append(own)
+
+    print(f"\nSlowest modules by self time (median of {args.repeat}, ms):")
+    medians = {name: sorted(times)[len(times) // 2] for name, times in self_times.items()}
+    for name, median in sorted(medians.items(), key=lambda item: item[1], reverse=True)[: args.top]:
+        print(f"  {median / 1000:>8.1f}  {name}")
+
+    suite.dump(args.out)
+    print(f"\nWrote {len(suite.results)} results to {args.out}.")
+
+
+if __name__ == "__main__":
+    main()
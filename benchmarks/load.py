@@ -0,0 +1,275 @@
+import argparse
+import asyncio
+import contextvars
+import json
+import random
+import time
+
+from bureaucrat.models.state import Status, VoteResult
+from bureaucrat.utility.metrics import quantile
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, List
+
+from . import DATABASE, synthetic
+from .fakes import FakeInteraction, HarnessBot, Latency
+from .harness import git_commit
+from .run import stored
+
+if TYPE_CHECKING:
+    from .world import Table
+
+
+class Recorder:
+    """
+    Collects the latency and outcome of every command the load generator sends.
+    """
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def all(self):
+        return sorted(value for values in self.latencies.values() for value in values)
+
+
+class LoopLag:
+    """
+    Measures event-loop lag: how late a timer that should fire every interval actually fires.
+    """
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.samples: List[float] = []
+        self.task = None
+
+    async def run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - start - self.interval))
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    def stop(self):
+        self.task.cancel()
+
+
+class PoolProbe:
+    """
+    Samples how many of the asyncpg pool's connections are checked out.
+    """
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.in_use: List[int] = []
+        self.max_size = 0
+        self.task = None
+
+    async def run(self):
+        from bureaucrat.models import CONFIG
+
+        while True:
+            pool = CONFIG.database._backend._pool
+            if pool is not None:
+                self.max_size = pool.get_max_size()
+                self.in_use.append(pool.get_size() - pool.get_idle_size())
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    def stop(self):
+        self.task.cancel()
+
+
+class Session:
+    """
+    Plays one seeded game: chatter, nominations with vote bursts, a storyteller counting votes, and phase changes.
+    """
+
+    def __init__(self, *, bot: HarnessBot, table: "Table", recorder: Recorder, rng: random.Random, think: float):
+        self.bot = bot
+        self.table = table
+        self.recorder = recorder
+        self.rng = rng
+        self.think = think
+        self.seats = table.state["seating"]["seats"]
+        self.members = {seat["id"]: player for seat, player in zip(self.seats, table.players)}
+        today = table.state["nominations"]["days"].get(str(table.state["moment"]["day"]), [])
+        self.nominators = {nom["nominator"] for nom in today}
+        self.nominees = {nom["nominee"] for nom in today}
+
+    async def pause(self, scale: float = 1.0):
+        await asyncio.sleep(self.rng.expovariate(1 / (self.think * scale)) if self.think > 0 else 0)
+
+    async def act(self, name: str, member, **params):
+        """
+        Sends one command in a fresh context, as discord.py dispatches each interaction in its own task.
+        """
+        interaction = FakeInteraction(user=member, channel=self.table.channel)
+
+        async def send():
+            start = time.perf_counter()
+            try:
+                await self.bot.invoke(name, interaction, **params)
+            except Exception:
+                self.recorder.errors[name] += 1
+            finally:
+                self.recorder.latencies[name].append(time.perf_counter() - start)
+
+        await asyncio.get_running_loop().create_task(send(), context=contextvars.Context())
+
+    def alive(self):
+        return [seat for seat in self.seats if not seat["removed"] and seat["status"] == Status.Alive.value]
+
+    def circle(self, nominee: str):
+        """
+        Gets the voters on a nomination, starting after the nominee.
+        """
+        index = next(i for i, seat in enumerate(self.seats) if seat["id"] == nominee)
+        order = self.seats[index + 1:] + self.seats[:index + 1]
+        return [seat for seat in order if not seat["removed"]]
+
+    async def chatter(self, count: int):
+        reads = ["seating show", "nominations list", "phases show", "threads list"]
+        for _ in range(count):
+            seat = self.rng.choice(self.seats)
+            await self.act(self.rng.choice(reads), self.members[seat["id"]])
+            await self.pause(0.5)
+
+    async def nominate(self):
+        nominators = [seat for seat in self.alive() if seat["id"] not in self.nominators]
+        nominees = [seat for seat in self.seats if not seat["removed"] and seat["id"] not in self.nominees]
+        if not nominators or not nominees:
+            return
+
+        nominator, nominee = self.rng.choice(nominators), self.rng.choice(nominees)
+        self.nominators.add(nominator["id"])
+        self.nominees.add(nominee["id"])
+        await self.act("nominations nominate", self.members[nominator["id"]], nominee=nominee["id"])
+
+        # Everyone piles in with a vote at once, and then the storyteller counts the circle one hand at a time.
+        voters = self.circle(nominee["id"])
+        await asyncio.gather(*(
+            self.act("nominations vote set", self.members[seat["id"]], nominee=nominee["id"], vote=self.rng.choice(["yes", "no"]))
+            for seat in voters
+        ))
+        for seat in voters:
+            result = self.rng.choice([VoteResult.Yes, VoteResult.No])
+            await self.act("nominations vote lock", self.table.owner, nominee=nominee["id"], voter=seat["id"], result=result)
+            await self.pause(0.1)
+
+    async def play(self, days: int):
+        for _ in range(days):
+            await self.chatter(self.rng.randint(2, 6))
+            await self.act("reminders new", self.table.owner, message="Nominations close soon.", duration="1h", intervals="30m")
+            if self.rng.random() < 0.3:
+                first, second = self.rng.sample(self.table.players, k=2)
+                await self.act("threads whisper", first, player=second)
+
+            for _ in range(self.rng.randint(1, 4)):
+                await self.nominate()
+                await self.pause()
+
+            await self.act("phases go dusk", self.table.owner)
+            await self.pause()
+            await self.act("phases go dawn", self.table.owner)
+            self.nominators.clear()
+            self.nominees.clear()
+
+
+async def simulate(args) -> dict:
+    from .world import World, migrate
+
+    migrate()
+    bot = HarnessBot(config={"metrics": {"window": 100_000}, "database": {"max_size": args.pool}}, latency=Latency(args.latency))
+    await bot.start_harness()
+
+    world = World(bot)
+    tables = await world.populate(stored(synthetic.make_states(args.games, seed=args.seed)))
+
+    recorder, lag, pool = Recorder(), LoopLag(), PoolProbe()
+    lag.start()
+    pool.start()
+
+    async def start(i: int, table):
+        # Stagger the games so they don't all open in lockstep.
+        await asyncio.sleep(args.ramp * i / max(1, len(tables)))
+        session = Session(bot=bot, table=table, recorder=recorder, rng=random.Random(args.seed + i), think=args.think)
+        await session.play(args.days)
+
+    try:
+        await asyncio.gather(*(start(i, table) for i, table in enumerate(tables)))
+    finally:
+        recorder.finished = time.perf_counter()
+        lag.stop()
+        pool.stop()
+        await world.teardown()
+        await bot.close()
+
+    return report(args, recorder, lag, pool)
+
+
+def report(args, recorder: Recorder, lag: LoopLag, pool: PoolProbe) -> dict:
+    elapsed = recorder.finished - recorder.started
+    latencies = recorder.all()
+    lags = sorted(lag.samples)
+    in_use = sorted(pool.in_use)
+
+    def stats(values: List[float]):
+        return {f"p{int(q * 100)}_ms": quantile(values, q) * 1000 for q in (0.5, 0.95, 0.99)} | {"max_ms": (values[-1] if values else 0.0) * 1000}
+
+    return {
+        "commit": git_commit(),
+        "games": args.games,
+        "days": args.days,
+        "elapsed_s": elapsed,
+        "commands": len(latencies),
+        "errors": sum(recorder.errors.values()),
+        "throughput_per_s": len(latencies) / elapsed if elapsed else 0.0,
+        "latency": stats(latencies),
+        "by_command": {name: stats(sorted(values)) | {"n": len(values), "errors": recorder.errors.get(name, 0)} for name, values in sorted(recorder.latencies.items())},
+        "loop_lag": stats(lags),
+        "pool": {
+            "max_size": pool.max_size,
+            "peak_in_use": in_use[-1] if in_use else 0,
+            "p95_in_use": quantile(in_use, 0.95),
+            "saturated": sum(1 for n in in_use if pool.max_size and n >= pool.max_size) / len(in_use) if in_use else 0.0,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate many concurrent games against the real cogs, with Discord faked out.")
+    parser.add_argument("--games", help="number of concurrent games", type=int, default=200)
+    parser.add_argument("--days", help="days each game plays", type=int, default=2)
+    parser.add_argument("--think", help="mean pause between a game's actions, in seconds", type=float, default=0.2)
+    parser.add_argument("--ramp", help="seconds over which games start", type=float, default=5.0)
+    parser.add_argument("--latency", help="simulated Discord REST latency, in seconds", type=float, default=0.05)
+    parser.add_argument("--pool", help="maximum database pool size", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="also write the report as JSON")
+    args = parser.parse_args()
+
+    if not DATABASE:
+        parser.error("DATABASE_URL must point at a scratch database.")
+
+    result = asyncio.run(simulate(args))
+
+    print(f"{result['commands']} commands from {result['games']} games in {result['elapsed_s']:.1f}s ({result['throughput_per_s']:.1f}/s), {result['errors']} errors")
+    print(f"latency   p50 {result['latency']['p50_ms']:.1f} ms   p95 {result['latency']['p95_ms']:.1f} ms   p99 {result['latency']['p99_ms']:.1f} ms   max {result['latency']['max_ms']:.1f} ms")
+    print(f"loop lag  p50 {result['loop_lag']['p50_ms']:.1f} ms   p99 {result['loop_lag']['p99_ms']:.1f} ms   max {result['loop_lag']['max_ms']:.1f} ms")
+    print(f"pool      peak {result['pool']['peak_in_use']}/{result['pool']['max_size']} connections, saturated {result['pool']['saturated']:.0%} of the time")
+    for name, stats in result["by_command"].items():
+        print(f"  {name:<28} n={stats['n']:<6} p50 {stats['p50_ms']:>8.1f} ms   p99 {stats['p99_ms']:>8.1f} ms   errors {stats['errors']}")
+
+    if args.out:
+        with open(args.out, "w") as file:
+            json.dump(result, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
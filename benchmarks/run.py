@@ -0,0 +1,206 @@
+import argparse
+import asyncio
+import copy
+import itertools
+import json
+
+from bureaucrat.models.state import State, Status, VoteResult
+from typing import List
+
+from . import DATABASE, synthetic
+from .fakes import FakeInteraction, HarnessBot, Latency, RenderBot
+from .harness import Suite
+
+
+def stored(states: List[dict]) -> List[dict]:
+    """
+    Round-trips states through JSON, so that they look exactly like what comes back from the database.
+    """
+    return [json.loads(json.dumps(state)) for state in states]
+
+
+def nomination_targets(state: State):
+    """
+    Picks a nominator and nominee that Nominations.create will accept today, if there are any.
+    """
+    today = state.nominations.get_nominations(state.moment.day)
+    nominators = {nom.nominator for nom in today}
+    nominees = {nom.nominee for nom in today}
+    nominator = next((s.id for s in state.seating.seats if s.status == Status.Alive and not s.removed and s.id not in nominators), None)
+    nominee = next((s.id for s in state.seating.seats if not s.removed and s.id not in nominees), None)
+    return (nominator, nominee) if nominator and nominee else None
+
+
+def bench_state(suite: Suite, states: List[dict]):
+    """
+    Benchmarks the pure state paths: (de)serialization, nominating, and every page renderer.
+    """
+    bot = RenderBot()
+    raw = itertools.cycle(states)
+    loaded = [State.load(copy.deepcopy(data)) for data in states]
+    cycle = itertools.cycle(loaded)
+
+    suite.bench("state.load", lambda data: State.load(data), setup=lambda: copy.deepcopy(next(raw)))
+    suite.bench("state.dump", lambda state: json.dumps(state.dump()), setup=lambda: next(cycle))
+
+    creatable = [data for data in states if nomination_targets(State.load(copy.deepcopy(data)))]
+    fresh = itertools.cycle(creatable)
+
+    def setup_create():
+        state = State.load(copy.deepcopy(next(fresh)))
+        return state, nomination_targets(state)
+
+    def create(arg):
+        state, (nominator, nominee) = arg
+        state.nominations.create(state=state, nominator=nominator, nominee=nominee)
+
+    suite.bench("nominations.create", create, setup=setup_create)
+
+    with_votes = [(state, nom) for state in loaded for day in state.nominations.days.values() for nom in day]
+    votes = itertools.cycle(with_votes)
+    suite.bench(
+        "nomination.make_voting_log",
+        lambda pair: pair[1].make_voting_log(bot=bot, state=pair[0], private=True, viewer=None),
+        setup=lambda: next(votes),
+    )
+    suite.bench(
+        "nominations.make_page",
+        lambda state: state.nominations.make_page(bot=bot, day=None, state=state, private=False, viewer=None),
+        setup=lambda: next(cycle),
+    )
+    suite.bench("seating.make_page", lambda state: state.seating.make_page(bot=bot, private=True), setup=lambda: next(cycle))
+    suite.bench(
+        "state.make_nightorder",
+        lambda state: state.make_nightorder(bot=bot, night="first", filter=True, private=True),
+        setup=lambda: next(cycle),
+    )
+
+
+async def bench_commands(suite: Suite, states: List[dict], *, latency: float):
+    """
+    Benchmarks whole command handlers against the database in DATABASE_URL, with Discord faked out.
+    """
+    from .world import World, migrate
+
+    migrate()
+    bot = HarnessBot(config={"metrics": {"window": suite.warmup + suite.repeat}}, latency=Latency(latency))
+    await bot.start_harness()
+    world = World(bot)
+    tables = await world.populate(states)
+
+    def phases(name: str):
+        # The bot's own metrics break each command down by phase; keep the medians alongside the totals.
+        count, quantiles = bot.metrics.summary().get(f"/{name}", (0, {}))
+        return {"phases_p50_us": {phase: values[0] * 1e6 for phase, values in quantiles.items() if phase != "total"}}
+
+    rotation = itertools.cycle(tables)
+
+    def as_player():
+        table = next(rotation)
+        return table, FakeInteraction(user=table.players[0], channel=table.channel)
+
+    def as_storyteller():
+        table = next(rotation)
+        return table, FakeInteraction(user=table.owner, channel=table.channel)
+
+    def today(table):
+        state = State.load(copy.deepcopy(table.state))
+        return state, state.nominations.get_nominations(state.moment.day)
+
+    async def run(name, arg, **params):
+        table, interaction = arg
+        await bot.invoke(name, interaction, **params)
+
+    for name in ("seating show", "nominations list", "phases show"):
+        await suite.bench_async(name, lambda arg, name=name: run(name, arg), setup=as_player, extra=lambda name=name: phases(name))
+
+    await suite.bench_async(
+        "phases nights first",
+        lambda arg: run("phases nights first", arg, filter=True),
+        setup=as_storyteller,
+        extra=lambda: phases("phases nights first"),
+    )
+
+    voting = [table for table in tables if today(table)[1]]
+    voting_rotation = itertools.cycle(voting)
+
+    def on_nomination(storyteller: bool):
+        def setup():
+            table = next(voting_rotation)
+            state, noms = today(table)
+            user = table.owner if storyteller else table.players[0]
+            return table, FakeInteraction(user=user, channel=table.channel), noms[0]
+        return setup
+
+    async def show(arg):
+        table, interaction, nom = arg
+        await bot.invoke("nominations show", interaction, nominee=nom.nominee)
+
+    async def vote(arg):
+        table, interaction, nom = arg
+        await bot.invoke("nominations vote set", interaction, nominee=nom.nominee, vote="yes")
+
+    async def lock(arg):
+        table, interaction, nom = arg
+        await bot.invoke("nominations vote lock", interaction, nominee=nom.nominee, voter=nom.voters[0].id, result=VoteResult.Yes)
+
+    await suite.bench_async("nominations show", show, setup=on_nomination(False), extra=lambda: phases("nominations show"))
+    await suite.bench_async("nominations vote set", vote, setup=on_nomination(False), extra=lambda: phases("nominations vote set"))
+    await suite.bench_async("nominations vote lock", lock, setup=on_nomination(True), extra=lambda: phases("nominations vote lock"))
+
+    # Nominating and advancing the phase change the game, so each run starts from the seeded state again (untimed).
+    nominating = itertools.cycle([table for table in tables if nomination_targets(State.load(copy.deepcopy(table.state)))])
+
+    async def setup_nominate():
+        table = next(nominating)
+        await world.reset(table)
+        nominator, nominee = nomination_targets(State.load(copy.deepcopy(table.state)))
+        member = next(player for player in table.players if table.seat_of(player) == nominator)
+        return table, FakeInteraction(user=member, channel=table.channel), nominee
+
+    async def nominate(arg):
+        table, interaction, nominee = arg
+        await bot.invoke("nominations nominate", interaction, nominee=nominee)
+
+    await suite.bench_async("nominations nominate", nominate, setup=setup_nominate, extra=lambda: phases("nominations nominate"))
+
+    async def setup_dusk():
+        table, interaction = as_storyteller()
+        await world.reset(table)
+        return table, interaction
+
+    await suite.bench_async(
+        "phases go dusk", lambda arg: run("phases go dusk", arg), setup=setup_dusk, extra=lambda: phases("phases go dusk")
+    )
+
+    await world.teardown()
+    await bot.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Bureaucrat's benchmarks and write the results as JSON.")
+    parser.add_argument("--out", help="where to write the results", default="bench.json")
+    parser.add_argument("--games", help="number of synthetic games", type=int, default=50)
+    parser.add_argument("--seed", help="seed for the synthetic games", type=int, default=0)
+    parser.add_argument("--repeat", help="timed iterations per benchmark", type=int, default=200)
+    parser.add_argument("--warmup", help="untimed iterations per benchmark", type=int, default=20)
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this")
+    parser.add_argument("--commands", help="also benchmark command handlers against DATABASE_URL", action="store_true")
+    parser.add_argument("--latency", help="simulated Discord REST latency for command benchmarks, in seconds", type=float, default=0.0)
+    args = parser.parse_args()
+
+    suite = Suite(repeat=args.repeat, warmup=args.warmup, filter=args.filter)
+    states = stored(synthetic.make_states(args.games, seed=args.seed))
+
+    bench_state(suite, states)
+    if args.commands:
+        if not DATABASE:
+            parser.error("--commands needs DATABASE_URL to point at a scratch database.")
+        asyncio.run(bench_commands(suite, states, latency=args.latency))
+
+    suite.dump(args.out)
+    print(f"Wrote {len(suite.results)} results to {args.out}.")
+
+
+if __name__ == "__main__":
+    main()
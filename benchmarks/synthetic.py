@@ -0,0 +1,121 @@
+import random
+
+from bureaucrat.models.state import NominationType, Phase, Status, Type, VoteResult
+from typing import List
+
+
+SPECIAL = ["DUSK", "MINION", "DEMON", "DAWN"]
+ROLES = [f"role{i:02d}" for i in range(40)]
+VOTES = ["yes", "no", "yes if they nominate", "no unless on the block", "hand up", None]
+
+
+def member_id(game: int, seat: int):
+    """
+    Gets a snowflake-looking member id that is unique per (game, seat).
+    """
+    return 10**17 + game * 1000 + seat
+
+
+def make_seats(rng: random.Random, game: int, count: int) -> List[dict]:
+    """
+    Creates a seating of the given size, with a few travellers, dead or spent players, and removed seats.
+    """
+    seats = []
+    for i in range(count):
+        kind = Type.Traveller if rng.random() < 0.12 else Type.Player
+        status = rng.choices([Status.Alive, Status.Dead, Status.Spent], weights=[6, 2, 1])[0]
+        true = rng.choice(ROLES)
+        apparent = rng.choice(ROLES) if rng.random() < 0.2 else None
+        seats.append({
+            "id": f"g{game}s{i:02d}",
+            "member": member_id(game, i),
+            "alias": f"Player {i + 1}",
+            "kind": kind.value,
+            "roles": {"true": true, "apparent": apparent},
+            "status": status.value,
+            "removed": rng.random() < 0.05,
+        })
+    return seats
+
+
+def make_nomination(rng: random.Random, seats: List[dict], nominator: dict, nominee: dict, finished: bool) -> dict:
+    """
+    Creates a nomination whose voters start at the seat after the nominee, as Nominations.create does.
+    """
+    start = (seats.index(nominee) + 1) % len(seats)
+    order = [seat for seat in seats[start:] + seats[:start] if not seat["removed"]]
+
+    kind = NominationType.Execution if nominee["kind"] == Type.Player.value else NominationType.Exile
+    if kind == NominationType.Exile:
+        required = (len(seats) + 1) // 2
+    else:
+        required = (len([seat for seat in seats if seat["status"] == Status.Alive.value]) + 1) // 2
+
+    # On finished days every vote is locked; on the current day, only a prefix of the circle has been counted.
+    locked_until = len(order) if finished else rng.randint(0, len(order))
+    voters = []
+    for i, seat in enumerate(order):
+        locked = None
+        if i < locked_until:
+            locked = rng.choices([VoteResult.Yes, VoteResult.No, VoteResult.Thief, VoteResult.Bureaucrat], weights=[8, 8, 1, 1])[0].value
+        voters.append({
+            "id": seat["id"],
+            "vote": rng.choice(VOTES),
+            "private_vote": rng.choice(VOTES) if rng.random() < 0.3 else None,
+            "locked": locked,
+        })
+
+    return {
+        "nominator": nominator["id"],
+        "nominee": nominee["id"],
+        "accusation": "They claimed a role that isn't on the script." if rng.random() < 0.7 else None,
+        "defense": "I am telling the truth." if rng.random() < 0.6 else None,
+        "kind": kind.value,
+        "required": required,
+        "voters": voters,
+        "marked": finished and rng.random() < 0.3,
+    }
+
+
+def make_state(seed: int, *, seats: int | None = None, days: int | None = None) -> dict:
+    """
+    Creates the stored JSON of a plausible game in progress: 5-25 seats, 1-10 days, with nominations on every day.
+    """
+    rng = random.Random(seed)
+    seats = seats if seats is not None else rng.randint(5, 25)
+    days = days if days is not None else rng.randint(1, 10)
+
+    seating = make_seats(rng, seed, seats)
+    nominations = {}
+    for day in range(1, days + 1):
+        alive = [seat for seat in seating if not seat["removed"] and seat["status"] == Status.Alive.value]
+        candidates = [seat for seat in seating if not seat["removed"]]
+        rng.shuffle(candidates)
+
+        nominations[day] = []
+        for nominee in candidates[: rng.randint(0, min(5, len(candidates)))]:
+            if not alive:
+                break
+            nominator = alive.pop(rng.randrange(len(alive)))
+            nominations[day].append(make_nomination(rng, seating, nominator, nominee, finished=day < days))
+
+    first = rng.sample(ROLES, k=20) + SPECIAL
+    other = rng.sample(ROLES, k=25) + SPECIAL[:1] + SPECIAL[3:]
+    rng.shuffle(first)
+    rng.shuffle(other)
+
+    return {
+        "mods": [],
+        "moment": {"day": days, "phase": Phase.Day.value},
+        "seating": {"seats": seating, "already_init": True},
+        "nominations": {"days": nominations},
+        "script": {"name": f"Synthetic {seed}", "roles": ROLES},
+        "nights": {"first": first, "other": other},
+    }
+
+
+def make_states(count: int, *, seed: int = 0) -> List[dict]:
+    """
+    Creates a reproducible population of games.
+    """
+    return [make_state(seed + i) for i in range(count)]
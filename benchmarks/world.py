@@ -0,0 +1,103 @@
+import os
+
+from bureaucrat.models.games import ActiveGame, Game, GameDay, GameEvent, ManagedThread, Participant, RoleType, ThreadType
+from datetime import datetime
+from typing import List
+
+from .fakes import FakeChannel, FakeGuild, FakeMember, FakeThread, HarnessBot, snowflake
+
+PREFIX = "bench-"
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def migrate():
+    """
+    Brings the benchmark database (DATABASE_URL) up to the latest migration.
+    """
+    from alembic import command
+    from alembic.config import Config
+
+    cwd = os.getcwd()
+    os.chdir(ROOT)
+    try:
+        command.upgrade(Config("alembic.ini"), "head")
+    finally:
+        os.chdir(cwd)
+
+
+class Table:
+    """
+    One seeded game: its rows in the database, and the fake guild, channel and members it is played in.
+    """
+
+    def __init__(self, *, game: Game, guild: FakeGuild, channel: FakeChannel, thread: FakeThread, owner: FakeMember, players: List[FakeMember], state: dict):
+        self.game = game
+        self.guild = guild
+        self.channel = channel
+        self.thread = thread
+        self.owner = owner
+        self.players = players
+        self.state = state
+
+    def seat_of(self, member: FakeMember):
+        return next(seat["id"] for seat in self.state["seating"]["seats"] if seat["member"] == member.id)
+
+
+class World:
+    """
+    A population of games seeded into the database, each in its own fake guild.
+    Every game this creates has an id starting with "bench-", so leftovers from an aborted run are easy to clear.
+    """
+
+    def __init__(self, bot: HarnessBot):
+        self.bot = bot
+        self.tables: List[Table] = []
+
+    async def populate(self, states: List[dict]) -> List[Table]:
+        await self.teardown()
+
+        for i, state in enumerate(states):
+            guild = self.bot.add_guild()
+            channel = guild.add_channel(snowflake(), f"game-{i}")
+            thread = FakeThread(snowflake(), "Nominations", parent=channel, latency=guild.latency)
+            guild.channels[thread.id] = thread
+            player_role = guild.add_role(snowflake(), "Player")
+            st_role = guild.add_role(snowflake(), "Storyteller")
+
+            owner = guild.add_member(snowflake(), f"Storyteller {i}")
+            players = [guild.add_member(seat["member"], seat["alias"]) for seat in state["seating"]["seats"]]
+
+            game = await Game.objects.create(
+                id=f"{PREFIX}{i}",
+                created=datetime.now(),
+                guild=guild.id,
+                channel=channel.id,
+                owner=owner.id,
+                player_role=player_role.id,
+                st_role=st_role.id,
+                config={"name": f"game-{i}", "script": None, "seats": len(players)},
+                state=state,
+            )
+            await ActiveGame.objects.create(id=channel.id, game=game)
+            await ManagedThread.objects.create(id=thread.id, game=game, type=ThreadType.Nomination)
+            await Participant.objects.bulk_create(
+                [Participant(game=game, member=owner.id, role=RoleType.STORYTELLER)]
+                + [Participant(game=game, member=player.id, role=RoleType.PLAYER) for player in players]
+            )
+
+            self.tables.append(Table(game=game, guild=guild, channel=channel, thread=thread, owner=owner, players=players, state=state))
+
+        return self.tables
+
+    async def reset(self, table: Table):
+        """
+        Puts a game's state back to how it was seeded.
+        """
+        await GameEvent.objects.filter(game__id=table.game.id).delete()
+        await GameDay.objects.filter(game__id=table.game.id).delete()
+        await Game.objects.filter(id=table.game.id).update(state=table.state, revision=0, snapshot=0)
+        self.bot.game_cache.evict_game(table.game)
+
+    async def teardown(self):
+        await Game.objects.filter(id__startswith=PREFIX).delete()
+        self.bot.game_cache.clear()
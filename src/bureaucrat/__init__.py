@@ -1,13 +1,21 @@
+import asyncio
+import importlib
 import logging
+import time
 import tomllib
 
-from bureaucrat import admin, archives, feedback, games, models, nominations, phases, reminders, scripts, seating, threads
-from bureaucrat.models.games import ActiveCategory, ActiveGame, Game, Participant, RoleType
-from bureaucrat.utility import aws, logging, embeds
-from discord import AllowedMentions, Intents, Interaction, Thread
+# Startup is timed from the moment the package is first imported, which is as early as the entry point allows.
+STARTED = time.monotonic()
+
+from bureaucrat import models
+from bureaucrat.models.events import Conflict
+from bureaucrat.models.games import ActiveCategory, Game, Participant, RoleType
+from bureaucrat.models.notifications import Notifications
+from bureaucrat.utility import aws, directory, logging, embeds, gamecache, metrics, watchdog
+from discord import AllowedMentions, Guild, Intents, Interaction, MemberCacheFlags, Thread
+from discord.app_commands import AppCommandError, CommandInvokeError, CommandTree
 from discord.abc import GuildChannel
-from discord.ext.commands import DefaultHelpCommand
-from discord.ext.commands.bot import Bot
+from discord.ext.commands import AutoShardedBot, DefaultHelpCommand
 from dotmap import DotMap
 from typing import List, Optional
 
@@ -24,9 +32,24 @@ class Config:
         return Config(**obj)
 
 
-class Bureaucrat(Bot):
+class Bureaucrat(AutoShardedBot):
+
+    COG_MODULES = ("admin", "archives", "feedback", "games", "nominations", "phases", "reminders", "scripts", "seating", "threads")
+    DEFERRED_MODULES = ("aioboto3", "scriptmaker")
 
-    COG_MODULES = (admin, archives, feedback, games, nominations, phases, reminders, scripts, seating, threads)
+    # Gateway events that no command or listener uses.
+    UNUSED_INTENTS = (
+        "presences",
+        "typing",
+        "voice_states",
+        "invites",
+        "webhooks",
+        "integrations",
+        "reactions",
+        "moderation",
+        "auto_moderation",
+        "guild_scheduled_events",
+    )
 
     def __init__(self, *, config: Config):
 
@@ -37,6 +60,24 @@ class Bureaucrat(Bot):
         # It authenticates by checking the environment for AWS access variables.
         self.aws = aws.AWSClient(self)
 
+        # Cache user and member lookups for views that need more than a mention.
+        self.directory = directory.Directory(self)
+
+        # Cache the active game behind each channel, and hear about changes made by other processes.
+        self.game_cache = gamecache.GameCache(self, size=self.config.gateway.get("game_cache_size", gamecache.GameCache.SIZE))
+        self.notifications = Notifications()
+        self.game_cache.subscribe(self.notifications)
+
+        # Keep latency samples for every app command.
+        self.metrics = metrics.Metrics(self, window=self.config.metrics.get("window", metrics.Metrics.WINDOW))
+
+        # Watch for anything that blocks the event loop.
+        self.watchdog = watchdog.Watchdog(
+            self,
+            interval_ms=self.config.watchdog.get("interval_ms", watchdog.Watchdog.INTERVAL_MS),
+            threshold_ms=self.config.watchdog.get("threshold_ms", watchdog.Watchdog.THRESHOLD_MS),
+        )
+
         # Create Bureaucrat's logging handle, so that all Bureaucrat-level modules use the same label.
         severity = logging.severity(config.log_level)
 
@@ -45,26 +86,106 @@ class Bureaucrat(Bot):
         self.logger.debug("Debug mode enabled.")
 
         # Initialize the underlying client.
+        # The bot runs a single shard unless configured otherwise; "auto" takes Discord's recommended shard count.
+        intents = Intents.all()
+        if self.config.gateway.get("trim_intents", False):
+            for intent in Bureaucrat.UNUSED_INTENTS:
+                setattr(intents, intent, False)
+
+        # Under the "participants" policy, only members of active games are kept, rather than every member of every guild.
+        self.member_cache = self.config.gateway.get("member_cache", "all")
+        if self.member_cache == "participants":
+            member_cache_flags = MemberCacheFlags.none()
+        else:
+            member_cache_flags = MemberCacheFlags.from_intents(intents)
+
+        shard_count = self.config.gateway.get("shard_count", 1)
         options = {
             "allowed_mentions": AllowedMentions(everyone=False),
             "case_insensitive": True,
             "help_command": DefaultHelpCommand(dm_help=None, dm_help_threshold=500, sort_commands=True),
-            "intents": Intents.all(),
+            "intents": intents,
+            "member_cache_flags": member_cache_flags,
+            "chunk_guilds_at_startup": self.member_cache != "participants",
+            "max_messages": self.config.gateway.get("max_messages", 1000),
+            "shard_count": None if shard_count == "auto" else int(shard_count),
         }
+        if self.config.gateway.get("shard_ids"):
+            options["shard_ids"] = list(self.config.gateway.shard_ids)
         super().__init__(config.prefix, **options)
         self.owner_ids = config.owners
+        self.tree.on_error = self.on_app_command_error
+        self.ready_once = False
 
         self.logger.debug(f"Owned by {', '.join(str(i) for i in self.owner_ids)}.")
 
     async def setup_hook(self) -> None:
 
-        await models.setup()
+        self.watchdog.start()
 
         # Initialize the cogs.
-        # Each module should expose a setup function.
-        self.logger.info(f"Loading extensions: {', '.join(m.__name__.split('.')[1].capitalize() for m in Bureaucrat.COG_MODULES)}.")
-        for module in Bureaucrat.COG_MODULES:
-            await module.setup(self)
+        # Each module should expose a setup function. Importing them is synchronous, so it happens on a worker thread
+        # while the database pool connects; the cogs are then registered together.
+        self.logger.info(f"Loading extensions: {', '.join(name.capitalize() for name in Bureaucrat.COG_MODULES)}.")
+        _, modules = await asyncio.gather(models.setup(self.config), asyncio.to_thread(Bureaucrat.import_cogs))
+        await asyncio.gather(*(module.setup(self) for module in modules))
+        if self.config.database.get("notifications", True):
+            self.notifications.start()
+        self.logger.info(f"Loaded extensions {time.monotonic() - STARTED:.2f}s after startup.")
+
+        # Measure the commands the cogs just registered, and serve the numbers locally if a port is configured.
+        self.metrics.instrument()
+        port = self.config.metrics.get("port")
+        if port:
+            await self.metrics.serve(port=int(port))
+
+    @classmethod
+    def import_cogs(cls):
+        return [importlib.import_module(f"bureaucrat.{name}") for name in cls.COG_MODULES]
+
+    async def on_ready(self) -> None:
+
+        if self.ready_once:
+            return
+        self.ready_once = True
+        self.logger.info(f"Ready {time.monotonic() - STARTED:.2f}s after startup.")
+
+        # S3 and script rendering pull in botocore, pango and the PDF tooling, so import them now rather than on first use.
+        await asyncio.to_thread(lambda: [importlib.import_module(name) for name in Bureaucrat.DEFERRED_MODULES])
+
+    async def on_guild_available(self, guild: Guild) -> None:
+
+        if self.member_cache == "participants":
+            await self.directory.chunk_participants(guild)
+
+    async def on_shard_ready(self, shard_id: int) -> None:
+
+        self.game_cache.drop_shard(shard_id)
+
+    async def on_shard_disconnect(self, shard_id: int) -> None:
+
+        self.game_cache.drop_shard(shard_id)
+
+    async def on_app_command_error(self, interaction: Interaction, error: AppCommandError) -> None:
+
+        # A failed command may have written its game through to the cache before its transaction rolled back.
+        if interaction.guild is not None and interaction.channel is not None:
+            self.game_cache.evict(interaction.channel)
+
+        # A change that raced another one on the same game is the user's to retry, not a bug.
+        if isinstance(error, CommandInvokeError) and isinstance(error.original, Conflict):
+            if interaction.response.is_done():
+                return await self.followup_ethereal(interaction, title="Conflict", description=str(error.original))
+            return await self.send_ethereal(interaction, title="Conflict", description=str(error.original))
+        await CommandTree.on_error(self.tree, interaction, error)
+
+    async def close(self) -> None:
+
+        self.watchdog.stop()
+        await self.notifications.stop()
+        await self.metrics.close()
+        await self.aws.close()
+        await super().close()
 
     def run(self, token: str, *, reconnect: bool = True) -> None:
 
@@ -144,10 +265,19 @@ class Bureaucrat(Bot):
         """
         Retrieves the active game, if one exists.
         """
-        channel_id = self.get_channel_id(channel)
-        in_channel = await ActiveGame.objects.select_related(ActiveGame.game).get_or_none(id=channel_id)
-        game = in_channel.game if in_channel else None
-        return game
+        return await self.game_cache.get(channel)
+
+    def shard_of(self, guild_id: Optional[int]) -> int:
+        """
+        Gets the shard that receives a guild's events. Direct messages always go to shard 0.
+        """
+        return 0 if guild_id is None else (guild_id >> 22) % (self.shard_count or 1)
+
+    def serves_guild(self, guild_id: Optional[int]) -> bool:
+        """
+        Whether this process runs the shard for a guild, when the bot is split across processes.
+        """
+        return self.shard_ids is None or self.shard_of(guild_id) in self.shard_ids
 
     def get_channel_id(self, channel: GuildChannel | Thread):
         """
@@ -1,10 +1,14 @@
+import humanize
+import io
 import os
+import resource
+import tempfile
 
-from bureaucrat.utility import embeds
-from discord import app_commands as apc, Interaction
+from bureaucrat.utility import embeds, export
+from discord import app_commands as apc, File, Interaction
 from discord.ext import commands
 from discord.ext.commands import Context
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Literal, Optional
 
 if TYPE_CHECKING:
     from bureaucrat import Bureaucrat
@@ -107,6 +111,115 @@ class Administrative(commands.GroupCog, group_name="admin"):
             ephemeral=True,
         )
 
+    @apc.command()
+    @apc.describe(command="Only show this command, e.g. /game new.")
+    async def stats(self, interaction: Interaction, command: Optional[str]):
+        """
+        Show latency percentiles (p50/p95/p99, in ms) per command and phase, and event loop lag.
+        """
+        if interaction.user.id not in self.bot.owner_ids:
+            return await interaction.response.send_message(
+                embed=embeds.unauthorized(self.bot, "You must be a bot owner."), ephemeral=True
+            )
+
+        summary = self.bot.metrics.summary()
+        if command:
+            summary = {k: v for k, v in summary.items() if k == f"/{command.lstrip('/')}"}
+
+        segments = []
+        for name, (count, quantiles) in summary.items():
+            phases = "\n".join(
+                f"  {phase}: {' / '.join(f'{value * 1000:.0f}' for value in values)}"
+                for phase, values in quantiles.items()
+            )
+            segments.append(f"**{name}** (n={count})\n{phases}")
+        if not command:
+            stalls, lag = self.bot.metrics.loop_summary()
+            loop = f"**event loop** ({stalls} stalls)\n  lag: {' / '.join(f'{value * 1000:.0f}' for value in lag)}"
+            stall = self.bot.metrics.last_stall
+            if stall is not None:
+                loop += f"\n  last stall: {stall.lag * 1000:.0f} ms in {stall.command or stall.task} <t:{int(stall.when.timestamp())}:R>"
+            segments.insert(0, loop)
+        description = "\n".join(segments) if segments else "No commands have been measured yet."
+
+        await interaction.response.send_message(
+            embed=embeds.make_embed(self.bot, title="Latency", description=description[:4096]), ephemeral=True
+        )
+
+    @apc.command()
+    async def memory(self, interaction: Interaction):
+        """
+        Show Bureaucrat's memory usage, and what the gateway and its caches are holding onto.
+        """
+        if interaction.user.id not in self.bot.owner_ids:
+            return await interaction.response.send_message(
+                embed=embeds.unauthorized(self.bot, "You must be a bot owner."), ephemeral=True
+            )
+
+        # ru_maxrss is in KiB on Linux; the current RSS is only available from procfs.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        try:
+            with open("/proc/self/statm") as statm:
+                rss = int(statm.read().split()[1]) * resource.getpagesize()
+        except OSError:
+            rss = None
+
+        members = sum(len(guild.members) for guild in self.bot.guilds)
+        population = sum(guild.member_count or 0 for guild in self.bot.guilds)
+        lines = [
+            f"**RSS**: {humanize.naturalsize(rss, binary=True) if rss is not None else 'unknown'} "
+            f"(peak {humanize.naturalsize(peak, binary=True)})",
+            f"**Member cache**: `{self.bot.member_cache}`, {members} of {population} members in {len(self.bot.guilds)} guilds",
+            f"**Users**: {len(self.bot.users)}",
+            f"**Messages**: {len(self.bot.cached_messages)}",
+            f"**Games**: {len(self.bot.game_cache)} channels ({self.bot.game_cache.hits} hits, {self.bot.game_cache.misses} misses)",
+            f"**Directory**: {len(self.bot.directory)} entries",
+        ]
+
+        await interaction.response.send_message(
+            embed=embeds.make_embed(self.bot, title="Memory", description="\n".join(lines)), ephemeral=True
+        )
+
+    @apc.command(name="export")
+    @apc.describe(format="One JSON record per game, or one CSV row per vote.", here="Only export games in this server.")
+    async def export_games(self, interaction: Interaction, format: Literal["ndjson", "csv"], here: bool = False):
+        """
+        Export every game's seating, nominations, votes and outcomes.
+        """
+        if interaction.user.id not in self.bot.owner_ids:
+            return await interaction.response.send_message(
+                embed=embeds.unauthorized(self.bot, "You must be a bot owner."), ephemeral=True
+            )
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        guild = interaction.guild_id if here else None
+        limit = interaction.guild.filesize_limit if interaction.guild else 25 * 1024 * 1024
+
+        # Games are written to disk as they are read, rather than collected in memory.
+        with tempfile.TemporaryFile() as raw:
+            out = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+            count = await export.export(out, format=format, guild=guild)
+            out.detach()
+            size = raw.tell()
+
+            if size > limit:
+                return await interaction.followup.send(
+                    embed=embeds.make_embed(
+                        self.bot,
+                        title="Export",
+                        description=f"The export of {count} games is {humanize.naturalsize(size, binary=True)}, which is "
+                        f"too large to upload here; run `bureaucrat-export` instead.",
+                    ),
+                    ephemeral=True,
+                )
+
+            raw.seek(0)
+            await interaction.followup.send(
+                embed=embeds.make_embed(self.bot, title="Export", description=f"Exported {count} games."),
+                file=File(raw, filename=f"games.{format}"),
+                ephemeral=True,
+            )
+
     @apc.command()
     async def restart(self, interaction: Interaction):
         """
@@ -7,7 +7,6 @@ from bureaucrat.utility import checks, embeds
 from discord import app_commands as apc, CategoryChannel, Member, Interaction, Thread
 from discord.abc import GuildChannel
 from discord.ext import commands
-from scriptmaker import Datastore, Script
 from tempfile import TemporaryDirectory, NamedTemporaryFile
 from typing import Optional, TYPE_CHECKING
 from urllib.request import urlretrieve
@@ -155,11 +154,12 @@ class Games(commands.GroupCog, group_name="game", description="Commands for mana
         await self._configure.show(interaction)
 
     @configure.command(name="edit")
-    async def configure_edit(self, interaction: Interaction, name: Optional[str], script: Optional[str], seats: Optional[int]):
+    @apc.describe(summary_at_dusk="Whether to post a summary of the day's nominations when the day ends.")
+    async def configure_edit(self, interaction: Interaction, name: Optional[str], script: Optional[str], seats: Optional[int], summary_at_dusk: Optional[bool]):
         """
         Edit the game's configuration.
         """
-        await self._configure.edit(interaction, name=name, script=script, seats=seats)
+        await self._configure.edit(interaction, name=name, script=script, seats=seats, summary_at_dusk=summary_at_dusk)
 
     # KIBITZ MANAGEMENT
 
@@ -338,6 +338,8 @@ class Games(commands.GroupCog, group_name="game", description="Commands for mana
         """
         Tries to resolve a script resource.
         """
+        from scriptmaker import Datastore
+
         with TemporaryDirectory() as workspace:
             with NamedTemporaryFile() as f:
                 try:
@@ -4,6 +4,7 @@ from bureaucrat.models.config import Config
 from bureaucrat.models.state import State
 from bureaucrat.models.configure import ormar
 from bureaucrat.models import games
+from bureaucrat.models.events import EventLog
 from bureaucrat.models.games import ActiveGame, Game
 from bureaucrat.utility import checks, embeds
 from discord import Interaction
@@ -50,8 +51,10 @@ class Configure:
         # Handle script updates specifically as well.
         if "script" in kwargs and kwargs["script"] is not None:
             await self.parent.add_script_to_game(game, kwargs['script'])
-
-        await game.update()
+            await EventLog.snapshot(game, "script")
+        else:
+            # Only the config: the rest of a cached game may be behind what other commands have since recorded.
+            await game.update(_columns=["config"])
         await self.show(interaction)
 
     async def show(self, interaction: Interaction):
@@ -2,6 +2,7 @@ from bureaucrat.models.config import Config
 from bureaucrat.models.state import State
 from bureaucrat.models.configure import ormar
 from bureaucrat.models import games
+from bureaucrat.models.events import EventLog
 from bureaucrat.models.games import ActiveCategory, ActiveGame, Game, Participant, Signup, ManagedThread, ThreadType
 from bureaucrat.models.scripts import Script
 from bureaucrat.scripts.details import ScriptDetailsView
@@ -45,6 +46,7 @@ class TopLevel:
             return
 
         await ActiveGame.objects.filter(game=game).delete()
+        self.bot.game_cache.evict_game(game)
         await self.parent._roles.cleanup(interaction.guild, game.player_role, game.st_role)
         await self.parent._kibitz._cleanup(interaction, game)
 
@@ -103,7 +105,7 @@ class TopLevel:
 
         if script:
             await self.parent.add_script_to_game(game, script)
-            await game.update()
+            await EventLog.snapshot(game, "script")
 
         await self.followup_ethereal(interaction, description=f"Created game '{name}' in {channel.mention}.")
 
@@ -206,7 +208,7 @@ class TopLevel:
         owner = await interaction.guild.fetch_member(game.owner)
         await self.parent._roles.set_role(game, owner, RoleType.NONE)
         await self.parent._roles.set_role(game, user, RoleType.STORYTELLER)
-        await game.update(owner=user.id)
+        await game.update(_columns=["owner"], owner=user.id)
 
         game_channel = await self.bot.fetch_channel(game.channel)
         await self.send_ethereal(interaction, description=f"{user.mention} is now the owner of this game.")
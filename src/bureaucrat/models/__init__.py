@@ -1,13 +1,35 @@
 # Create the Ormar config.
 
 from .configure import CONFIG
+from .notifications import ORIGIN
 
 
-async def setup():
-    if not CONFIG.database.is_connected:
-        await CONFIG.database.connect()
+async def setup(config=None):
+    if CONFIG.database.is_connected:
+        return
 
+    # Connections are tagged with this process, so that it can recognize its own change notifications.
+    CONFIG.database.configure_pool(server_settings={"application_name": ORIGIN})
 
+    if config is not None:
+        # asyncpg prepares and caches every statement it runs, keyed by its text; ormar's queries are parameterized,
+        # so hot lookups are only planned once per connection as long as the statement cache is large enough.
+        CONFIG.database.configure_pool(
+            min_size=config.database.get("min_size"),
+            max_size=config.database.get("max_size"),
+            statement_cache_size=config.database.get("statement_cache_size"),
+            command_timeout=config.database.get("command_timeout"),
+            max_inactive_connection_lifetime=config.database.get("max_inactive_connection_lifetime"),
+        )
+        CONFIG.database.configure_accounting(
+            slow_query_ms=config.database.get("slow_query_ms"), query_budget=config.database.get("query_budget")
+        )
+        events.EventLog.configure(every=config.database.get("snapshot_every"))
+
+    await CONFIG.database.connect()
+
+
+from . import events
 from . import feedback
 from . import games
 from . import reminders
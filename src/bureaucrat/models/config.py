@@ -9,13 +9,15 @@ class Config(JSONable):
     The configuration of a game.
     """
 
-    def __init__(self, *, name: Optional[str], script: Optional[str], seats: int):
+    def __init__(self, *, name: Optional[str], script: Optional[str], seats: int, summary_at_dusk: bool = False):
         self.name = name if name else "new-game"
         self.script = script
         self.seats = seats if seats else 12
+        self.summary_at_dusk = summary_at_dusk
 
     def __repr__(self):
         return "\n".join([
             f"script: `{self.script}`",
-            f"{self.seats} players"
+            f"{self.seats} players",
+            f"day summary at dusk: {'on' if self.summary_at_dusk else 'off'}",
         ])
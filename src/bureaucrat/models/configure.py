@@ -1,16 +1,18 @@
-import databases
 import ormar
 import os
 import pydantic
 import sqlalchemy
 import typing
 
+from bureaucrat.utility import metrics
+
+from .database import InstrumentedDatabase
+
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 CONFIG = ormar.OrmarConfig(
-    database=databases.Database(DATABASE_URL),
+    database=InstrumentedDatabase(DATABASE_URL),
     metadata=sqlalchemy.MetaData(),
-    engine=sqlalchemy.create_engine(DATABASE_URL),
 )
 
 DictType = pydantic.Json[typing.Dict[str, pydantic.JsonValue]]
@@ -21,10 +23,12 @@ class JSONable:
     A base class for a model that is stored as a JSON column.
     """
 
+    @metrics.timed("state")
     def dump(self):
         return self.__dict__
 
     @classmethod
+    @metrics.timed("state")
     def load(cls, json_value):
         return cls(**json_value)
 
@@ -0,0 +1,159 @@
+import databases
+import logging
+import time
+
+from bureaucrat.utility import metrics
+from contextlib import contextmanager
+from databases.core import Transaction
+from typing import Callable
+
+
+class HookedTransaction(Transaction):
+    """
+    A transaction that runs the callbacks registered through InstrumentedDatabase.after_commit once the outermost
+    transaction on its connection commits, and discards them if the transaction they were registered in rolls back.
+    Callbacks live on the connection rather than the transaction, since a decorator's transaction object is shared by
+    every call to the function it wraps.
+    """
+
+    async def commit(self) -> None:
+        connection = self._connection
+        depth = len(connection._transaction_stack)
+        await super().commit()
+
+        callbacks = getattr(connection, "_after_commit", [])
+        if depth > 1:
+            # A savepoint was released; its callbacks now belong to the transaction around it.
+            connection._after_commit = [(min(d, depth - 1), callback) for d, callback in callbacks]
+            return
+
+        connection._after_commit = []
+        for _, callback in callbacks:
+            callback()
+
+    async def rollback(self) -> None:
+        connection = self._connection
+        depth = len(connection._transaction_stack)
+        await super().rollback()
+        connection._after_commit = [(d, callback) for d, callback in getattr(connection, "_after_commit", []) if d < depth]
+
+
+class InstrumentedDatabase(databases.Database):
+    """
+    A database whose queries are timed and counted against the command that issued them.
+    Statements slower than the slow-query threshold are logged with the command that ran them,
+    and a command that issues more queries than its budget is warned about once, which is usually an N+1 load.
+    """
+
+    SLOW_QUERY_MS = 100
+    QUERY_BUDGET = 25
+
+    def __init__(self, url, **options):
+        super().__init__(url, **options)
+        self.logger = logging.getLogger("Bureaucrat.Database")
+        self.slow_query_ms = InstrumentedDatabase.SLOW_QUERY_MS
+        self.query_budget = InstrumentedDatabase.QUERY_BUDGET
+
+    def transaction(self, *, force_rollback: bool = False, **kwargs) -> HookedTransaction:
+        return HookedTransaction(self.connection, force_rollback=force_rollback, **kwargs)
+
+    def after_commit(self, callback: Callable[[], None]):
+        """
+        Runs a callback once the current transaction commits, or straight away outside of one; it is dropped if the
+        transaction rolls back. Use this for anything kept outside the database that must never run ahead of it, such as
+        a cache written through on update.
+        """
+        connection = self.connection()
+        depth = len(connection._transaction_stack)
+        if depth == 0:
+            callback()
+            return
+
+        if not hasattr(connection, "_after_commit"):
+            connection._after_commit = []
+        connection._after_commit.append((depth, callback))
+
+    def configure_pool(self, **options):
+        """
+        Applies asyncpg pool and connection settings (pool sizes, statement cache size, timeouts), ignoring unset ones.
+        The backend is rebuilt with the new options, so this must happen before connecting.
+        """
+        if self.is_connected:
+            raise RuntimeError("The pool can only be configured before the database connects.")
+
+        self.options.update({k: v for k, v in options.items() if v is not None})
+        self._backend = self._backend.__class__(self.url, **self.options)
+
+    def configure_accounting(self, *, slow_query_ms: float | None = None, query_budget: int | None = None):
+        """
+        Sets the thresholds for the slow-query log and the per-command query budget.
+        """
+        if slow_query_ms is not None:
+            self.slow_query_ms = float(slow_query_ms)
+        if query_budget is not None:
+            self.query_budget = int(query_budget)
+
+    @contextmanager
+    def account(self, query):
+        """
+        Times a single statement, and charges it to the current command.
+        """
+        sample = metrics.current()
+        start = time.perf_counter()
+        try:
+            with metrics.phase("db"):
+                yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            command = sample.command if sample else "(no command)"
+
+            if elapsed >= self.slow_query_ms:
+                statement = " ".join(str(query).split())
+                self.logger.warning(f"Slow query in {command} ({elapsed:.0f} ms): {statement[:500]}")
+
+            self.charge(sample)
+
+    def charge(self, sample: metrics.Sample | None):
+        """
+        Counts a statement against a command, warning the first time it goes over budget.
+        """
+        if sample is None:
+            return
+        sample.queries += 1
+        if sample.queries == self.query_budget + 1:
+            self.logger.warning(
+                f"{sample.command} has issued more than {self.query_budget} queries; check for lazy loads in a loop."
+            )
+
+    async def fetch_all(self, query, values=None):
+        with self.account(query):
+            return await super().fetch_all(query, values)
+
+    async def fetch_one(self, query, values=None):
+        with self.account(query):
+            return await super().fetch_one(query, values)
+
+    async def fetch_val(self, query, values=None, column=0):
+        with self.account(query):
+            return await super().fetch_val(query, values, column=column)
+
+    async def execute(self, query, values=None):
+        with self.account(query):
+            return await super().execute(query, values)
+
+    async def execute_many(self, query, values):
+        with self.account(query):
+            return await super().execute_many(query, values)
+
+    async def iterate(self, query, values=None):
+        # The statement is charged once, but only the time spent waiting on rows counts, not the caller's work between them.
+        self.charge(metrics.current())
+
+        iterator = super().iterate(query, values).__aiter__()
+        while True:
+            with metrics.phase("db"):
+                try:
+                    record = await iterator.__anext__()
+                except StopAsyncIteration:
+                    return
+            yield record
@@ -0,0 +1,299 @@
+import sqlalchemy
+
+from typing import Callable, Dict, List, Optional
+
+from .games import Game, GameDay, GameEvent
+from .state import Marker, Nomination, State, Status, Type, VoteResult
+
+# Applies an event to the state, returning why it can't be if it no longer fits.
+Applier = Callable[[State, dict], Optional[str]]
+
+APPLIERS: Dict[str, Applier] = {}
+
+
+class Conflict(Exception):
+    """
+    Raised when a change can't be recorded because the game changed since the command loaded it. The command's
+    transaction rolls back, and the message is shown to the user.
+    """
+
+
+def applies(kind: str):
+    """
+    Registers how an event of this kind changes the state, for replay.
+    """
+    def decorator(f: Applier) -> Applier:
+        APPLIERS[kind] = f
+        return f
+    return decorator
+
+
+class EventLog:
+    """
+    An append-only log of what happened in each game.
+    Commands apply a change to the state as before, and then record it as a small event rather than rewriting the whole
+    state: the game's state column is only a snapshot, rewritten once every so many events, and a game is materialized
+    by replaying the events recorded after its snapshot. Changes that don't have their own kind of event (e.g. seating
+    someone new, or loading a script) are recorded as a snapshot event holding the whole state.
+    A game loaded through materialize holds its latest state as of loading, with its snapshot marked as current. Other
+    commands may record events after that, so never save a loaded game in full; update only the columns that changed.
+    Commands on the same game can run at once, each from the copy of the game it loaded. Recording an event locks the
+    game's row for the rest of the transaction, so they take turns; one that finds the game has moved on since it was
+    loaded replays its change onto the latest state rather than overwriting it.
+    """
+
+    EVERY = 50
+
+    every = EVERY
+
+    @classmethod
+    def configure(cls, *, every: Optional[int] = None):
+        cls.every = every or cls.EVERY
+
+    @classmethod
+    def replay(cls, state: State, events: List[GameEvent]) -> State:
+        for event in events:
+            if event.kind == "snapshot":
+                state = State.load(event.data["state"])
+            else:
+                APPLIERS[event.kind](state, event.data)
+        return state
+
+    @classmethod
+    async def materialize(cls, game: Game) -> Game:
+        """
+        Brings a game's state up to date with every event recorded since its snapshot.
+        """
+        if game.revision > game.snapshot:
+            events = await GameEvent.objects.filter(game__id=game.id, revision__gt=game.snapshot).order_by("revision").all()
+            if events:
+                state = cls.replay(State.load(game.state), events)
+                game.state = state.dump()
+                game.revision = max(game.revision, events[-1].revision)
+        game.snapshot = game.revision
+        return game
+
+    @classmethod
+    async def lock(cls, game: Game) -> int:
+        """
+        Locks a game's row until the end of the current transaction, and gets its latest committed revision.
+        """
+        table = Game.ormar_config.table
+        query = sqlalchemy.select(table.c.revision).where(table.c.id == game.id).with_for_update()
+        return await Game.ormar_config.database.fetch_val(query)
+
+    @classmethod
+    async def refresh(cls, game: Game) -> Game:
+        """
+        Locks a game's row for the rest of the transaction, and brings the game up to date if another command has
+        changed it since it was loaded; for commands whose change depends on more than their own event (e.g. archiving
+        the day that is ending).
+        """
+        if await cls.lock(game) != game.revision:
+            latest = await cls.materialize(await Game.objects.get(id=game.id))
+            game.state = latest.state
+            game.config = latest.config
+            game.revision = latest.revision
+            game.snapshot = latest.snapshot
+        return game
+
+    @classmethod
+    async def rebase(cls, game: Game, state: State, kind: str, data: dict):
+        """
+        Brings a game that another command has changed since it was loaded up to date, and applies this change to it
+        again. Both the game and the state are updated in place, so the caller sees the result. If the change no longer
+        applies, this raises a Conflict, so that the command rolls back rather than reporting a change that didn't happen.
+        """
+        latest = await cls.materialize(await Game.objects.get(id=game.id))
+        rebased = State.load(latest.state)
+        error = APPLIERS[kind](rebased, data)
+        if error:
+            raise Conflict(f"The game changed while this was being done: {error}")
+
+        state.__dict__.update(rebased.__dict__)
+        game.config = latest.config
+        game.revision = latest.revision
+
+    @classmethod
+    async def append(cls, game: Game, state: State, kind: str, *, compact: bool = False, **data):
+        """
+        Records one change, already applied to the state, as an event. The state is only written out as a new snapshot
+        once every so many events (or if asked to compact it); otherwise only the game's revision is.
+        If another command recorded an event since the game was loaded, the change is replayed onto the latest state.
+        """
+        if await cls.lock(game) != game.revision:
+            await cls.rebase(game, state, kind, data)
+
+        game.state = state.dump()
+        game.revision += 1
+        game.snapshot = game.revision
+        await GameEvent.objects.create(game=game, revision=game.revision, kind=kind, data=data)
+
+        if compact or game.revision % cls.every == 0:
+            await game.update()
+        else:
+            await game.update(_columns=["revision"])
+
+    @classmethod
+    async def snapshot(cls, game: Game, reason: str, state: Optional[State] = None):
+        """
+        Records a change that replaces the whole state, and writes the state out in full.
+        A snapshot can't be replayed onto a newer state, since it would throw away whatever happened in between, so if
+        the game has changed since it was loaded, the command has to be retried.
+        """
+        if await cls.lock(game) != game.revision:
+            raise Conflict("The game changed while this was being done; please try again.")
+        if state is not None:
+            game.state = state.dump()
+        game.revision += 1
+        game.snapshot = game.revision
+        await GameEvent.objects.create(game=game, revision=game.revision, kind="snapshot", data={"reason": reason, "state": game.state})
+        await game.update()
+
+    @classmethod
+    async def history(cls, game: Game, *, after: int = 0, limit: int = 100) -> List[GameEvent]:
+        """
+        Lists the events recorded in a game, oldest first.
+        """
+        return await GameEvent.objects.filter(game__id=game.id, revision__gt=after).order_by("revision").limit(limit).all()
+
+    @classmethod
+    async def state_at(cls, game: Game, revision: int) -> State:
+        """
+        Rebuilds a game's state as it was at the given revision, from the latest snapshot event at or before it.
+        """
+        base = await GameEvent.objects.filter(game__id=game.id, kind="snapshot", revision__lte=revision).order_by("-revision").first()
+        start = base.revision if base is not None else 0
+        state = State.load(base.data["state"]) if base is not None else State()
+        events = await GameEvent.objects.filter(game__id=game.id, revision__gt=start, revision__lte=revision).order_by("revision").all()
+        return cls.replay(state, events)
+
+    @classmethod
+    async def archive_days(cls, game: Game, days: Dict[int, List[dict]]):
+        """
+        Stores finished days taken out of a game's state (see Nominations.archive).
+        """
+        if not days:
+            return
+        await GameDay.objects.filter(game__id=game.id, day__in=list(days)).delete()
+        await GameDay.objects.bulk_create([GameDay(game=game, day=day, state={"nominations": nominations}) for day, nominations in days.items()])
+
+    @classmethod
+    async def load_day(cls, game: Game, state: State, day: int):
+        """
+        Puts a finished day's nominations back into the state, to be looked at. Only ever do this to a state that won't
+        be saved.
+        """
+        if day in state.nominations.days or day >= state.moment.day:
+            return
+        archived = await GameDay.objects.get_or_none(game=game, day=day)
+        if archived is not None:
+            state.nominations.days[day] = [Nomination(**data) for data in archived.state["nominations"]]
+
+
+# SEATING
+
+MISSING_SEAT = "That seat is no longer in the game."
+
+
+@applies("seat.move")
+def _(state: State, data: dict):
+    if not state.seating.move_seats(lhs=data["lhs"], rhs=data.get("rhs"), mode=Marker(data["mode"])):
+        return MISSING_SEAT
+
+
+@applies("seat.swap")
+def _(state: State, data: dict):
+    if not state.seating.swap_seats(lhs=data["lhs"], rhs=data["rhs"]):
+        return MISSING_SEAT
+
+
+@applies("seat.edit")
+def _(state: State, data: dict):
+    if state.seating.index(data["id"]) is None:
+        return MISSING_SEAT
+    state.seating.set_alias(id=data["id"], alias=data.get("alias"))
+    state.seating.set_role(id=data["id"], true=data.get("true"), apparent=data.get("apparent"))
+    state.seating.set_status(id=data["id"], status=Status(data["status"]) if data.get("status") else None)
+    state.seating.set_type(id=data["id"], type=Type(data["type"]) if data.get("type") else None)
+
+
+# PHASES
+
+@applies("phase.dusk")
+def _(state: State, data: dict):
+    state.moment.go_to_dusk()
+    state.nominations.archive(before=state.moment.day)
+
+
+@applies("phase.dawn")
+def _(state: State, data: dict):
+    state.moment.go_to_dawn()
+
+
+# NOMINATIONS
+
+@applies("nomination.create")
+def _(state: State, data: dict):
+    error = state.nominations.create(state=state, nominator=data["nominator"], nominee=data["nominee"])
+    if error:
+        return error
+    nomination = state.nominations.get_specific_nomination(state.moment.day, data["nominee"])
+    nomination.message = data.get("message")
+
+
+@applies("nomination.edit")
+def _(state: State, data: dict):
+    nomination = state.nominations.get_specific_nomination(state.moment.day, data["nominee"])
+    if nomination is None:
+        return "There is no such nomination."
+    for key in ("accusation", "defense", "required"):
+        if data.get(key):
+            nomination[key] = data[key]
+
+
+@applies("nomination.mark")
+def _(state: State, data: dict):
+    return state.nominations.mark(state=state, nominee=data["nominee"], mark=data["mark"])
+
+
+@applies("nomination.default")
+def _(state: State, data: dict):
+    return state.nominations.default(state=state, nominee=data["nominee"])
+
+
+@applies("nomination.accuse")
+def _(state: State, data: dict):
+    return state.nominations.accuse(state=state, nominator=data["nominator"], nominee=data["nominee"], accusation=data["accusation"])
+
+
+@applies("nomination.defend")
+def _(state: State, data: dict):
+    return state.nominations.defend(state=state, nominee=data["nominee"], defense=data["defense"])
+
+
+# VOTES
+
+@applies("vote.set")
+def _(state: State, data: dict):
+    return state.nominations.set_vote(state=state, voter=data["voter"], nominee=data["nominee"], vote=data["vote"], private=data["private"])
+
+
+@applies("vote.lock")
+def _(state: State, data: dict):
+    result = VoteResult(data["result"]) if data["result"] is not None else None
+    return state.nominations.lock_vote(state=state, voter=data["voter"], nominee=data["nominee"], result=result)
+
+
+@applies("vote.batch")
+def _(state: State, data: dict):
+    results = {voter: VoteResult(result) if result is not None else None for voter, result in data["results"].items()}
+    return state.nominations.lock_votes(state=state, nominee=data["nominee"], results=results)
+
+
+@applies("vote.advance")
+def _(state: State, data: dict):
+    nomination = state.nominations.get_specific_nomination(data["day"], data["nominee"])
+    if nomination is None:
+        return "There is no such nomination."
+    nomination.advance(state=state, limit=data["limit"])
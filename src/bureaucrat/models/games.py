@@ -35,6 +35,38 @@ class Game(ormar.Model):
     config: DictType = ormar.JSON()
     state: DictType = ormar.JSON()
 
+    # How many events have been recorded in this game, and how many of them the state column already reflects.
+    revision: int = ormar.Integer(default=0)
+    snapshot: int = ormar.Integer(default=0)
+
+
+class GameEvent(ormar.Model):
+    """
+    One change to a game's state, in the order it happened (see EventLog).
+    """
+
+    ormar_config = CONFIG.copy(tablename="game_events", constraints=[ormar.UniqueColumns("game", "revision")])
+
+    id: int = ormar.Integer(primary_key=True, autoincrement=True)
+    game: Game = ormar.ForeignKey(Game, related_name="events", ondelete=ReferentialAction.CASCADE, onupdate=ReferentialAction.CASCADE)
+    revision: int = ormar.Integer()
+    kind: str = ormar.String(max_length=50)
+    data: DictType = ormar.JSON()
+    created: datetime = ormar.DateTime(default=datetime.now)
+
+
+class GameDay(ormar.Model):
+    """
+    A finished day of a game, moved out of the game's state at dusk since it is only ever looked at again.
+    """
+
+    ormar_config = CONFIG.copy(tablename="game_days", constraints=[ormar.UniqueColumns("game", "day")])
+
+    id: int = ormar.Integer(primary_key=True, autoincrement=True)
+    game: Game = ormar.ForeignKey(Game, related_name="days", ondelete=ReferentialAction.CASCADE, onupdate=ReferentialAction.CASCADE)
+    day: int = ormar.Integer()
+    state: DictType = ormar.JSON()
+
 
 class ActiveGame(ormar.Model):
     """
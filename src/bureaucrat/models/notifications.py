@@ -0,0 +1,100 @@
+import asyncio
+import asyncpg
+import json
+import logging
+import os
+import uuid
+
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+from .configure import CONFIG
+
+CHANNEL = "bureaucrat_invalidate"
+
+# Every connection this process opens carries this as its application_name, which the triggers copy into each
+# notification, so that a process can tell its own writes apart from everyone else's.
+ORIGIN = f"bureaucrat-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+Handler = Callable[[str, dict], None]
+
+
+class Notifications:
+    """
+    Listens for the row changes that the database triggers publish on the bureaucrat_invalidate channel,
+    and hands them to whoever subscribed to that table, so that each process can drop what it has cached.
+    A process skips its own notifications, since its caches already saw those writes.
+    If the listening connection is lost, changes may have been missed, so every subscriber is reset on reconnect.
+    """
+
+    HEARTBEAT = 30
+    RETRY = 5
+
+    def __init__(self) -> None:
+        self.logger = logging.getLogger("Bureaucrat.Notifications")
+        self.handlers: Dict[str, List[Handler]] = defaultdict(list)
+        self.resets: List[Callable[[], None]] = []
+        self.task = None
+
+    def subscribe(self, table: str, handler: Handler):
+        """
+        Calls the handler with the operation (INSERT, UPDATE or DELETE) and the row's key columns on every change.
+        """
+        self.handlers[table].append(handler)
+
+    def on_reset(self, handler: Callable[[], None]):
+        self.resets.append(handler)
+
+    def start(self):
+        self.task = asyncio.create_task(self.run(), name="bureaucrat-notifications")
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    def reset(self):
+        for handler in self.resets:
+            handler()
+
+    def receive(self, connection, pid: int, channel: str, payload: str):
+        change = json.loads(payload)
+        if change.get("origin") == ORIGIN:
+            return
+
+        for handler in self.handlers.get(change["table"], []):
+            try:
+                handler(change["op"], change["row"])
+            except Exception as e:
+                self.logger.error(f"Failed to handle a change to {change['table']}: {e}")
+
+    async def run(self):
+        while True:
+            try:
+                dsn = str(CONFIG.database.url.replace(driver=""))
+                connection = await asyncpg.connect(dsn, server_settings={"application_name": ORIGIN})
+            except (OSError, asyncpg.PostgresError) as e:
+                self.logger.warning(f"Could not connect to listen for changes, retrying in {self.RETRY}s: {e}")
+                await asyncio.sleep(self.RETRY)
+                continue
+
+            try:
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(CHANNEL, self.receive)
+
+                # Whatever changed while nobody was listening is unknown, so start over from empty caches.
+                self.reset()
+
+                # A dropped connection isn't always noticed, so check on it now and then.
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), timeout=self.HEARTBEAT)
+                    except asyncio.TimeoutError:
+                        await connection.fetchval("SELECT 1")
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                self.logger.warning(f"Lost the connection listening for changes: {e}")
+            finally:
+                if not connection.is_closed():
+                    await connection.close()
@@ -14,6 +14,7 @@ class Reminder(ormar.Model):
 
     id: str = ormar.String(primary_key=True, max_length=100)
     author: int = ormar.BigInteger()
+    guild: Optional[int] = ormar.BigInteger(nullable=True)
     channel: int = ormar.BigInteger()
     message: str = ormar.String(max_length=1000)
     expires: datetime = ormar.DateTime()
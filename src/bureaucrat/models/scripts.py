@@ -1,5 +1,9 @@
+import os
+
 from datetime import datetime
 from ormar import ReferentialAction
+from typing import ClassVar, Optional, Tuple
+from urllib.parse import urlparse
 
 from .configure import CONFIG, ormar
 
@@ -10,7 +14,16 @@ class Script(ormar.Model):
     It owns many documents, which are the JSON inputs and PDF or PNG outputs of the rendering step.
     """
 
-    ormar_config = CONFIG.copy(tablename="scripts")
+    ormar_config = CONFIG.copy(
+        tablename="scripts",
+        constraints=[
+            ormar.IndexColumns("author", "created", name="ix_scripts_author_created"),
+            ormar.IndexColumns("created", "id", name="ix_scripts_created_id"),
+            ormar.IndexColumns(
+                "name", name="ix_scripts_name_trgm", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}
+            ),
+        ],
+    )
 
     id: str = ormar.String(primary_key=True, max_length=64)
     author: int = ormar.BigInteger()
@@ -26,9 +39,29 @@ class Document(ormar.Model):
     it is stored in AWS S3.
     """
 
-    ormar_config = CONFIG.copy(tablename="documents")
+    ormar_config = CONFIG.copy(
+        tablename="documents",
+        constraints=[
+            ormar.IndexColumns("script", "doctype", "resource", "page_number", name="ix_documents_script_pages"),
+        ],
+    )
+
+    RESOURCES: ClassVar[Tuple[str, ...]] = ("script", "nights-simple", "nights-full")
 
     id: int = ormar.Integer(primary_key=True)
     doctype: str = ormar.String(max_length=10)
     script: Script = ormar.ForeignKey(Script, ondelete=ReferentialAction.CASCADE, onupdate=ReferentialAction.CASCADE)
     url: str = ormar.String(max_length=500)
+    resource: str = ormar.String(max_length=20, default="")
+    page_number: int = ormar.Integer(nullable=True)
+
+    @classmethod
+    def locate(cls, url: str) -> Tuple[str, Optional[int]]:
+        """
+        Works out which resource a document belongs to, and which page of it it is, from its filename.
+        Pages are named like script-1.png or nights-full-2.png; anything else has no page number.
+        """
+        stem = os.path.splitext(os.path.basename(urlparse(url).path))[0]
+        resource = next((option for option in cls.RESOURCES if option in stem), "")
+        number = stem.split("-")[-1]
+        return resource, int(number) if number.isdigit() else None
@@ -1,4 +1,7 @@
+import functools
+
 from bureaucrat.models.configure import JSONable
+from bureaucrat.utility import metrics
 from enum import Enum 
 from typing import List, Literal, Set, Tuple, Optional, TYPE_CHECKING
 
@@ -32,6 +35,28 @@ class State(JSONable):
         self.script = script
         self.nights = nights
 
+    SPECIAL = ("DUSK", "DEMON", "MINION", "DAWN")
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def order_night(ids: Tuple[str, ...], signature: RoleSignature, filter: bool) -> Tuple[Tuple[str, Optional[int]], ...]:
+        """
+        Lists who wakes for each step of a night order, as (character, seat index) pairs. Every seat that is or appears
+        to be a character wakes at its step; steps nobody holds are kept only if unfiltered, or if they are the
+        script's markers (dusk, dawn and the evil team's info).
+        Cached per night order and characters in play, since both rarely change over a game.
+        """
+        index = index_roles(signature)
+        order = []
+        for id in ids:
+            seats = index.get(id)
+            if seats:
+                order.extend((id, i) for i in seats)
+            elif id in State.SPECIAL or not filter:
+                order.append((id, None))
+        return tuple(order)
+
+    @metrics.timed("render")
     def make_nightorder(self, *, bot: "Bureaucrat", night: Literal["first", "other"], filter: bool = False, private: bool = False):
         """
         Creates a nightorder page for the given night, if a script is loaded.
@@ -42,19 +67,8 @@ class State(JSONable):
         if not self.nights:
             return "There is a script, but no loaded nightorder..."
 
-        special = ["DUSK", "DEMON", "MINION", "DAWN"]
-
-        key = night
-        night = self.nights[night]
-        night = [
-            [
-                (id, seat) for seat in self.seating.seats + [None] 
-                if (seat is None and (id in special or not filter)) or (seat and (seat.roles.true == id or seat.roles.apparent == id))
-            ] 
-            for id in night
-        ]
-        night: List[Tuple[str, Seat]] = [pair for lst in night for pair in lst]
-        nights = [pair for pair in night if pair[1] or not any(p[1] and (p[1].roles.true == pair[0] or p[1].roles.apparent == pair[0]) for p in night)]
+        order = State.order_night(tuple(self.nights[night]), self.seating.role_signature(), filter)
+        nights = [(id, self.seating.seats[i] if i is not None else None) for id, i in order]
 
         segments = []
         for i, pair in enumerate(nights):
@@ -1,8 +1,9 @@
 from bureaucrat.models.configure import dotdict
 from bureaucrat.models.state.seating import Seat
+from bureaucrat.utility import metrics
 from discord import PartialEmoji
 from enum import IntEnum
-from typing import List, Set, Optional, TYPE_CHECKING
+from typing import Dict, List, Set, Optional, Tuple, TYPE_CHECKING
 
 from .seating import Seat, Status, Type
 
@@ -32,6 +33,34 @@ class VoteResult(IntEnum):
     Bureaucrat = 3
     No = 0
 
+    @classmethod
+    def parse(cls, text: Optional[str]) -> Optional["VoteResult"]:
+        """
+        Reads a player's written vote, which can only ever be a yes or a no. A player who never voted has their hand down;
+        anything else (a conditional, or a modifier like "bureaucrat", which only a storyteller can apply) can't be
+        decided automatically, and gives None.
+        """
+        if text is None or not text.strip():
+            return cls.No
+
+        word = text.strip().strip(".!").lower()
+        if word in ("yes", "y", "aye", "yea", "hand up", "up"):
+            return cls.Yes
+        if word in ("no", "n", "nay", "hand down", "down"):
+            return cls.No
+        return None
+
+    @classmethod
+    def lookup(cls, text: str) -> Optional["VoteResult"]:
+        """
+        Reads a result given by a storyteller, which may also be a modifier by name.
+        """
+        word = text.strip().strip(".!").lower()
+        for result in cls:
+            if word == result.name.lower():
+                return result
+        return cls.parse(word) if word else None
+
 
 class Vote(dotdict):
     """
@@ -94,20 +123,35 @@ class Vote(dotdict):
             self.vote = vote
         return None
     
-    def lock_vote(self, *, kind: NominationType, seat: Seat, vote: Optional[VoteResult]):
+    def check_lock(self, *, kind: NominationType, seat: Seat, vote: Optional[VoteResult]):
         """
-        Locks a vote.
+        Returns why this vote can't be locked to the given result, if it can't.
         """
         if seat.status == Status.Spent and kind == NominationType.Execution and vote and vote != VoteResult.No:
             return f"Their ghost vote is already spent."
+        return None
+
+    def lock_vote(self, *, kind: NominationType, seat: Seat, vote: Optional[VoteResult]):
+        """
+        Locks a vote.
+        """
+        error = self.check_lock(kind=kind, seat=seat, vote=vote)
+        if error:
+            return error
         
         self.locked = vote
 
+    def resolve(self):
+        """
+        Works out how this vote should lock, preferring the private vote (which only the storytellers see) when there is one.
+        """
+        return VoteResult.parse(self.private_vote if self.private_vote else self.vote)
+
 class Nomination (dotdict):
     """
     A single nomination.
     """
-    def __init__(self, *, nominator: str, nominee: str, accusation: Optional[str] = None, defense: Optional[str] = None, kind: int = NominationType.Execution.value, required: int, voters: List[dict] = [], marked: bool = False):
+    def __init__(self, *, nominator: str, nominee: str, accusation: Optional[str] = None, defense: Optional[str] = None, kind: int = NominationType.Execution.value, required: int, voters: List[dict] = [], marked: bool = False, message: Optional[int] = None):
         self.nominator = nominator
         self.nominee = nominee
         self.accusation = accusation
@@ -116,6 +160,46 @@ class Nomination (dotdict):
         self.required = required
         self.voters = [Vote(**data) for data in voters]
         self.marked = marked
+        self.message = message
+        self.retally()
+
+    def retally(self):
+        """
+        Recounts the votes from scratch; after this, locking and unlocking keep the counts up to date.
+        The counts are derived, so they live outside of the dict and are never saved.
+        """
+        running = 0
+        prefix = []
+        for vote in self.voters:
+            running += vote.locked.value if vote.locked is not None else 0
+            prefix.append(running)
+        object.__setattr__(self, "_positions", {vote.id: i for i, vote in enumerate(self.voters)})
+        object.__setattr__(self, "_prefix", prefix)
+
+    @property
+    def tally(self) -> int:
+        return self._prefix[-1] if self._prefix else 0
+
+    def is_passing(self) -> bool:
+        return self.tally >= self.required
+
+    def votes_needed(self) -> int:
+        return max(0, self.required - self.tally)
+
+    def _lock(self, vote: Vote, *, seat: Seat, result: Optional[VoteResult]):
+        """
+        Locks a vote through this nomination, carrying the change in its value into the running counts.
+        """
+        before = vote.locked.value if vote.locked is not None else 0
+        error = vote.lock_vote(kind=self.kind, seat=seat, vote=result)
+        if error:
+            return error
+
+        delta = (vote.locked.value if vote.locked is not None else 0) - before
+        if delta:
+            for i in range(self._positions[vote.id], len(self._prefix)):
+                self._prefix[i] += delta
+        return None
 
     def emojify(self, *, bot: "Bureaucrat"):
         if self.marked:
@@ -127,7 +211,7 @@ class Nomination (dotdict):
     def make_description(self, *, indent: str = "", bot: "Bureaucrat", state: "State", private: bool = False, show_votes: bool = True, viewer: Optional[str], active: Optional[str] = None):
         nominator = state.seating.seats[state.seating.index(self.nominator)]            
         nominee = state.seating.seats[state.seating.index(self.nominee)]
-        collected = sum(vote.locked.value if vote.locked is not None else 0 for vote in self.voters)
+        collected = self.tally
 
         subsegments = [
             f"Call for {self.kind.name.lower()}: {nominator.alias} ⟶ {nominee.alias}",
@@ -147,13 +231,11 @@ class Nomination (dotdict):
         """
         Lists out the voters in this nomination, as well as their voting attributes.
         """
-        count = 0
         required = self.required
         segments = []
         for i, vote in enumerate(self.voters):
             seat = state.seating.seats[state.seating.index(vote.id)]
-            if vote.locked is not None:
-                count += vote.locked.value
+            count = self._prefix[i]
             is_active = vote.id == active
             segments.append(f"{indent}{i + 1}. {vote.make_description(indent=indent, kind=self.kind, bot=bot, seat=seat, nomination=self, private=private, viewer=viewer, count=count, required=required, active=is_active)}")
         return f"\n{indent}Votes:\n" + f"\n{indent}".join(s for s in segments)
@@ -173,12 +255,62 @@ class Nomination (dotdict):
         """
         Locks the vote, or returns an error.
         """
-        votes = [v for v in self.voters if v.id == voter]
-        if len(votes) == 0:
+        if voter not in self._positions:
             return f"`{voter}` is not seated in this game."
         
         seat = state.seating.seats[state.seating.index(voter)]
-        return votes[0].lock_vote(kind=self.kind, seat=seat, vote=vote)
+        return self._lock(self.voters[self._positions[voter]], seat=seat, result=vote)
+
+    def lock_votes(self, *, state: "State", results: Dict[str, Optional[VoteResult]]):
+        """
+        Locks many votes at once, or none of them: every result is checked before any is applied.
+        """
+        errors = []
+        for voter, result in results.items():
+            if voter not in self._positions:
+                errors.append(f"`{voter}` is not voting on this nomination.")
+                continue
+            seat = state.seating.seats[state.seating.index(voter)]
+            error = self.voters[self._positions[voter]].check_lock(kind=self.kind, seat=seat, vote=result)
+            if error:
+                errors.append(f"{seat.alias}: {error}")
+        if errors:
+            return "\n".join(errors)
+
+        for voter, result in results.items():
+            seat = state.seating.seats[state.seating.index(voter)]
+            self._lock(self.voters[self._positions[voter]], seat=seat, result=result)
+        return None
+
+    def next_unlocked(self) -> Optional[Vote]:
+        """
+        Gets the next vote the clockhand will reach.
+        """
+        return next((vote for vote in self.voters if vote.locked is None), None)
+
+    def advance(self, *, state: "State", limit: Optional[int] = None) -> Tuple[int, Optional[str]]:
+        """
+        Moves the clockhand along, locking up to limit unlocked votes in seat order (or all of them).
+        Stops early at a vote that can't be resolved, and returns how many votes were locked and who it stopped at.
+        """
+        locked = 0
+        for vote in self.voters:
+            if vote.locked is not None:
+                continue
+            if limit is not None and locked >= limit:
+                break
+
+            result = vote.resolve()
+            if result is None:
+                return locked, vote.id
+
+            # A spent ghost vote can only count as a no.
+            seat = state.seating.seats[state.seating.index(vote.id)]
+            if self._lock(vote, seat=seat, result=result):
+                self._lock(vote, seat=seat, result=VoteResult.No)
+            locked += 1
+
+        return locked, None
 
     def default(self, *, state: "State"):
         """
@@ -187,7 +319,7 @@ class Nomination (dotdict):
         for vote in self.voters:
             if not vote.locked:
                 seat = state.seating.seats[state.seating.index(vote.id)]
-                vote.lock_vote(kind=self.kind, seat=seat, vote=VoteResult.No)
+                self._lock(vote, seat=seat, result=VoteResult.No)
 
 class Nominations (dotdict):
     """
@@ -221,13 +353,20 @@ class Nominations (dotdict):
         required = state.seating.get_required_votes_for(seat.kind)
         
         nominee_index = (state.seating.index(nominee) + 1) % len(state.seating.seats)
-        nomination = Nomination(nominator=nominator, nominee=nominee, kind=kind, required=required, voters = [])
         active_seats = [seat for seat in rotate(state.seating.seats, nominee_index) if not seat.removed]
-        nomination.voters = [Vote(id=seat.id, vote=None, private_vote=None, locked=None) for seat in active_seats]
+        voters = [dict(id=seat.id, vote=None, private_vote=None, locked=None) for seat in active_seats]
+        nomination = Nomination(nominator=nominator, nominee=nominee, kind=kind, required=required, voters=voters)
         self.days[day].append(nomination)
         
         return None
 
+    def archive(self, *, before: int) -> Dict[int, List[dict]]:
+        """
+        Takes every day before the given one out of the state, and returns them to be stored elsewhere.
+        """
+        days = sorted(day for day in self.days if day < before)
+        return {day: self.days.pop(day) for day in days}
+
     def get_nominations(self, day: int):
         """
         Gets all nominations (in order) in this day.
@@ -245,6 +384,7 @@ class Nominations (dotdict):
         noms = [nom for nom in nominations if nom.nominee == nominee]
         return noms[0] if len(noms) > 0 else None
 
+    @metrics.timed("render")
     def make_page(self, *, bot: "Bureaucrat", day: Optional[int], state: "State", private: bool = False, viewer: Optional[str]):
         """
         Lists all of the active nominations today.
@@ -264,6 +404,55 @@ class Nominations (dotdict):
         
         return "\n\n".join(s for s in segments)
 
+    def on_the_block(self, day: int) -> Tuple[Optional[Nomination], bool, int]:
+        """
+        Works out who is on the block: whoever has the most votes for execution, as long as they reached the threshold
+        and nobody tied them. Returns the leading nomination, whether it was tied, and its tally.
+        """
+        block, tied, most = None, False, -1
+        for nomination in self.days.get(day, []):
+            if nomination.kind != NominationType.Execution or not nomination.is_passing():
+                continue
+            if nomination.tally > most:
+                block, tied, most = nomination, False, nomination.tally
+            elif nomination.tally == most:
+                tied = True
+        return block, tied, most
+
+    @metrics.timed("render")
+    def make_summary(self, *, bot: "Bureaucrat", day: Optional[int], state: "State"):
+        """
+        Ranks a day's nominations by their votes, and works out who is on the block. Exiles pass or fail on their own.
+        """
+        day = state.moment.day if day is None else day
+        nominations = self.days.get(day, [])
+        if len(nominations) == 0:
+            return f"There are no nominations on day {day}."
+
+        block, tied, most = self.on_the_block(day)
+
+        segments = []
+        for i, nomination in enumerate(sorted(nominations, key=lambda n: n.tally, reverse=True)):
+            nominee = state.seating.seats[state.seating.index(nomination.nominee)]
+            if nomination.kind == NominationType.Exile:
+                outcome = "exiled" if nomination.is_passing() else f"{nomination.votes_needed()} short of exile"
+            elif nomination.tally == most and nomination.is_passing():
+                outcome = "tied" if tied else "**on the block**"
+            elif nomination.is_passing():
+                outcome = "outvoted"
+            else:
+                outcome = f"{nomination.votes_needed()} short"
+            mark = f"{nomination.emojify(bot=bot)} " if nomination.marked else ""
+            segments.append(f"{i + 1}. {mark}{nominee.alias}: `{nomination.tally: >2}`/`{nomination.required: >2}` ({outcome})")
+
+        if block is not None and not tied:
+            verdict = f"<@{state.seating.seats[state.seating.index(block.nominee)].member}> is about to be executed."
+        elif tied:
+            verdict = "The vote is tied, so nobody is about to be executed."
+        else:
+            verdict = "Nobody has enough votes to be executed."
+        return f"Day {day}: {verdict}\n\n" + "\n".join(segments)
+
     def set_vote(self, *, state: "State", voter: str, nominee: str, vote: Optional[str], private: bool):
         """
         Sets the vote on the corresponding nomination, or returns an error.
@@ -284,6 +473,16 @@ class Nominations (dotdict):
         
         return nomination.lock_vote(state=state, voter=voter, vote=result)
 
+    def lock_votes(self, *, state: "State", nominee: str, results: Dict[str, Optional[VoteResult]]):
+        """
+        Locks many votes on the corresponding nomination at once, or returns an error.
+        """
+        nomination = self.get_specific_nomination(state.moment.day, nominee)
+        if not nomination:
+            return "There is no such nomination."
+        
+        return nomination.lock_votes(state=state, results=results)
+
     def mark(self, *, state: "State", nominee: str, mark: bool):
         """
         Sets the marked state on the corresponding nomination.
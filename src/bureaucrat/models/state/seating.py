@@ -1,10 +1,14 @@
+import functools
+
 from bureaucrat.models.configure import dotdict
+from bureaucrat.utility import metrics
+from collections import Counter
 from datetime import datetime
 from difflib import SequenceMatcher
 from discord import Member, PartialEmoji, SelectOption
 from enum import IntEnum
 from sqids.sqids import Sqids
-from typing import Optional, List, TYPE_CHECKING, Literal
+from typing import Dict, Optional, List, Tuple, TYPE_CHECKING, Literal
 
 if TYPE_CHECKING:
     from bureaucrat import Bureaucrat
@@ -86,6 +90,24 @@ class Roles(dotdict):
         return f"{true}{apparent if private or kind == Type.Player else ''}"
 
 
+# Each seat's (true, apparent) characters, in seating order.
+RoleSignature = Tuple[Tuple[Optional[str], Optional[str]], ...]
+
+
+@functools.lru_cache(maxsize=256)
+def index_roles(signature: RoleSignature) -> Dict[str, Tuple[int, ...]]:
+    """
+    Maps each character to the seats (by index, in seating order) that either are or appear to be that character.
+    Cached by the characters in play, so it is only rebuilt when some seat's characters change.
+    """
+    index: Dict[str, List[int]] = {}
+    for i, (true, apparent) in enumerate(signature):
+        for role in (true, apparent) if true != apparent else (true,):
+            if role:
+                index.setdefault(role, []).append(i)
+    return {role: tuple(seats) for role, seats in index.items()}
+
+
 class Seat(dotdict):
     """
     A player in the game.
@@ -113,6 +135,47 @@ class Seating(dotdict):
     def __init__(self, *, seats: List[dict] = [], already_init: bool = False):
         self.seats = [Seat(**opts) for opts in seats]
         self.already_init = already_init
+        self.recount()
+
+    def recount(self):
+        """
+        Counts the seats by status and type, so that vote requirements don't have to scan the seating. The counts are
+        kept up to date by the methods that change a seat's status, type or presence; they aren't saved with the state.
+        """
+        object.__setattr__(self, "_counts", Counter())
+        for seat in self.seats:
+            self._count(seat, 1)
+
+    def _count(self, seat: Seat, delta: int):
+        # Removed seats still count by their status and type, as they always have for vote requirements.
+        self._counts[seat.status.name.lower()] += delta
+        if seat.kind == Type.Traveller:
+            self._counts["travellers"] += delta
+        if seat.removed:
+            self._counts["removed"] += delta
+
+    @property
+    def alive(self) -> int:
+        return self._counts["alive"]
+
+    @property
+    def dead(self) -> int:
+        """
+        Dead seats that still have their ghost vote.
+        """
+        return self._counts["dead"]
+
+    @property
+    def spent(self) -> int:
+        return self._counts["spent"]
+
+    @property
+    def travellers(self) -> int:
+        return self._counts["travellers"]
+
+    @property
+    def removed(self) -> int:
+        return self._counts["removed"]
 
     def active_seats(self):
         """
@@ -120,6 +183,15 @@ class Seating(dotdict):
         """
         return list(seat for seat in self.seats if not seat.removed)
 
+    def role_signature(self) -> RoleSignature:
+        return tuple((seat.roles.true, seat.roles.apparent) for seat in self.seats)
+
+    def role_index(self) -> Dict[str, Tuple[int, ...]]:
+        """
+        Gets the seats holding each character; see index_roles.
+        """
+        return index_roles(self.role_signature())
+
     def index(self, id: str):
         """
         Gets the index of the seat corresponding to the given alias.
@@ -224,7 +296,9 @@ class Seating(dotdict):
             return False
         
         if status:
+            self._count(self.seats[l], -1)
             self.seats[l].status = status
+            self._count(self.seats[l], 1)
         return True
     
     def set_type(self, *, id: str, type: Optional[Type]):
@@ -236,7 +310,9 @@ class Seating(dotdict):
             return False
         
         if type:
+            self._count(self.seats[l], -1)
             self.seats[l].kind = type
+            self._count(self.seats[l], 1)
         return True
 
     def add_player(self, *, user: Member, kind: Type, role: Optional[str], apparent: Optional[str]):
@@ -248,6 +324,7 @@ class Seating(dotdict):
         
         seat = Seat(member=user.id, alias=user.display_name, kind=kind, roles={"true": role, "apparent": apparent})
         self.seats.append(seat)
+        self._count(seat, 1)
         return True
 
     def remove_player(self, *, id: str):
@@ -258,7 +335,10 @@ class Seating(dotdict):
         if l is None:
             return None
         
-        self.seats[l].removed = True
+        if not self.seats[l].removed:
+            self._count(self.seats[l], -1)
+            self.seats[l].removed = True
+            self._count(self.seats[l], 1)
         return self.seats[l]
 
     def substitute_player(self, *, id: str, user: Member):
@@ -274,6 +354,7 @@ class Seating(dotdict):
         self.seats[l].alias = user.display_name
         return prev_id
 
+    @metrics.timed("render")
     def make_page(self, *, bot: "Bureaucrat", private: bool):
         """
         Create the embed text for a game.
@@ -295,5 +376,4 @@ class Seating(dotdict):
                 count = len(self.seats)
                 return (count + 1) // 2
             case Type.Player:
-                alive = len([seat for seat in self.seats if seat.status == Status.Alive])
-                return (alive + 1) // 2
+                return (self.alive + 1) // 2
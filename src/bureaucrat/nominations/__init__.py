@@ -1,17 +1,24 @@
 
 from bureaucrat.models import CONFIG
-from bureaucrat.models.games import ActiveGame, Game, ManagedThread, Participant, RoleType, ThreadType
+from bureaucrat.models.events import EventLog
+from bureaucrat.models.games import Game, ManagedThread, Participant, RoleType, ThreadType
 from bureaucrat.models.state import NominationType, VoteResult, Marker, Phase, State, Seat, Status, Type
 from bureaucrat.utility import checks, embeds
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from discord import app_commands as apc, Interaction, Member, TextChannel, Thread
+from discord import app_commands as apc, HTTPException, Interaction, Member, Message, TextChannel, Thread
 from discord.ext import commands, tasks
 from discord.ext.commands import Context
-from typing import TYPE_CHECKING, Optional, List, Dict
+from typing import TYPE_CHECKING, Optional, List, Dict, Tuple
 
 if TYPE_CHECKING:
     from bureaucrat import Bureaucrat
 
+from .batch import BatchLockModal, describe_batch, parse_batch
+from .clockhand import Clockhands
+from .live import LiveBoard
+
 
 async def setup(bot):
     await bot.add_cog(Nominations(bot))
@@ -19,26 +26,52 @@ async def setup(bot):
 
 class Nominations(commands.GroupCog, group_name="nominations"):
 
+    # Day summaries kept, across every game.
+    SUMMARIES = 128
+
     def __init__(self, bot: "Bureaucrat") -> None:
         self.bot = bot
 
+        self._clockhands = Clockhands(self)
+        self._live = LiveBoard(self)
+        self._summaries: OrderedDict[Tuple[str, int, Optional[int]], str] = OrderedDict()
+
+    async def cog_unload(self) -> None:
+        self._clockhands.stop_all()
+        self._live.stop_all()
+
     async def followup_ethereal(self, interaction: Interaction, **kwargs):
         await self.bot.followup_ethereal(interaction, title="Nominations", **kwargs)
 
     async def send_ethereal(self, interaction: Interaction, **kwargs):
         await self.bot.send_ethereal(interaction, title="Nominations", **kwargs)
 
+    @asynccontextmanager
+    async def _announcement(self):
+        """
+        Collects the announcements sent while creating a nomination. If the nomination doesn't commit, they are deleted,
+        since each is a live message that nothing would ever edit.
+        """
+        sent: List[Message] = []
+        try:
+            yield sent
+        except BaseException:
+            for message in sent:
+                try:
+                    await message.delete()
+                except HTTPException as e:
+                    self.bot.logger.warning(f"Failed to delete the announcement of a nomination that didn't go through: {e}")
+            raise
+
     # AUTOCOMPLETES
 
     async def autocomplete(self, interaction: Interaction, current: str):
         """
         Returns a list of all players, for contexts where the day is unclear.
         """
-        channel_id = self.bot.get_channel_id(interaction.channel)
-        in_channel = await ActiveGame.objects.select_related(ActiveGame.game).get_or_none(id=channel_id)
-        if in_channel is None:
+        game = await self.bot.get_active_game(interaction.channel)
+        if game is None:
             return []
-        game = in_channel.game
         state = State.load(game.state)
         return [apc.Choice(name=seat.alias, value=seat.id) for seat in state.seating.seats if current.lower() in seat.alias.lower()]        
 
@@ -46,11 +79,9 @@ class Nominations(commands.GroupCog, group_name="nominations"):
         """
         Returns a list of players that can still nominate today.
         """
-        channel_id = self.bot.get_channel_id(interaction.channel)
-        in_channel = await ActiveGame.objects.select_related(ActiveGame.game).get_or_none(id=channel_id)
-        if in_channel is None:
+        game = await self.bot.get_active_game(interaction.channel)
+        if game is None:
             return []
-        game = in_channel.game
         state = State.load(game.state)
         return [apc.Choice(name=seat.alias, value=seat.id) for seat in state.seating.seats if current.lower() in seat.alias.lower()]
 
@@ -58,11 +89,9 @@ class Nominations(commands.GroupCog, group_name="nominations"):
         """
         Returns a list of players that can still be nominated today.
         """
-        channel_id = self.bot.get_channel_id(interaction.channel)
-        in_channel = await ActiveGame.objects.select_related(ActiveGame.game).get_or_none(id=channel_id)
-        if in_channel is None:
+        game = await self.bot.get_active_game(interaction.channel)
+        if game is None:
             return []
-        game = in_channel.game
         state = State.load(game.state)
 
         unnominated = [seat for seat in state.seating.seats if not any(nom.nominee == seat.id for nom in state.nominations.get_nominations(state.moment.day))]
@@ -72,11 +101,9 @@ class Nominations(commands.GroupCog, group_name="nominations"):
         """
         Returns a list of players that have already been nominated today.
         """
-        channel_id = self.bot.get_channel_id(interaction.channel)
-        in_channel = await ActiveGame.objects.select_related(ActiveGame.game).get_or_none(id=channel_id)
-        if in_channel is None:
+        game = await self.bot.get_active_game(interaction.channel)
+        if game is None:
             return []
-        game = in_channel.game
         state = State.load(game.state)
 
         nominated = [seat for seat in state.seating.seats if any(nom.nominee == seat.id for nom in state.nominations.get_nominations(state.moment.day))]
@@ -101,6 +128,8 @@ class Nominations(commands.GroupCog, group_name="nominations"):
 
     async def _list(self, interaction: Interaction, game: Game, day: Optional[int] = None):
         state = State.load(game.state)
+        if day is not None:
+            await EventLog.load_day(game, state, day)
 
         user_id = interaction.user.id
         participant = await Participant.objects.get_or_none(game=game, member=user_id)        
@@ -134,6 +163,8 @@ class Nominations(commands.GroupCog, group_name="nominations"):
         participant = await Participant.objects.get_or_none(game=game, member=user_id)        
         private = (not public) and (user_id in self.bot.owner_ids or game.owner == user_id or (participant and participant.role == RoleType.STORYTELLER))
 
+        if day is not None:
+            await EventLog.load_day(game, state, day)
         day = day if day is not None else state.moment.day
         nomination = state.nominations.get_specific_nomination(day, nominee)
      
@@ -148,6 +179,45 @@ class Nominations(commands.GroupCog, group_name="nominations"):
         else:
             await interaction.response.send_message(embed=embeds.make_embed(self.bot, title="Nominations", description=description), ephemeral=True)
 
+    @apc.command()
+    @apc.describe(day="The day to summarize. Defaults to the current day.")
+    @apc.describe(public="Whether to post the summary in the channel. Defaults to only showing it to you.")
+    async def summary(self, interaction: Interaction, day: Optional[int], public: Optional[bool]):
+        """
+        Rank a day's nominations by votes, and show who is on the block.
+        """
+        if not await checks.in_guild(self.bot, interaction):
+            return
+
+        game = await self.bot.ensure_active(interaction)
+        if game is None:
+            return
+
+        if public and not await self.bot.ensure_privileged(interaction, game):
+            return
+
+        description = await self.make_summary(game, day)
+        await interaction.response.send_message(embed=embeds.make_embed(self.bot, title="Summary", description=description[:4096]), ephemeral=not public)
+
+    async def make_summary(self, game: Game, day: Optional[int] = None):
+        """
+        Gets a day's summary, which is cached until the game next changes.
+        """
+        key = (game.id, game.revision, day)
+        if key in self._summaries:
+            self._summaries.move_to_end(key)
+            return self._summaries[key]
+
+        state = State.load(game.state)
+        if day is not None:
+            await EventLog.load_day(game, state, day)
+        description = state.nominations.make_summary(bot=self.bot, day=day, state=state)
+
+        self._summaries[key] = description
+        while len(self._summaries) > self.SUMMARIES:
+            self._summaries.popitem(last=False)
+        return description
+
     # NOMINATION
 
     @apc.command()
@@ -160,7 +230,7 @@ class Nominations(commands.GroupCog, group_name="nominations"):
         if not await checks.in_guild(self.bot, interaction):
             return
     
-        async with CONFIG.database.transaction():
+        async with self._announcement() as sent, CONFIG.database.transaction():
             game = await self.bot.ensure_active(interaction)
             if game is None:
                 return
@@ -180,11 +250,17 @@ class Nominations(commands.GroupCog, group_name="nominations"):
 
             nominee_seat = state.seating.seats[state.seating.index(nominee)]
 
-            game.state = state.dump()
-            await game.update()            
+            # The announcement is also the nomination's live message, so its id is saved along with the nomination.
+            nomination = state.nominations.get_specific_nomination(state.moment.day, nominee)
+            thread = self.bot.get_channel(thread.id) or await interaction.guild.fetch_channel(thread.id)
+            message = await thread.send(
+                content=f"<@&{game.player_role}> <@&{game.st_role}>\n{interaction.user.mention} has nominated <@{nominee_seat.member}>.",
+                embed=LiveBoard.render(bot=self.bot, state=state, nomination=nomination),
+            )
+            sent.append(message)
+            nomination.message = message.id
 
-        thread = self.bot.get_channel(thread.id) or await interaction.guild.fetch_channel(thread.id)
-        await thread.send(content=f"<@&{game.player_role}> <@&{game.st_role}>\n{interaction.user.mention} has nominated <@{nominee_seat.member}>.")
+            await EventLog.append(game, state, "nomination.create", nominator=nominator, nominee=nominee, message=message.id)
 
         await self._show(interaction, game, nominee, None, followup=True)
 
@@ -199,7 +275,7 @@ class Nominations(commands.GroupCog, group_name="nominations"):
         if not await checks.in_guild(self.bot, interaction):
             return
     
-        async with CONFIG.database.transaction():
+        async with self._announcement() as sent, CONFIG.database.transaction():
             game = await self.bot.ensure_active(interaction)
             if game is None:
                 return
@@ -219,11 +295,16 @@ class Nominations(commands.GroupCog, group_name="nominations"):
             nominator_seat = state.seating.seats[state.seating.index(nominator)]
             nominee_seat = state.seating.seats[state.seating.index(nominee)]
 
-            game.state = state.dump()
-            await game.update()            
+            nomination = state.nominations.get_specific_nomination(state.moment.day, nominee)
+            thread = self.bot.get_channel(thread.id) or await interaction.guild.fetch_channel(thread.id)
+            message = await thread.send(
+                content=f"<@&{game.player_role}> <@&{game.st_role}>\n<@{nominator_seat.member}> has nominated <@{nominee_seat.member}>.",
+                embed=LiveBoard.render(bot=self.bot, state=state, nomination=nomination),
+            )
+            sent.append(message)
+            nomination.message = message.id
 
-        thread = self.bot.get_channel(thread.id) or await interaction.guild.fetch_channel(thread.id)
-        await thread.send(content=f"<@&{game.player_role}> <@&{game.st_role}>\n<@{nominator_seat.member}> has nominated <@{nominee_seat.member}>.")
+            await EventLog.append(game, state, "nomination.create", nominator=nominator, nominee=nominee, message=message.id)
 
         await self._show(interaction, game, nominee, None, followup=True)
 
@@ -260,9 +341,9 @@ class Nominations(commands.GroupCog, group_name="nominations"):
             if required:
                 nomination.required = required
 
-            game.state = state.dump()
-            await game.update()
+            await EventLog.append(game, state, "nomination.edit", nominee=nominee, required=required, accusation=accusation, defense=defense)
         
+        self._live.touch(interaction.channel, state.moment.day, nominee)
         await self._show(interaction, game, nominee, None)
 
     @apc.command()
@@ -289,9 +370,9 @@ class Nominations(commands.GroupCog, group_name="nominations"):
             if err:
                 return await self.send_ethereal(interaction, description=err)
             
-            game.state = state.dump()
-            await game.update()
+            await EventLog.append(game, state, "nomination.default", nominee=nominee)
         
+        self._live.touch(interaction.channel, state.moment.day, nominee)
         await self._show(interaction, game, nominee, None)
 
     @apc.command()
@@ -318,9 +399,9 @@ class Nominations(commands.GroupCog, group_name="nominations"):
             if err:
                 return await self.send_ethereal(interaction, description=err)
 
-            game.state = state.dump()
-            await game.update()
+            await EventLog.append(game, state, "nomination.mark", nominee=nominee, mark=True)
         
+        self._live.touch(interaction.channel, state.moment.day, nominee)
         await self._show(interaction, game, nominee, None)
 
     @apc.command()
@@ -347,9 +428,9 @@ class Nominations(commands.GroupCog, group_name="nominations"):
             if err:
                 return await self.send_ethereal(interaction, description=err)
 
-            game.state = state.dump()
-            await game.update()
+            await EventLog.append(game, state, "nomination.mark", nominee=nominee, mark=False)
         
+        self._live.touch(interaction.channel, state.moment.day, nominee)
         await self._show(interaction, game, nominee, None)
 
     # PLAYER VOTES
@@ -383,9 +464,9 @@ class Nominations(commands.GroupCog, group_name="nominations"):
             if error:
                 return await self.send_ethereal(interaction, description=error)    
 
-            game.state = state.dump()
-            await game.update()            
+            await EventLog.append(game, state, "vote.set", voter=voter, nominee=nominee, vote=vote, private=private if private is not None else False)
 
+        self._live.touch(interaction.channel, state.moment.day, nominee)
         await self._show(interaction, game, nominee, None)
 
     @votes.command()
@@ -414,9 +495,9 @@ class Nominations(commands.GroupCog, group_name="nominations"):
             if error:
                 return await self.send_ethereal(interaction, description=error)    
 
-            game.state = state.dump()
-            await game.update()            
+            await EventLog.append(game, state, "vote.set", voter=voter, nominee=nominee, vote=None, private=private if private is not None else False)
 
+        self._live.touch(interaction.channel, state.moment.day, nominee)
         await self._show(interaction, game, nominee, None)
 
     @votes.command()
@@ -445,9 +526,9 @@ class Nominations(commands.GroupCog, group_name="nominations"):
             if error:
                 return await self.send_ethereal(interaction, description=f"Failed to lock: `{error}`.")
 
-            game.state = state.dump()
-            await game.update()            
+            await EventLog.append(game, state, "vote.lock", voter=voter, nominee=nominee, result=result)
 
+        self._live.touch(interaction.channel, state.moment.day, nominee)
         await self._show(interaction, game, nominee, None)
 
     @votes.command()
@@ -475,9 +556,60 @@ class Nominations(commands.GroupCog, group_name="nominations"):
             if error:
                 return await self.send_ethereal(interaction, description=f"Failed to unlock: `{error}`.")
 
-            game.state = state.dump()
-            await game.update()            
+            await EventLog.append(game, state, "vote.lock", voter=voter, nominee=nominee, result=None)
 
+        self._live.touch(interaction.channel, state.moment.day, nominee)
+        await self._show(interaction, game, nominee, None)
+
+    @votes.command()
+    @apc.autocomplete(nominee=existing_nominees)
+    @apc.describe(nominee="The nominated player.")
+    @apc.describe(results="Every result in seat order, separated by commas (e.g. yes, no, -, thief). Leave out to open a form.")
+    async def batch(self, interaction: Interaction, nominee: str, results: Optional[str]):
+        """
+        Lock every vote on a nomination at once.
+        """
+        if not await checks.in_guild(self.bot, interaction):
+            return
+
+        game = await self.bot.ensure_active(interaction)
+        if game is None:
+            return
+
+        if not await self.bot.ensure_privileged(interaction, game):
+            return
+
+        if results is not None:
+            return await self._batch(interaction, nominee, results)
+
+        state = State.load(game.state)
+        nomination = state.nominations.get_specific_nomination(state.moment.day, nominee)
+        if nomination is None:
+            return await self.send_ethereal(interaction, description="There is no such nomination.")
+
+        default = describe_batch(state=state, nomination=nomination)
+        await interaction.response.send_modal(BatchLockModal().with_parent(parent=self, nominee=nominee, default=default))
+
+    async def _batch(self, interaction: Interaction, nominee: str, text: str):
+        async with CONFIG.database.transaction():
+            game = await self.bot.ensure_active(interaction)
+            if game is None:
+                return
+
+            state = State.load(game.state)
+            nomination = state.nominations.get_specific_nomination(state.moment.day, nominee)
+            if nomination is None:
+                return await self.send_ethereal(interaction, description="There is no such nomination.")
+
+            results, errors = parse_batch(text, state=state, nomination=nomination)
+            error = "\n".join(errors) if errors else state.nominations.lock_votes(state=state, nominee=nominee, results=results)
+            if error:
+                return await self.send_ethereal(interaction, description=f"Failed to lock, so nothing was changed:\n{error}")
+
+            serialized = {voter: result.value if result is not None else None for voter, result in results.items()}
+            await EventLog.append(game, state, "vote.batch", nominee=nominee, results=serialized)
+
+        self._live.touch(interaction.channel, state.moment.day, nominee)
         await self._show(interaction, game, nominee, None)
 
     add = apc.Group(name="add", description="Add trial statements to open nominations.")
@@ -508,9 +640,9 @@ class Nominations(commands.GroupCog, group_name="nominations"):
             if error:
                 return await self.send_ethereal(interaction, description=error)    
 
-            game.state = state.dump()
-            await game.update()            
+            await EventLog.append(game, state, "nomination.accuse", nominator=nominator, nominee=nominee, accusation=accusation)
 
+        self._live.touch(interaction.channel, state.moment.day, nominee)
         await self._show(interaction, game, nominee, None)
 
     @add.command()
@@ -537,7 +669,73 @@ class Nominations(commands.GroupCog, group_name="nominations"):
             if error:
                 return await self.send_ethereal(interaction, description=error)    
 
-            game.state = state.dump()
-            await game.update()            
+            await EventLog.append(game, state, "nomination.defend", nominee=nominee, defense=defense)
 
+        self._live.touch(interaction.channel, state.moment.day, nominee)
         await self._show(interaction, game, nominee, None)
+
+    # CLOCKHAND
+
+    clockhand = apc.Group(name="clockhand", description="Run votes automatically.")
+
+    @clockhand.command(name="start")
+    @apc.autocomplete(nominee=existing_nominees)
+    @apc.describe(nominee="The nomination to vote on.")
+    @apc.describe(interval="Seconds between each vote being locked. Set to 0 to lock every vote at once.")
+    async def clockhand_start(self, interaction: Interaction, nominee: str, interval: Optional[apc.Range[float, 0, 60]]):
+        """
+        Start (or resume) the clockhand, locking each player's vote as written, in seat order.
+        """
+        if not await checks.in_guild(self.bot, interaction):
+            return
+
+        game = await self.bot.ensure_active(interaction)
+        if game is None:
+            return
+
+        if not await self.bot.ensure_privileged(interaction, game):
+            return
+
+        state = State.load(game.state)
+        nomination = state.nominations.get_specific_nomination(state.moment.day, nominee)
+        if nomination is None:
+            return await self.send_ethereal(interaction, description="There is no such nomination.")
+        if nomination.next_unlocked() is None:
+            return await self.send_ethereal(interaction, description="Every vote on this nomination is already locked.")
+
+        await interaction.response.defer(ephemeral=True)
+
+        # The vote plays out in the nomination thread, where everyone can watch the hand move.
+        thread = await ManagedThread.objects.get_or_none(game=game, type=ThreadType.Nomination)
+        target = (self.bot.get_channel(thread.id) or await interaction.guild.fetch_channel(thread.id)) if thread else interaction.channel
+
+        nominee_seat = state.seating.seats[state.seating.index(nominee)]
+        message = await target.send(
+            content=f"<@&{game.player_role}> The vote on <@{nominee_seat.member}> is starting.",
+            embed=embeds.make_embed(self.bot, title="Clockhand", description="The clockhand is starting..."),
+        )
+
+        if interval is None:
+            interval = self.bot.config.nominations.get("clockhand_interval", 2)
+        self._clockhands.start(channel=interaction.channel, day=state.moment.day, nominee=nominee, interval=interval, message=message)
+        await self.followup_ethereal(interaction, description=f"Started the clockhand in {message.jump_url}.")
+
+    @clockhand.command(name="stop")
+    async def clockhand_stop(self, interaction: Interaction):
+        """
+        Stop the clockhand running in this channel. Votes it has already locked stay locked.
+        """
+        if not await checks.in_guild(self.bot, interaction):
+            return
+
+        game = await self.bot.ensure_active(interaction)
+        if game is None:
+            return
+
+        if not await self.bot.ensure_privileged(interaction, game):
+            return
+
+        if self._clockhands.stop(self.bot.get_channel_id(interaction.channel)):
+            await self.send_ethereal(interaction, description="Stopped the clockhand.")
+        else:
+            await self.send_ethereal(interaction, description="There is no clockhand running in this channel.")
@@ -0,0 +1,79 @@
+import re
+
+from bureaucrat.models.state import State, VoteResult
+from bureaucrat.models.state.nominations import Nomination
+from discord import Interaction, TextStyle, ui
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from bureaucrat.nominations import Nominations
+
+
+# Placeholders that leave a vote as it is, and the word that unlocks it.
+SKIP = ("", "-", "_")
+UNLOCK = "unlock"
+
+
+def parse_batch(text: str, *, state: State, nomination: Nomination) -> Tuple[Dict[str, Optional[VoteResult]], List[str]]:
+    """
+    Reads a list of results in seat order, separated by commas or newlines. Each entry may be prefixed by the voter's
+    alias (e.g. "Alice: yes"), in which case it must match the voter in that position.
+    Returns the result for each voter that should change, and anything that couldn't be read.
+    """
+    entries = [entry.strip() for entry in re.split(r"[,\n]", text.strip())]
+    if len(entries) > len(nomination.voters):
+        return {}, [f"There are {len(entries)} results, but only {len(nomination.voters)} voters."]
+
+    results = {}
+    errors = []
+    for vote, entry in zip(nomination.voters, entries):
+        seat = state.seating.seats[state.seating.index(vote.id)]
+        alias, _, value = entry.rpartition(":")
+        if alias and alias.strip().lower() != seat.alias.lower():
+            errors.append(f"Expected {seat.alias} in this position, not {alias.strip()}.")
+            continue
+
+        value = value.strip().lower()
+        if value in SKIP:
+            continue
+        if value == UNLOCK:
+            results[vote.id] = None
+            continue
+
+        result = VoteResult.lookup(value)
+        if result is None:
+            errors.append(f"{seat.alias}: `{value}` isn't a result.")
+        else:
+            results[vote.id] = result
+    return results, errors
+
+
+def describe_batch(*, state: State, nomination: Nomination) -> str:
+    """
+    Lists the voters in seat order, each with their locked result, or else the result their written vote suggests.
+    """
+    lines = []
+    for vote in nomination.voters:
+        seat = state.seating.seats[state.seating.index(vote.id)]
+        result = vote.locked if vote.locked is not None else vote.resolve()
+        lines.append(f"{seat.alias}: {result.name.lower() if result is not None else ''}")
+    return "\n".join(lines)
+
+
+class BatchLockModal(ui.Modal, title="Lock votes"):
+    """
+    A Discord modal for locking every vote on a nomination at once, one line per voter in seat order.
+    """
+
+    results = ui.TextInput(label="Results", style=TextStyle.paragraph, max_length=4000)
+
+    def with_parent(self, *, parent: "Nominations", nominee: str, default: str):
+        self.parent = parent
+        self.nominee = nominee
+        self.results.default = default
+        self.results.placeholder = "yes, no, thief or bureaucrat; - to skip, or unlock"
+        return self
+
+    async def on_submit(self, interaction: Interaction) -> None:
+        await self.parent._batch(interaction, self.nominee, self.results.value)
+        self.stop()
@@ -0,0 +1,121 @@
+import asyncio
+
+from bureaucrat.models import CONFIG
+from bureaucrat.models.events import EventLog
+from bureaucrat.models.state import State
+from bureaucrat.utility import embeds
+from discord import Message, TextChannel, Thread
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    from bureaucrat import Bureaucrat
+    from bureaucrat.nominations import Nominations
+
+
+class Clockhand:
+    """
+    Runs the vote on one nomination: every interval, the hand moves to the next voter in seat order and locks their vote
+    as written. Each tick is a single load and save of the game, and a single edit of the vote's message, however many
+    votes it locks; with no interval, the whole vote resolves in one tick.
+    The hand stops at any vote it can't read (e.g. a conditional), so that a storyteller can lock it by hand and start
+    the clockhand again.
+    """
+
+    def __init__(self, parent: "Clockhands", *, channel: TextChannel | Thread, day: int, nominee: str, interval: float, message: Message) -> None:
+        self.bot: "Bureaucrat" = parent.bot
+        self.parent = parent
+        self.channel = channel
+        self.key = self.bot.get_channel_id(channel)
+        self.day = day
+        self.nominee = nominee
+        self.interval = interval
+        self.message = message
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self.task = asyncio.create_task(self.run(), name=f"bureaucrat-clockhand-{self.key}")
+
+    def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+
+    async def run(self):
+        try:
+            while await self.tick():
+                await asyncio.sleep(self.interval)
+        except Exception as e:
+            # A tick that failed partway through may have rolled back what it wrote.
+            self.bot.game_cache.evict(self.channel)
+            self.bot.logger.error(f"The clockhand in {self.key} stopped unexpectedly: {e}")
+        finally:
+            if self.parent.running.get(self.key) is self:
+                del self.parent.running[self.key]
+
+    async def tick(self) -> bool:
+        """
+        Locks the next vote (or every vote, with no interval), and shows the result. Returns whether to keep going.
+        """
+        async with CONFIG.database.transaction():
+            game = await self.bot.get_active_game(self.channel)
+            if game is None:
+                return False
+
+            state = State.load(game.state)
+            nomination = state.nominations.get_specific_nomination(self.day, self.nominee)
+            if nomination is None:
+                return False
+
+            limit = 1 if self.interval > 0 else None
+            locked, halted = nomination.advance(state=state, limit=limit)
+            if locked:
+                await EventLog.append(game, state, "vote.advance", day=self.day, nominee=self.nominee, limit=limit)
+
+        if locked:
+            self.parent.parent._live.touch(self.channel, self.day, self.nominee)
+
+        hand = nomination.next_unlocked()
+        if halted is not None:
+            footer = f"Waiting on {state.seating.seats[state.seating.index(halted)].alias}, whose vote needs a storyteller to lock it."
+        elif hand is None:
+            outcome = "passes" if nomination.is_passing() else f"fails, {nomination.votes_needed()} short"
+            footer = f"The vote is over: {nomination.tally} of {nomination.required} required, so it {outcome}."
+        else:
+            footer = None
+
+        description = nomination.make_description(
+            bot=self.bot, state=state, private=False, show_votes=True, viewer=None, active=hand.id if hand else None
+        )
+        if footer:
+            description = f"{description}\n\n*{footer}*"
+        await self.message.edit(embed=embeds.make_embed(self.bot, title="Clockhand", description=description[:4096]))
+
+        return halted is None and hand is not None
+
+
+class Clockhands:
+    """
+    The clockhands running in each channel; a channel runs at most one vote at a time.
+    """
+
+    def __init__(self, parent: "Nominations") -> None:
+        self.bot: "Bureaucrat" = parent.bot
+        self.parent = parent
+        self.running: Dict[int, Clockhand] = {}
+
+    def start(self, *, channel: TextChannel | Thread, day: int, nominee: str, interval: float, message: Message) -> Clockhand:
+        clockhand = Clockhand(self, channel=channel, day=day, nominee=nominee, interval=interval, message=message)
+        self.stop(clockhand.key)
+        self.running[clockhand.key] = clockhand
+        clockhand.start()
+        return clockhand
+
+    def stop(self, channel_id: int) -> bool:
+        clockhand = self.running.pop(channel_id, None)
+        if clockhand is None:
+            return False
+        clockhand.stop()
+        return True
+
+    def stop_all(self):
+        for channel_id in list(self.running):
+            self.stop(channel_id)
@@ -0,0 +1,95 @@
+import asyncio
+
+from bureaucrat.models.games import ManagedThread, ThreadType
+from bureaucrat.models.state import State
+from bureaucrat.utility import embeds
+from collections import defaultdict
+from discord import HTTPException, Thread
+from discord.abc import GuildChannel
+from typing import TYPE_CHECKING, Dict, Set, Tuple
+
+if TYPE_CHECKING:
+    from bureaucrat import Bureaucrat
+    from bureaucrat.models.state.nominations import Nomination
+    from bureaucrat.nominations import Nominations
+
+
+class LiveBoard:
+    """
+    Keeps each nomination's message in the nomination thread up to date with its public view.
+    Changes are only marked here; a worker per game waits for a burst of them to settle and then edits each changed
+    nomination's message once, from the latest state, spacing its edits out to stay within Discord's edit rate limit.
+    """
+
+    # Seconds to wait for more changes before editing.
+    DEBOUNCE = 1.0
+
+    # Seconds between edits in the same thread; Discord allows about five edits every five seconds per channel.
+    SPACING = 1.0
+
+    def __init__(self, parent: "Nominations") -> None:
+        self.bot: "Bureaucrat" = parent.bot
+        self.parent = parent
+        self.dirty: Dict[int, Set[Tuple[int, str]]] = defaultdict(set)
+        self.channels: Dict[int, GuildChannel | Thread] = {}
+        self.workers: Dict[int, asyncio.Task] = {}
+
+    @classmethod
+    def render(cls, *, bot: "Bureaucrat", state: State, nomination: "Nomination"):
+        description = nomination.make_description(bot=bot, state=state, private=False, show_votes=True, viewer=None)
+        return embeds.make_embed(bot, title="Nomination", description=description[:4096])
+
+    def touch(self, channel: GuildChannel | Thread, day: int, nominee: str):
+        """
+        Marks a nomination as changed, so that its message is edited soon.
+        """
+        key = self.bot.get_channel_id(channel)
+        self.dirty[key].add((day, nominee))
+        self.channels[key] = channel
+        if key not in self.workers:
+            self.workers[key] = asyncio.create_task(self.flush(key), name=f"bureaucrat-live-{key}")
+
+    def stop_all(self):
+        for worker in self.workers.values():
+            worker.cancel()
+
+    async def flush(self, key: int):
+        try:
+            while self.dirty.get(key):
+                await asyncio.sleep(self.DEBOUNCE)
+                changed = self.dirty.pop(key, set())
+                if not await self.edit(self.channels[key], changed):
+                    break
+        except Exception as e:
+            self.bot.logger.error(f"Failed to update the nominations in {key}: {e}")
+        finally:
+            self.workers.pop(key, None)
+            self.dirty.pop(key, None)
+            self.channels.pop(key, None)
+
+    async def edit(self, channel: GuildChannel | Thread, changed: Set[Tuple[int, str]]) -> bool:
+        """
+        Edits the message of every changed nomination in this channel's game. Returns whether the game is still running.
+        """
+        game = await self.bot.get_active_game(channel)
+        if game is None:
+            return False
+
+        thread = await ManagedThread.objects.get_or_none(game=game, type=ThreadType.Nomination)
+        if thread is None:
+            return True
+        target = self.bot.get_channel(thread.id) or await channel.guild.fetch_channel(thread.id)
+
+        state = State.load(game.state)
+        for day, nominee in sorted(changed):
+            nomination = state.nominations.get_specific_nomination(day, nominee)
+            if nomination is None or nomination.message is None:
+                continue
+
+            try:
+                await target.get_partial_message(nomination.message).edit(embed=LiveBoard.render(bot=self.bot, state=state, nomination=nomination))
+            except HTTPException as e:
+                self.bot.logger.warning(f"Failed to edit the message for the nomination of {nominee}: {e}")
+            await asyncio.sleep(self.SPACING)
+
+        return True
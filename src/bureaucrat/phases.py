@@ -1,6 +1,8 @@
 
 from bureaucrat.models import CONFIG
-from bureaucrat.models.games import ActiveGame, Game, Participant, RoleType
+from bureaucrat.models.config import Config
+from bureaucrat.models.events import EventLog
+from bureaucrat.models.games import ActiveGame, Game, ManagedThread, Participant, RoleType, ThreadType
 from bureaucrat.models.state import Marker, Phase, State, Seat, Status, Type
 from bureaucrat.utility import checks, embeds
 from datetime import datetime, timedelta
@@ -119,16 +121,29 @@ class Phases(commands.GroupCog, group_name="phases"):
             
             if not await self.bot.ensure_privileged(interaction, game):
                 return
-        
+
+            # The day is archived from this state rather than replayed by the event, so it must be the latest one.
+            await EventLog.refresh(game)
             state = State.load(game.state)
             if state.moment.phase != Phase.Day:
                 return await self.send_ethereal(interaction, description="It is already nighttime.")
 
+            config = Config.load(game.config)
+            summary = state.nominations.make_summary(bot=self.bot, day=state.moment.day, state=state) if config.summary_at_dusk else None
+
+            # Only today's nominations are kept in the state; finished days are stored apart, and compacting right away
+            # keeps every later load of this game from carrying them.
             state.moment.go_to_dusk()
-            game.state = state.dump()
-            await game.update()
+            await EventLog.archive_days(game, state.nominations.archive(before=state.moment.day))
+            await EventLog.append(game, state, "phase.dusk", compact=True)
+
+            thread = await ManagedThread.objects.get_or_none(game=game, type=ThreadType.Nomination) if summary else None
         
         await self._show(interaction, game)
+
+        if summary:
+            target = (self.bot.get_channel(thread.id) or await interaction.guild.fetch_channel(thread.id)) if thread else interaction.channel
+            await target.send(embed=embeds.make_embed(self.bot, title="Summary", description=summary[:4096]))
     
     @go.command()
     async def dawn(self, interaction: Interaction):
@@ -151,7 +166,6 @@ class Phases(commands.GroupCog, group_name="phases"):
                 return await self.send_ethereal(interaction, description="It is already daytime.")
 
             state.moment.go_to_dawn()
-            game.state = state.dump()
-            await game.update()
+            await EventLog.append(game, state, "phase.dawn")
         
         await self._show(interaction, game)
@@ -1,5 +1,6 @@
 import re
 
+from bureaucrat.models import CONFIG
 from bureaucrat.models.reminders import Reminder, Interval
 from bureaucrat.utility import embeds
 from datetime import datetime, timedelta
@@ -133,8 +134,9 @@ class Reminders(commands.GroupCog, group_name="reminders"):
         timestamp = datetime.now()
         id = Sqids(min_length=8).encode([author.id, int(timestamp.timestamp())])
         expires = timestamp + delta
+        guild = channel.guild.id if getattr(channel, "guild", None) else None
         reminder = await Reminder.objects.create(
-            id=id, author=author.id, channel=channel.id, message=message, expires=expires
+            id=id, author=author.id, guild=guild, channel=channel.id, message=message, expires=expires
         )
 
         # Setup the interval reminders.
@@ -197,11 +199,27 @@ class Reminders(commands.GroupCog, group_name="reminders"):
         )
         return reminder
 
+    @classmethod
+    async def claim(cls, interval: Interval) -> bool:
+        """
+        Marks an interval as fired, unless some other process got to it first.
+        """
+        table = Interval.ormar_config.table
+        claim = (
+            table.update()
+            .where(table.c.id == interval.id, table.c.fired.is_(False))
+            .values(fired=True)
+            .returning(table.c.id)
+        )
+        return await CONFIG.database.fetch_val(claim) is not None
+
     @tasks.loop(seconds=10)
     async def fire(self):
         """
         Checks all intervals for any that have expired, and sends their corresponding reminder.
         If their parent reminder has also expired, then we delete the parent and all of its ping intervals.
+        Each process only fires reminders for the guilds its shards serve, and claims an interval before sending it,
+        so a reminder is never sent twice.
         """
         timestamp = datetime.now()
         expired_intervals = await Interval.objects.select_related(Interval.reminder).all(
@@ -210,6 +228,9 @@ class Reminders(commands.GroupCog, group_name="reminders"):
 
         expired = []
         for interval in expired_intervals:
+            if not self.bot.serves_guild(interval.reminder.guild) or not await Reminders.claim(interval):
+                continue
+
             self.bot.logger.debug(f"Fire: interval {interval.id} on reminder {interval.reminder.id} expired.")
 
             channel_id = interval.reminder.channel
@@ -217,9 +238,8 @@ class Reminders(commands.GroupCog, group_name="reminders"):
             stamp = int(interval.reminder.expires.timestamp())
             description = f"Reminder `{interval.reminder.id}` for <@{interval.reminder.author}>:\n{interval.reminder.message} <t:{stamp}:R> (<t:{stamp}:t>)"
 
-            # Insert interval reminders back into the table, but don't refire them unless explicitly rearmed.
+            # The interval stays in the table, already marked fired by the claim, and won't refire unless it is rearmed.
             await channel.send(content=description)
-            await interval.update(fired=True)
 
             # Fully discard reminders that have reached their expiry date.
             if interval.reminder.expires < timestamp:
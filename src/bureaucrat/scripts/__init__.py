@@ -5,6 +5,7 @@ from discord import app_commands as apc, Attachment, Interaction, Member
 from discord.ext import commands
 from typing import TYPE_CHECKING, Optional
 
+from .bundle import ScriptBundle
 from .details import ScriptDetailsView
 from .listing import ScriptListView
 from .new import NewScriptView
@@ -27,22 +28,25 @@ class Scripts(commands.GroupCog, group_name="script"):
 
     @apc.command()
     @apc.describe(id="Enter the script's id.")
-    @CONFIG.database.transaction()
     async def delete(self, interaction: Interaction, id: str) -> None:
         """
         Delete one of your scripts.
         """
         try:
-            script = await Script.objects.get(id=id)
-            if script.author != interaction.user.id:
-                user = await self.bot.fetch_user(script.author)
-                return await interaction.response.send_message(
-                    embed=embeds.unauthorized(self.bot, f"You are not the owner of this script, {user.mention} is."),
-                    delete_after=5, ephemeral=True,
-                )
-            await self.bot.aws.s3_delete(bucket="scripts", prefix=script.id)
-            await Document.objects.delete(script=script)
-            await Script.objects.delete(id=id)
+            async with CONFIG.database.transaction():
+                script = await Script.objects.get(id=id)
+                if script.author != interaction.user.id:
+                    return await interaction.response.send_message(
+                        embed=embeds.unauthorized(self.bot, f"You are not the owner of this script, <@{script.author}> is."),
+                        delete_after=5, ephemeral=True,
+                    )
+                await self.bot.aws.s3_delete(bucket="scripts", prefix=script.id)
+                await Document.objects.delete(script=script)
+                await Script.objects.delete(id=id)
+
+            # Only once the deletion is committed.
+            ScriptBundle.evict(id)
+            ScriptListView.invalidate()
         except ormar.NoMatch as e:
             pass
 
@@ -0,0 +1,131 @@
+import asyncio
+import os
+
+from bureaucrat.models.scripts import Document
+from collections import OrderedDict
+from tempfile import SpooledTemporaryFile
+from typing import TYPE_CHECKING, List
+from urllib.parse import urlparse
+from zipfile import ZipFile
+
+if TYPE_CHECKING:
+    from bureaucrat import Bureaucrat
+
+
+class BundleTooLarge(Exception):
+    """
+    Raised when a bundle grows past the size it is allowed to be sent at.
+    """
+
+    def __init__(self, size: int, limit: int):
+        super().__init__(f"bundle is {size} bytes, but the limit is {limit} bytes")
+        self.size = size
+        self.limit = limit
+
+
+class ScriptBundle:
+    """
+    Serves the downloadable .zip for a script.
+    New scripts upload a bundle at render time; older scripts have theirs built by streaming their documents out of S3.
+    Scripts never change once they are persisted, so finished bundles are cached by script id.
+    """
+
+    CACHE: OrderedDict[str, bytes] = OrderedDict()
+    CACHE_SIZE = 16
+    CONCURRENCY = 8
+    SPOOL_SIZE = 8 * 1024 * 1024
+
+    @classmethod
+    def arcname(cls, basename: str, doctype: str):
+        """
+        Gets the path of a document inside the bundle; PDFs and PNGs get their own folders.
+        """
+        match doctype:
+            case ".pdf":
+                return f"pdf/{basename}"
+            case ".png":
+                return f"pages/{basename}"
+            case _:
+                return basename
+
+    @classmethod
+    def evict(cls, id: str):
+        """
+        Drops a script's bundle from the cache.
+        """
+        cls.CACHE.pop(id, None)
+
+    @classmethod
+    def remember(cls, id: str, content: bytes):
+        """
+        Caches a finished bundle, discarding the least recently used one if the cache is full.
+        """
+        cls.CACHE[id] = content
+        cls.CACHE.move_to_end(id)
+        while len(cls.CACHE) > cls.CACHE_SIZE:
+            cls.CACHE.popitem(last=False)
+
+    @classmethod
+    async def download(cls, *, bot: "Bureaucrat", id: str, doc: Document, limit: int) -> bytes:
+        """
+        Downloads (or recalls) a prebuilt bundle, checking its size before fetching it.
+        """
+        cached = cls.CACHE.get(id)
+        if cached is not None:
+            cls.CACHE.move_to_end(id)
+            if len(cached) >= limit:
+                raise BundleTooLarge(len(cached), limit)
+            return cached
+
+        key = bot.aws.s3_key(doc.url)
+        size = await bot.aws.s3_size(key=key)
+        if size >= limit:
+            raise BundleTooLarge(size, limit)
+
+        content = await bot.aws.s3_read(key=key)
+        cls.remember(id, content)
+        return content
+
+    @classmethod
+    async def build(cls, *, bot: "Bureaucrat", id: str, docs: List[Document], limit: int) -> bytes:
+        """
+        Builds (or recalls) the bundle for a script, aborting as soon as it reaches the given size limit.
+        """
+        cached = cls.CACHE.get(id)
+        if cached is not None:
+            cls.CACHE.move_to_end(id)
+            if len(cached) >= limit:
+                raise BundleTooLarge(len(cached), limit)
+            return cached
+
+        semaphore = asyncio.Semaphore(cls.CONCURRENCY)
+
+        async def fetch(doc: Document):
+            async with semaphore:
+                bot.logger.debug(f"Fetching {doc.url}.")
+                data = await bot.aws.s3_read(key=bot.aws.s3_key(doc.url))
+                return cls.arcname(os.path.basename(urlparse(doc.url).path), doc.doctype), data
+
+        # Documents are written in whatever order they arrive, so one slow object doesn't hold up the rest.
+        tasks = [asyncio.create_task(fetch(doc)) for doc in docs]
+        try:
+            with SpooledTemporaryFile(max_size=cls.SPOOL_SIZE) as spool:
+                with ZipFile(spool, "w") as zipfile:
+                    for fetched in asyncio.as_completed(tasks):
+                        arcname, data = await fetched
+                        zipfile.writestr(arcname, data)
+                        if spool.tell() >= limit:
+                            raise BundleTooLarge(spool.tell(), limit)
+
+                spool.seek(0)
+                content = spool.read()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        # Finishing the archive adds its central directory, which can push it over the limit; a bundle that can never be
+        # sent isn't worth the cache space.
+        if len(content) >= limit:
+            raise BundleTooLarge(len(content), limit)
+        cls.remember(id, content)
+        return content
@@ -1,80 +1,69 @@
 import humanize
-import os
 
 from bureaucrat.models.configure import ormar
 from bureaucrat.models.scripts import *
 from bureaucrat.utility import embeds
 from discord import ButtonStyle, File, ui, Interaction
-from pathlib import Path
-from tempfile import TemporaryDirectory
-from threading import Thread
+from io import BytesIO
 from typing import TYPE_CHECKING, List
-from urllib.request import urlretrieve
-from urllib.parse import urlparse
-from zipfile import ZipFile
+
+from .bundle import BundleTooLarge, ScriptBundle
 
 if TYPE_CHECKING:
     from bureaucrat import Bureaucrat
 
 
 class ScriptDetailsView(ui.View):
+    """
+    Pages through a script's rendered PNGs, and offers the whole render as a download.
+    Every document is loaded once, already in page order, when the view is created.
+    """
 
     def __init__(
-        self, *, bot: "Bureaucrat", id: str, pages: List[Document], script: Script, timeout: float | None = 180
+        self, *, bot: "Bureaucrat", id: str, docs: List[Document], script: Script, timeout: float | None = 180
     ):
         super().__init__(timeout=timeout)
         self.bot = bot
         self.id = id
-        self.workspace = None
-        self.pages = pages
+        self.docs = docs
+        self.pages = [doc for doc in docs if doc.doctype == ".png"]
         self.script = script
         self.page = 1
-        self.max_page = len(pages)
+        self.max_page = len(self.pages)
 
     @ui.button(label="Download .zip", style=ButtonStyle.green)
     async def send_zip(self, interaction: Interaction, button: ui.Button):
-        # Load all documents associated with the script.
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        # Serve the bundle uploaded at render time; scripts from before bundles existed have theirs streamed out of S3.
+        limit = interaction.guild.filesize_limit
+        bundle = next((doc for doc in self.docs if doc.doctype == ".zip"), None)
         try:
-            script = await Script.objects.select_related(Script.documents).get(id=self.id)
-            docs = script.documents
-        except ormar.NoMatch as e:
-            await interaction.response.send_message(
-                embed=embeds.make_error(self.bot, message=f"Could not find the script with id {self.id}."),
-                ephemeral=True,
-            )
-            self.stop()
+            if bundle:
+                content = await ScriptBundle.download(bot=self.bot, id=self.id, doc=bundle, limit=limit)
+            else:
+                content = await ScriptBundle.build(bot=self.bot, id=self.id, docs=self.docs, limit=limit)
+        except BundleTooLarge as e:
+            allowed = humanize.naturalsize(limit)
+            actual = humanize.naturalsize(e.size)
+            if bundle:
+                url = await self.bot.aws.s3_presign(key=self.bot.aws.s3_key(bundle.url))
+                await interaction.followup.send(
+                    content=f"The render is too big to attach (allowed: {allowed}, actual: {actual}), but you can [download it here]({url}) within the hour.",
+                    ephemeral=True,
+                )
+            else:
+                await interaction.followup.send(
+                    embed=embeds.make_error(self.bot, message=f"The render is too big to send (allowed: {allowed}, actual: at least {actual})"),
+                    ephemeral=True,
+                )
             return
 
-        await interaction.response.defer(ephemeral=True, thinking=True)
-
-        # Multithreaded downloads from S3.
-        self._workspace = TemporaryDirectory()
-        self.workspace = self._workspace.name
-        os.mkdir(Path(self.workspace, "pdf"))
-        os.mkdir(Path(self.workspace, "pages"))
-        self.populate_workspace(docs)
-
-        # Add each file into the zipfile, preserving structure.
-        files = set(Path(self.workspace).rglob("*"))
-        zip_path = Path(self.workspace, "render.zip")
-        with ZipFile(zip_path, "w") as zipfile:
-            for file in files:
-                zipfile.write(file, arcname=file.relative_to(self.workspace))
-
-        file = File(zip_path, filename="render.zip")
-        if os.stat(zip_path).st_size >= interaction.guild.filesize_limit:
-            allowed = humanize.naturalsize(interaction.guild.filesize_limit)
-            actual = humanize.naturalsize(os.stat(zip_path).st_size)
-            await interaction.followup.send(
-                embed=embeds.make_error(self.bot, message=f"The render is too big to send (allowed: {allowed}, actual: {actual})"),
-                ephemeral=True,
-            )
-        else:   
-            await interaction.followup.send(
-                content="Here's your render!",
-                ephemeral=True,
-                file=file,
-            )
+        await interaction.followup.send(
+            content="Here's your render!",
+            ephemeral=True,
+            file=File(BytesIO(content), filename="render.zip"),
+        )
 
     def enable(self, button):
         button.disabled = False
@@ -105,46 +94,24 @@ class ScriptDetailsView(ui.View):
         await interaction.response.defer()
         await interaction.edit_original_response(embed=embed, view=self)
 
-    @classmethod
-    def get_stem(cls, doc):
-        url = doc.url
-        path = urlparse(url).path
-        basename = os.path.basename(path)
-        stem = os.path.splitext(basename)[0]
-        return stem
-
-    @classmethod
-    def order_by_resource(cls, doc: Document):
-        stem = cls.get_stem(doc)
-        for option in ("script", "nights-simple", "nights-full"):
-            if option in stem:
-                return option
-        return ""
-
-    @classmethod
-    def order_by_number(cls, doc: Document):
-        stem = cls.get_stem(doc)
-        parts = str(stem).split("-")
-        return int(parts[-1])
-
     @classmethod
     async def create(cls, *, interaction: Interaction, bot: "Bureaucrat", id: str, followup: bool = False):
         try:
-            script = await Script.objects.get(id=id)
+            script = (
+                await Script.objects.select_related(Script.documents)
+                .order_by(["-documents__resource", "documents__page_number"])
+                .get(id=id)
+            )
         except ormar.NoMatch:
             if followup:
                 return await bot.followup_ethereal(interaction, title="Script", description=f"Could not find the script with id `{id}`.")
             else:
                 return await bot.send_ethereal(interaction, title="Script", description=f"Could not find the script with id `{id}`.")
 
-        pages = await Document.objects.filter(script=script, doctype=".png").order_by("-url").all()
-        pages = sorted(
-            sorted(pages, key=ScriptDetailsView.order_by_number), key=ScriptDetailsView.order_by_resource, reverse=True
-        )
-        view = ScriptDetailsView(bot=bot, id=id, script=script, pages=pages)
+        view = ScriptDetailsView(bot=bot, id=id, script=script, docs=script.documents)
         embed = await view.make_page(1)
 
-        if len(pages) > 1:
+        if view.max_page > 1:
             view.enable(view.next)
 
         if followup:
@@ -153,28 +120,7 @@ class ScriptDetailsView(ui.View):
             await interaction.response.send_message(embed=embed, ephemeral=True, view=view)
 
     async def make_page(self, page):
-        author = await self.bot.fetch_user(self.script.author)
-        brief = f"by {author.mention}\ncreated on <t:{int(self.script.created.timestamp())}:f>\nid: `{self.script.id}`"
+        brief = f"by <@{self.script.author}>\ncreated on <t:{int(self.script.created.timestamp())}:f>\nid: `{self.script.id}`"
         return embeds.make_embed(
             self.bot, title=self.script.name, description=brief, image=self.pages[page - 1].url, thumb=self.script.logo
         )
-
-    def populate_workspace(self, docs):
-        threads: list[Thread] = []
-
-        for document in docs:
-            document: Document = document
-            url = document.url
-            basename = os.path.basename(urlparse(url).path)
-            if document.doctype in [".pdf", ".png"]:
-                intermediate = "pdf" if document.doctype == ".pdf" else "pages"
-                filepath = Path(self.workspace, intermediate, basename)
-            else:
-                filepath = Path(self.workspace, basename)
-            self.bot.logger.debug(f"Fetching {url} into {filepath}.")
-            t = Thread(target=urlretrieve, args=(url, filepath))
-            t.start()
-            threads.append(t)
-
-        for t in threads:
-            t.join()
@@ -1,18 +1,33 @@
+import time
+
 from bureaucrat.models.configure import ormar
 from bureaucrat.models.scripts import Script, Document
 from bureaucrat.utility import embeds
+from collections import OrderedDict
+from datetime import datetime
 from discord import ButtonStyle, Interaction, TextStyle, ui
 from math import ceil
-from typing import Optional, TYPE_CHECKING
+from typing import List, Optional, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from bureaucrat import Bureaucrat
 
 
 class ScriptListView(ui.View):
+    """
+    A paginated view over script search results.
+    Pages are fetched by keyset on (created, id) rather than by offset, so later pages cost the same as the first;
+    the cursor that ends each page is remembered so that the view can step backwards too.
+    """
 
     PAGE_SIZE = 10
 
+    # Result counts only decide how many pages to advertise, so they are cached briefly per query, for a bounded number
+    # of queries.
+    COUNTS: OrderedDict[frozenset, Tuple[float, int]] = OrderedDict()
+    COUNT_TTL = 60
+    COUNT_SIZE = 256
+
     def __init__(self, *, bot: "Bureaucrat", query: dict, max_page: int, page_size: int, timeout: float | None = 180):
         super().__init__(timeout=timeout)
         self.bot = bot
@@ -20,6 +35,7 @@ class ScriptListView(ui.View):
         self.page = 1
         self.max = max_page
         self.page_size = page_size
+        self.cursors: List[Tuple[datetime, str]] = []
 
     @ui.button(label="<", disabled=True, style=ButtonStyle.grey)
     async def backwards(self, interaction: Interaction, button: ui.Button):
@@ -38,13 +54,27 @@ class ScriptListView(ui.View):
         await self.update(interaction)
 
     async def update(self, interaction: Interaction):
-        result = await ScriptListView.paginate(self.query, self.page, self.page_size)
+        after = self.cursors[self.page - 2] if self.page > 1 else None
+        result = await ScriptListView.paginate(self.query, after, self.page_size)
+        self.remember(result)
         page = await ScriptListView.make_page(bot=self.bot, result=result)
         embed = ScriptListView.make_embed(bot=self.bot, num=self.page, max=self.max, page=page)
 
         await interaction.response.defer()
         await interaction.edit_original_response(embed=embed, view=self)
 
+    def remember(self, result: List[Script]):
+        """
+        Records the cursor that ends the current page, which is where the next page starts.
+        """
+        if not result:
+            return
+        cursor = (result[-1].created, result[-1].id)
+        if len(self.cursors) >= self.page:
+            self.cursors[self.page - 1] = cursor
+        else:
+            self.cursors.append(cursor)
+
     def enable(self, button):
         button.disabled = False
         button.style = ButtonStyle.blurple
@@ -68,30 +98,31 @@ class ScriptListView(ui.View):
             page_size = ScriptListView.PAGE_SIZE
 
         query = {k: v for k, v in {"author": author, "name__icontains": name}.items() if v}
-        count = await Script.objects.filter(**query).count()
+        count = await ScriptListView.count(query)
         max_page = int(ceil(float(count) / float(page_size)))
 
-        try:
-            page_1_result = await ScriptListView.paginate(query, 1, page_size)
-            page = await ScriptListView.make_page(bot=bot, result=page_1_result)
-            embed = ScriptListView.make_embed(bot=bot, num=1, max=max_page, page=page)
-
-            view = ScriptListView(bot=bot, query=query, max_page=max_page, page_size=page_size)
-            if view.max > 1:
-                view.enable(view.forwards)
-
-            if followup:
-                await interaction.followup.send(embed=embed, ephemeral=True, view=view)
-            else:
-                await interaction.response.send_message(embed=embed, ephemeral=True, view=view)
-
-        except ormar.NoMatch:
-            embed = ScriptListView.make_embed(bot=bot, num=1, page="There were no results.")
+        page_1_result = await ScriptListView.paginate(query, None, page_size) if count else []
+        if not page_1_result:
+            embed = ScriptListView.make_embed(bot=bot, num=1, max=1, page="There were no results.")
 
             if followup:
                 await interaction.followup.send(embed=embed, ephemeral=True)
             else:
                 await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        page = await ScriptListView.make_page(bot=bot, result=page_1_result)
+        embed = ScriptListView.make_embed(bot=bot, num=1, max=max_page, page=page)
+
+        view = ScriptListView(bot=bot, query=query, max_page=max_page, page_size=page_size)
+        view.remember(page_1_result)
+        if view.max > 1:
+            view.enable(view.forwards)
+
+        if followup:
+            await interaction.followup.send(embed=embed, ephemeral=True, view=view)
+        else:
+            await interaction.response.send_message(embed=embed, ephemeral=True, view=view)
 
     @classmethod
     def make_embed(cls, *, bot, num, max, page):
@@ -102,13 +133,49 @@ class ScriptListView(ui.View):
         rows = []
         for row in result:
             row: Script = row
-            user = await bot.fetch_user(row.author)
             rows.append(
-                f"**{row.name}**\n  id `{row.id}`\n  created by {user.mention} on <t:{int(row.created.timestamp())}:f>\n"
+                f"**{row.name}**\n  id `{row.id}`\n  created by <@{row.author}> on <t:{int(row.created.timestamp())}:f>\n"
             )
         return "\n".join(rows)
 
     @classmethod
-    async def paginate(cls, query, page, page_size):
-        rows = await Script.objects.filter(**query).order_by("-created").paginate(page, page_size=page_size).all()
+    async def count(cls, query: dict) -> int:
+        """
+        Counts the results of a search, reusing a recent count of the same search if there is one.
+        """
+        key = frozenset(query.items())
+        cached = cls.COUNTS.get(key)
+        if cached is not None and time.monotonic() - cached[0] < cls.COUNT_TTL:
+            return cached[1]
+
+        count = await Script.objects.filter(**query).count()
+        now = time.monotonic()
+        cls.COUNTS[key] = (now, count)
+        cls.COUNTS.move_to_end(key)
+
+        # Counts are kept in the order they were taken, so expired ones (and the oldest, past the cap) are at the front.
+        while cls.COUNTS:
+            oldest, (taken, _) = next(iter(cls.COUNTS.items()))
+            if now - taken < cls.COUNT_TTL and len(cls.COUNTS) <= cls.COUNT_SIZE:
+                break
+            del cls.COUNTS[oldest]
+        return count
+
+    @classmethod
+    def invalidate(cls):
+        """
+        Forgets all cached counts; called whenever a script is created or deleted.
+        """
+        cls.COUNTS.clear()
+
+    @classmethod
+    async def paginate(cls, query: dict, after: Optional[Tuple[datetime, str]], page_size: int) -> List[Script]:
+        """
+        Fetches the page of results that follows the given cursor, or the first page if there is no cursor.
+        """
+        queryset = Script.objects.filter(**query)
+        if after is not None:
+            created, id = after
+            queryset = queryset.filter(ormar.or_(ormar.and_(created=created, id__lt=id), created__lt=created))
+        rows = await queryset.order_by(["-created", "-id"]).limit(page_size).all()
         return rows
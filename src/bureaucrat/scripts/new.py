@@ -11,14 +11,16 @@ from discord import Attachment, ButtonStyle, Interaction, TextStyle, ui
 from functools import partial
 from io import BytesIO
 from pathlib import Path
-from scriptmaker import Datastore, Renderer, PDFTools
 from sqids import Sqids
 from tempfile import NamedTemporaryFile, TemporaryDirectory
 from typing import TYPE_CHECKING
 from urllib.parse import urlparse
 from urllib.request import urlretrieve
+from zipfile import ZipFile
 
+from .bundle import ScriptBundle
 from .details import ScriptDetailsView
+from .listing import ScriptListView
 
 if TYPE_CHECKING:
     from bureaucrat import Bureaucrat
@@ -44,14 +46,31 @@ class NewScript:
     def cleanup(self):
         shutil.rmtree(self.workspace)
 
+    def make_bundle(self):
+        """
+        Zips every rendered document into render.zip, which is uploaded alongside them so downloads never rebuild it.
+        """
+        bundle = Path(self.workspace, "render.zip")
+        with ZipFile(bundle, "w") as zipfile:
+            for path in self.paths:
+                if path.is_dir():
+                    continue
+                zipfile.write(path, arcname=ScriptBundle.arcname(path.name, path.suffix))
+        self.paths.add(bundle)
+
     @classmethod
     def make_script_uuid(cls, interaction: Interaction, timestamp):
         user_id = interaction.user.id
         discrim = timestamp.timestamp()
         return Sqids(min_length=8).encode([int(user_id), int(discrim)])
 
-    @CONFIG.database.transaction()
     async def persist(self):
+        await self._persist()
+        # Only once the script is committed, so that a rolled-back one doesn't throw away good counts.
+        ScriptListView.invalidate()
+
+    @CONFIG.database.transaction()
+    async def _persist(self):
         script = await Script.objects.create(
             id=self.id, author=self.author, created=self.created, logo=self.logo, name=self.name
         )
@@ -65,7 +84,10 @@ class NewScript:
 
             url = await self.bot.aws.s3_create(bucket="scripts", key=s3_key, file=path)
             doctype = os.path.splitext(urlparse(url).path)[1]
-            await Document.objects.create(doctype=doctype, script=script, url=url)
+            resource, page_number = Document.locate(url)
+            await Document.objects.create(
+                doctype=doctype, script=script, url=url, resource=resource, page_number=page_number
+            )
 
 
 class NewScriptModal(ui.Modal, title="Create a script!"):
@@ -302,6 +324,8 @@ class NewScriptView(ui.View):
         self.bot.logger.error(error)
 
     async def create_script(self, *, interaction: Interaction):
+        from scriptmaker import Datastore
+
         workspace = TemporaryDirectory().name
         datastore = Datastore(workspace)
         datastore.add_official_characters()
@@ -319,6 +343,7 @@ class NewScriptView(ui.View):
 
         await asyncio.get_event_loop().run_in_executor(None, partial(self.render_docs, script=script))
         self.populate_paths(workspace=workspace, scriptinfo=scriptinfo)
+        await asyncio.get_event_loop().run_in_executor(None, scriptinfo.make_bundle)
         return scriptinfo
 
     def populate_paths(self, *, workspace, scriptinfo):
@@ -333,6 +358,8 @@ class NewScriptView(ui.View):
         scriptinfo.paths = set(Path(workspace).rglob("*"))
 
     def render_docs(self, *, script) -> set[Path]:
+        from scriptmaker import PDFTools, Renderer
+
         paths = set()
         renderer = Renderer()
         paths.add(renderer.render_script(script))
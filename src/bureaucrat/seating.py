@@ -1,5 +1,6 @@
 from bureaucrat.models import CONFIG
-from bureaucrat.models.games import ActiveGame, Game, Participant, RoleType, ManagedThread, ThreadMember, ThreadType
+from bureaucrat.models.events import EventLog
+from bureaucrat.models.games import Game, Participant, RoleType, ManagedThread, ThreadMember, ThreadType
 from bureaucrat.models.state import Marker, State, Seat, Status, Type
 from bureaucrat.utility import checks, embeds
 from datetime import datetime, timedelta
@@ -28,11 +29,9 @@ class Seating(commands.GroupCog, group_name="seating"):
         """
         Returns a list of players in the game.
         """
-        channel_id = self.bot.get_channel_id(interaction.channel)
-        in_channel = await ActiveGame.objects.select_related(ActiveGame.game).get_or_none(id=channel_id)
-        if in_channel is None:
+        game = await self.bot.get_active_game(interaction.channel)
+        if game is None:
             return []
-        game = in_channel.game
         state = State.load(game.state)
         return [apc.Choice(name=seat.alias, value=seat.id) for seat in state.seating.seats if current.lower() in seat.alias.lower()]
 
@@ -93,8 +92,7 @@ class Seating(commands.GroupCog, group_name="seating"):
                 as_member = interaction.guild.get_member(player.member) or await interaction.guild.fetch_member(player.member)
                 state.seating.add_player(user=as_member, kind=Type.Player, role=None, apparent=None)
             
-            game.state = state.dump()
-            await game.update()
+            await EventLog.snapshot(game, "seating", state)
         
         await self._show(interaction, game, followup=True)
 
@@ -127,8 +125,7 @@ class Seating(commands.GroupCog, group_name="seating"):
             p = await Participant.objects.get_or_create({"role": RoleType.PLAYER}, game=game, member=user.id)
             await p[0].update(role=RoleType.PLAYER)
 
-            game.state = state.dump()
-            await game.update()
+            await EventLog.snapshot(game, "seating", state)
 
             await self.bot.get_cog("Threads").create_st_thread(game, user)
         
@@ -160,8 +157,7 @@ class Seating(commands.GroupCog, group_name="seating"):
             user = await interaction.guild.fetch_member(seat.member)
             await self.bot.get_cog('Games')._roles.set_role(game, user, RoleType.NONE)
 
-            game.state = state.dump()
-            await game.update()
+            await EventLog.snapshot(game, "seating", state)
         
         await self._show(interaction, game, followup=True)
 
@@ -198,8 +194,7 @@ class Seating(commands.GroupCog, group_name="seating"):
             await games._roles.set_role(game, as_member, RoleType.NONE)
             await games._roles.set_role(game, substitute, RoleType.PLAYER)
 
-            game.state = state.dump()
-            await game.update()
+            await EventLog.snapshot(game, "seating", state)
 
             threads = await ThreadMember.objects.select_related(ThreadMember.thread).filter(game=game, member=prev_id).all()
             
@@ -236,8 +231,7 @@ class Seating(commands.GroupCog, group_name="seating"):
 
             state.seating.swap_seats(lhs=first, rhs=other)
 
-            game.state = state.dump()
-            await game.update()
+            await EventLog.append(game, state, "seat.swap", lhs=first, rhs=other)
         
         await self._show(interaction, game, followup=True)
 
@@ -273,8 +267,7 @@ class Seating(commands.GroupCog, group_name="seating"):
             state.seating.set_status(id=player, status=status)
             state.seating.set_type(id=player, type=type)
 
-            game.state = state.dump()
-            await game.update()
+            await EventLog.append(game, state, "seat.edit", id=player, status=status, true=true_role, apparent=apparent_role, type=type, alias=alias)
         
         await self._show(interaction, game, followup=True)
 
@@ -304,8 +297,7 @@ class Seating(commands.GroupCog, group_name="seating"):
 
             state.seating.move_seats(lhs=player, mode = Marker.Beginning)
 
-            game.state = state.dump()
-            await game.update()
+            await EventLog.append(game, state, "seat.move", lhs=player, mode=Marker.Beginning)
         
         await self._show(interaction, game, followup=True)
     
@@ -334,8 +326,7 @@ class Seating(commands.GroupCog, group_name="seating"):
 
             state.seating.move_seats(lhs=player, rhs=before, mode=Marker.Before)
 
-            game.state = state.dump()
-            await game.update()
+            await EventLog.append(game, state, "seat.move", lhs=player, rhs=before, mode=Marker.Before)
         
         await self._show(interaction, game, followup=True)
 
@@ -364,8 +355,7 @@ class Seating(commands.GroupCog, group_name="seating"):
 
             state.seating.move_seats(lhs=player, rhs=after, mode=Marker.After)
 
-            game.state = state.dump()
-            await game.update()
+            await EventLog.append(game, state, "seat.move", lhs=player, rhs=after, mode=Marker.After)
         
         await self._show(interaction, game, followup=True)
 
@@ -393,8 +383,7 @@ class Seating(commands.GroupCog, group_name="seating"):
 
             state.seating.move_seats(lhs=player, mode = Marker.End)
 
-            game.state = state.dump()
-            await game.update()
+            await EventLog.append(game, state, "seat.move", lhs=player, mode=Marker.End)
         
         await self._show(interaction, game, followup=True)
 
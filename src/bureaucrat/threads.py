@@ -102,7 +102,7 @@ class Threads(commands.GroupCog, group_name="threads"):
 
         async with CONFIG.database.transaction():
             players = await Participant.objects.filter(game=game, role=RoleType.PLAYER).all()
-            player_members = [interaction.guild.get_member(player.member) or await interaction.guild.fetch_member(player.member) for player in players]
+            player_members = (await self.bot.directory.members(interaction.guild, (player.member for player in players))).values()
 
             for data in Threads.LAYOUT_REVERSED:
                 await self.create_managed_thread(game, data['name'], data['type'])
@@ -1,8 +1,9 @@
+import asyncio
 import os
 
-from aioboto3 import Session
 from pathlib import Path
 from typing import TYPE_CHECKING
+from urllib.parse import urlparse
 
 if TYPE_CHECKING:
     from bureaucrat import Bureaucrat
@@ -13,17 +14,54 @@ class AWSClient:
     def __init__(self, bot: "Bureaucrat") -> None:
         self.bot = bot
         self.bucket = os.getenv("AWS_BUCKET")
+        self._session = None
+
+        # A single S3 client is kept open for reads, so that its connection pool is reused across requests.
+        self._s3 = None
+        self._s3_context = None
+        self._s3_lock = asyncio.Lock()
+
+    @property
+    def session(self):
+        """
+        The boto session, created on first use; importing aioboto3 pulls in all of botocore, so it is left out of startup.
+        """
+        if self._session is None:
+            from aioboto3 import Session
+
+            self._session = Session()
+        return self._session
+
+    async def s3_client(self):
+        """
+        Returns the pooled S3 client, opening it on first use.
+        """
+        async with self._s3_lock:
+            if self._s3 is None:
+                self._s3_context = self.session.client("s3")
+                self._s3 = await self._s3_context.__aenter__()
+        return self._s3
+
+    async def close(self):
+        """
+        Closes the pooled S3 client, if it was ever opened.
+        """
+        async with self._s3_lock:
+            if self._s3_context is not None:
+                await self._s3_context.__aexit__(None, None, None)
+            self._s3 = None
+            self._s3_context = None
 
     async def s3_delete(self, *, bucket, prefix):
         if prefix == "" or bucket == "":
             return
 
-        async with Session().resource("s3") as s3:
+        async with self.session.resource("s3") as s3:
             bucket = await s3.Bucket(self.bucket)
             await bucket.objects.filter(Prefix=f"{bucket}/{prefix}/").delete()
 
     async def s3_create(self, *, bucket, key, file: Path):
-        async with Session().client("s3") as s3:
+        async with self.session.client("s3") as s3:
             try:
                 with file.open("rb") as file:
                     s3_key = "/".join([bucket, key])
@@ -33,5 +71,37 @@ class AWSClient:
 
         return f"https://{self.bucket}.s3.amazonaws.com/{bucket}/{key}"
 
+    async def s3_read(self, *, key: str) -> bytes:
+        """
+        Reads an entire object through the pooled client.
+        """
+        s3 = await self.s3_client()
+        response = await s3.get_object(Bucket=self.bucket, Key=key)
+        async with response["Body"] as stream:
+            return await stream.read()
+
+    async def s3_size(self, *, key: str) -> int:
+        """
+        Gets the size of an object in bytes, without downloading it.
+        """
+        s3 = await self.s3_client()
+        response = await s3.head_object(Bucket=self.bucket, Key=key)
+        return response["ContentLength"]
+
+    async def s3_presign(self, *, key: str, expires: int = 3600) -> str:
+        """
+        Creates a temporary download link for an object.
+        """
+        s3 = await self.s3_client()
+        return await s3.generate_presigned_url(
+            "get_object", Params={"Bucket": self.bucket, "Key": key}, ExpiresIn=expires
+        )
+
+    def s3_key(self, url: str):
+        """
+        Recovers the object key from a url produced by s3_create.
+        """
+        return urlparse(url).path.lstrip("/")
+
     def s3_url(self, *, bucket, key, stem):
         return f"https://{self.bucket}.s3.amazonaws.com/{bucket}/{key}/{stem}"
@@ -0,0 +1,141 @@
+import asyncio
+import itertools
+import time
+
+from bureaucrat.models.games import ActiveGame, Participant, Signup
+from collections import OrderedDict
+from discord import Guild, Member, User
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Hashable, Iterable, Tuple
+
+if TYPE_CHECKING:
+    from bureaucrat import Bureaucrat
+
+
+class Directory:
+    """
+    A short-lived cache of users and members, so that views which need display names don't pay for a REST call per row.
+    Lookups for the same id are shared while in flight, and bulk lookups resolve concurrently.
+    Prefer a plain <@id> mention over this wherever a mention is all that's needed.
+    """
+
+    TTL = 600
+    SIZE = 4096
+
+    def __init__(self, bot: "Bureaucrat", ttl: float = TTL, size: int = SIZE) -> None:
+        self.bot = bot
+        self.ttl = ttl
+        self.size = size
+        self._entries: OrderedDict[Hashable, Tuple[float, User | Member]] = OrderedDict()
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def _resolve(self, key: Hashable, fetch: Callable[[], Awaitable[User | Member]]):
+        """
+        Returns a fresh cached entry, or fetches it exactly once no matter how many callers are waiting on it.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+
+        if key in self._pending:
+            pending = self._pending[key]
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # The caller doing the fetch was cancelled, rather than this one, so fetch it again.
+                if not pending.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                return await self._resolve(key, fetch)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            value = await fetch()
+        except Exception as e:
+            # Mark the exception as retrieved, since there may be no other waiters to see it.
+            future.set_exception(e)
+            future.exception()
+            raise
+        else:
+            self._store(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            # If the fetch was cancelled, nothing else resolves the future, and its waiters would hang.
+            if not future.done():
+                future.cancel()
+            del self._pending[key]
+
+    def _store(self, key: Hashable, value: User | Member):
+        """
+        Caches an entry, then drops expired entries and, past the size cap, the oldest ones. Entries are kept in the order
+        they were stored, so both are always at the front.
+        """
+        now = time.monotonic()
+        self._entries[key] = (now, value)
+        self._entries.move_to_end(key)
+        while self._entries:
+            oldest, (stored, _) = next(iter(self._entries.items()))
+            if now - stored < self.ttl and len(self._entries) <= self.size:
+                break
+            del self._entries[oldest]
+
+    def evict(self, id: int):
+        """
+        Forgets everything cached about a user, in every guild.
+        """
+        for key in [k for k in self._entries if k == id or (isinstance(k, tuple) and k[1] == id)]:
+            del self._entries[key]
+
+    async def user(self, id: int) -> User:
+        """
+        Resolves a single user.
+        """
+        return await self._resolve(id, lambda: self._fetch_user(id))
+
+    async def users(self, ids: Iterable[int]) -> Dict[int, User]:
+        """
+        Resolves many users at once.
+        """
+        ids = list(dict.fromkeys(ids))
+        resolved = await asyncio.gather(*(self.user(id) for id in ids))
+        return dict(zip(ids, resolved))
+
+    async def member(self, guild: Guild, id: int) -> Member:
+        """
+        Resolves a single member of a guild.
+        """
+        return await self._resolve((guild.id, id), lambda: self._fetch_member(guild, id))
+
+    async def members(self, guild: Guild, ids: Iterable[int]) -> Dict[int, Member]:
+        """
+        Resolves many members of a guild at once.
+        """
+        ids = list(dict.fromkeys(ids))
+        resolved = await asyncio.gather(*(self.member(guild, id) for id in ids))
+        return dict(zip(ids, resolved))
+
+    async def chunk_participants(self, guild: Guild):
+        """
+        Loads the members who play in, run or signed up for an active game in this guild into the guild's member cache,
+        for when the bot isn't chunking whole guilds.
+        """
+        games = [active.game.id for active in await ActiveGame.objects.filter(game__guild=guild.id).all()]
+        if not games:
+            return
+
+        participants = await Participant.objects.filter(game__id__in=games).all()
+        signups = await Signup.objects.filter(game__id__in=games).all()
+        ids = list(dict.fromkeys(row.member for row in itertools.chain(participants, signups)))
+
+        # The gateway resolves at most 100 members per request.
+        for i in range(0, len(ids), 100):
+            await guild.query_members(user_ids=ids[i : i + 100], cache=True)
+
+    async def _fetch_user(self, id: int) -> User:
+        return self.bot.get_user(id) or await self.bot.fetch_user(id)
+
+    async def _fetch_member(self, guild: Guild, id: int) -> Member:
+        return guild.get_member(id) or await guild.fetch_member(id)
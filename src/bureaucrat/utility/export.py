@@ -0,0 +1,194 @@
+import asyncio
+import contextvars
+import csv
+import json
+
+from bureaucrat.models.events import EventLog
+from bureaucrat.models.feedback import Feedback
+from bureaucrat.models.games import Game, GameDay, Participant
+from bureaucrat.models.state import State
+from bureaucrat.models.state.nominations import Nomination, NominationType
+from typing import AsyncIterator, Iterator, Optional, TextIO
+
+FORMATS = ("ndjson", "csv")
+
+# Games read ahead of the writer; the cursor waits while this many are buffered.
+PREFETCH = 16
+
+# One row per vote, with its nomination and game repeated on each.
+COLUMNS = (
+    "game", "guild", "created", "day", "nominator", "nominee", "kind", "required", "tally", "marked", "outcome",
+    "voter", "member", "alias", "locked",
+)
+
+
+async def stream_games(*, guild: Optional[int] = None) -> AsyncIterator[Game]:
+    """
+    Reads every game, oldest first, through a server-side cursor.
+    A connection can't run anything else while it holds a cursor open, so the cursor runs in a task with a fresh
+    context (and so on its own connection), leaving the caller's connection free to look up each game's other rows.
+    Games are handed over through a bounded queue, so the cursor never runs more than a few games ahead of the caller.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=PREFETCH)
+
+    async def produce():
+        try:
+            games = Game.objects.filter(guild=guild) if guild is not None else Game.objects
+            async for game in games.order_by("created").iterate():
+                await queue.put(game)
+            await queue.put(None)
+        except Exception as e:
+            await queue.put(e)
+
+    producer = asyncio.create_task(produce(), name="bureaucrat-export", context=contextvars.Context())
+    try:
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        producer.cancel()
+
+
+def outcome(nomination: Nomination, *, block: Optional[Nomination], tied: bool, most: int) -> str:
+    """
+    How a nomination ended, in the terms of the day's summary (see Nominations.on_the_block).
+    """
+    if nomination.kind == NominationType.Exile:
+        return "exiled" if nomination.is_passing() else "failed"
+    if not nomination.is_passing():
+        return "failed"
+    if nomination.tally == most:
+        return "tied" if tied else "on_the_block"
+    return "outvoted"
+
+
+async def build_record(game: Game) -> dict:
+    """
+    Collects a game's seating, participants, feedback scores, and every day's nominations and votes (including the days
+    archived out of its state) into one plain record. Written votes and feedback comments are left out; only locked
+    results and scores are exported.
+    """
+    game = await EventLog.materialize(game)
+    state = State.load(game.state)
+
+    archived = await GameDay.objects.filter(game__id=game.id).order_by("day").all()
+    for day in archived:
+        if day.day not in state.nominations.days:
+            state.nominations.days[day.day] = [Nomination(**data) for data in day.state["nominations"]]
+
+    participants = await Participant.objects.filter(game__id=game.id).all()
+    feedback = await Feedback.objects.filter(game__id=game.id).all()
+
+    seats = {seat.id: seat for seat in state.seating.seats}
+
+    days = []
+    for day in sorted(state.nominations.days):
+        block, tied, most = state.nominations.on_the_block(day)
+        nominations = []
+        for nomination in state.nominations.days[day]:
+            votes = []
+            for vote in nomination.voters:
+                seat = seats.get(vote.id)
+                votes.append({
+                    "voter": vote.id,
+                    "member": seat.member if seat else None,
+                    "alias": seat.alias if seat else None,
+                    "locked": vote.locked.name.lower() if vote.locked is not None else None,
+                })
+            nominations.append({
+                "nominator": nomination.nominator,
+                "nominee": nomination.nominee,
+                "kind": nomination.kind.name.lower(),
+                "required": nomination.required,
+                "tally": nomination.tally,
+                "marked": nomination.marked,
+                "outcome": outcome(nomination, block=block, tied=tied, most=most),
+                "votes": votes,
+            })
+        days.append({
+            "day": day,
+            "block": block.nominee if block is not None and not tied else None,
+            "nominations": nominations,
+        })
+
+    return {
+        "game": game.id,
+        "guild": game.guild,
+        "channel": game.channel,
+        "owner": game.owner,
+        "created": game.created.isoformat() if game.created else None,
+        "script": state.script[0].get("name") if state.script else None,
+        "day": state.moment.day,
+        "phase": state.moment.phase.name.lower(),
+        "seating": [
+            {
+                "seat": seat.id,
+                "member": seat.member,
+                "alias": seat.alias,
+                "kind": seat.kind.name.lower(),
+                "true": seat.roles.true,
+                "apparent": seat.roles.apparent,
+                "status": seat.status.name.lower(),
+                "removed": seat.removed,
+            }
+            for seat in state.seating.seats
+        ],
+        "participants": [{"member": p.member, "role": p.role.name.lower()} for p in participants],
+        "feedback": [
+            {
+                "storyteller": f.storyteller,
+                "submitter": None if f.anonymous else f.submitter,
+                "enjoyability": f.enjoyability,
+                "organization": f.organization,
+                "pacing": f.pacing,
+                "attentiveness": f.attentiveness,
+            }
+            for f in feedback
+        ],
+        "days": days,
+    }
+
+
+def vote_rows(record: dict) -> Iterator[dict]:
+    """
+    Flattens a game's record into one row per vote.
+    """
+    for day in record["days"]:
+        for nomination in day["nominations"]:
+            for vote in nomination["votes"]:
+                yield {
+                    "game": record["game"],
+                    "guild": record["guild"],
+                    "created": record["created"],
+                    "day": day["day"],
+                    **{k: v for k, v in nomination.items() if k != "votes"},
+                    **vote,
+                }
+
+
+async def export(out: TextIO, *, format: str, guild: Optional[int] = None) -> int:
+    """
+    Writes every game to a file as it is read, either as one JSON record per line or as CSV rows of votes.
+    Returns the number of games written.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unknown export format {format}; expected one of {', '.join(FORMATS)}.")
+
+    writer = None
+    if format == "csv":
+        writer = csv.DictWriter(out, fieldnames=COLUMNS)
+        writer.writeheader()
+
+    count = 0
+    async for game in stream_games(guild=guild):
+        record = await build_record(game)
+        if writer is not None:
+            writer.writerows(vote_rows(record))
+        else:
+            out.write(json.dumps(record) + "\n")
+        count += 1
+    return count
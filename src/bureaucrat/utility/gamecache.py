@@ -0,0 +1,165 @@
+import json
+
+from bureaucrat.models.events import EventLog
+from bureaucrat.models.games import ActiveGame, Game
+from collections import Counter, OrderedDict, defaultdict
+from discord import Thread
+from discord.abc import GuildChannel
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from bureaucrat import Bureaucrat
+    from bureaucrat.models.notifications import Notifications
+
+
+# A cached game: its scalar columns, plus its config and state as JSON. None marks a channel without a game.
+Entry = Optional[Tuple[dict, str, str]]
+
+
+class GameCache:
+    """
+    The active game behind each channel, so that commands and autocompletes don't each have to query for it.
+    Entries are partitioned by the shard that owns the channel's guild, and a shard's partition is dropped whenever that
+    shard disconnects or starts a new session, since another process may have served its guilds in the meantime.
+    Updates to a cached game are written through once they commit, and a channel's entry is evicted when its game ends
+    or a command in it fails, so a cached game is never older than this process's last committed write to it. Writes
+    from other processes arrive as change notifications (see subscribe).
+    """
+
+    SIZE = 512
+    COLUMNS = tuple(column.name for column in Game.ormar_config.table.columns if column.name not in ("config", "state"))
+
+    def __init__(self, bot: "Bureaucrat", size: int = SIZE) -> None:
+        self.bot = bot
+        self.size = size
+        self.shards: Dict[int, OrderedDict[int, Entry]] = defaultdict(OrderedDict)
+        self.hits = 0
+        self.misses = 0
+
+        # Misses in flight per channel, and how many times each of those channels was invalidated meanwhile (or all of
+        # them, by epoch); a miss that raced an invalidation doesn't cache what it read, since it may be stale.
+        self.fetching: Counter[int] = Counter()
+        self.generations: Dict[int, int] = {}
+        self.epoch = 0
+
+        Game.ormar_config.signals.post_update.connect(self.on_game_update)
+        Game.ormar_config.signals.post_delete.connect(self.on_game_delete)
+        ActiveGame.ormar_config.signals.post_save.connect(self.on_active_game_save)
+
+    def __len__(self) -> int:
+        return sum(len(partition) for partition in self.shards.values())
+
+    def shard_of(self, guild_id: int) -> int:
+        return self.bot.shard_of(guild_id)
+
+    @classmethod
+    def freeze(cls, game: Game) -> Entry:
+        return {name: getattr(game, name) for name in cls.COLUMNS}, json.dumps(game.config), json.dumps(game.state)
+
+    @classmethod
+    def thaw(cls, entry: Entry) -> Game:
+        # Every caller gets its own instance and its own copy of the state, so nothing leaks between commands.
+        columns, config, state = entry
+        return Game.model_construct(**columns, config=json.loads(config), state=json.loads(state))
+
+    async def get(self, channel: GuildChannel | Thread) -> Optional[Game]:
+        """
+        Gets the active game in a channel (or in a thread's parent channel).
+        """
+        channel_id = self.bot.get_channel_id(channel)
+        partition = self.shards[self.shard_of(channel.guild.id)]
+
+        if channel_id in partition:
+            self.hits += 1
+            partition.move_to_end(channel_id)
+            entry = partition[channel_id]
+            return self.thaw(entry) if entry is not None else None
+
+        self.misses += 1
+        before = (self.epoch, self.generations.get(channel_id, 0))
+        self.fetching[channel_id] += 1
+        try:
+            in_channel = await ActiveGame.objects.select_related(ActiveGame.game).get_or_none(id=channel_id)
+            game = await EventLog.materialize(in_channel.game) if in_channel else None
+        finally:
+            after = (self.epoch, self.generations.get(channel_id, 0))
+            self.fetching[channel_id] -= 1
+            if not self.fetching[channel_id]:
+                del self.fetching[channel_id]
+                self.generations.pop(channel_id, None)
+
+        if before == after:
+            self.store(self.shards[self.shard_of(channel.guild.id)], channel_id, self.freeze(game) if game is not None else None)
+        return game
+
+    def store(self, partition: OrderedDict, channel_id: int, entry: Entry):
+        partition[channel_id] = entry
+        partition.move_to_end(channel_id)
+        while len(partition) > self.size:
+            partition.popitem(last=False)
+
+    def invalidate(self, channel_id: int):
+        """
+        Marks a channel's game as changed, for any miss that is reading it right now.
+        """
+        if channel_id in self.fetching:
+            self.generations[channel_id] = self.generations.get(channel_id, 0) + 1
+
+    def evict(self, channel: GuildChannel | Thread):
+        """
+        Forgets the game in a channel, e.g. after a command in it failed partway through.
+        """
+        channel_id = self.bot.get_channel_id(channel)
+        self.evict_channel(channel.guild.id, channel_id)
+
+    def evict_channel(self, guild_id: int, channel_id: int):
+        self.invalidate(channel_id)
+        self.shards[self.shard_of(guild_id)].pop(channel_id, None)
+
+    def evict_game(self, game: Game):
+        """
+        Forgets a game wherever it is cached, e.g. when it ends.
+        """
+        self.evict_channel(game.guild, game.channel)
+
+    def forget_channel(self, channel_id: int):
+        self.invalidate(channel_id)
+        for partition in self.shards.values():
+            partition.pop(channel_id, None)
+
+    def drop_shard(self, shard_id: int):
+        self.epoch += 1
+        self.shards.pop(shard_id, None)
+
+    def clear(self):
+        self.epoch += 1
+        self.shards.clear()
+
+    async def on_game_update(self, sender, instance: Game, **kwargs):
+        # The update is only written through once it commits, so a rolled-back state (or revision) is never cached.
+        updated = self.freeze(instance)
+        Game.ormar_config.database.after_commit(lambda: self.write_through(updated))
+
+    def write_through(self, updated: Entry):
+        # Only refresh channels that already have this game cached; an ended game must not be brought back.
+        columns = updated[0]
+        self.invalidate(columns["channel"])
+        partition = self.shards[self.shard_of(columns["guild"])]
+        entry = partition.get(columns["channel"])
+        if entry is not None and entry[0]["id"] == columns["id"]:
+            partition[columns["channel"]] = updated
+
+    async def on_game_delete(self, sender, instance: Game, **kwargs):
+        self.evict_game(instance)
+
+    async def on_active_game_save(self, sender, instance: ActiveGame, **kwargs):
+        # A new game may be starting in a channel that was cached as having none.
+        self.forget_channel(instance.id)
+
+    def subscribe(self, notifications: "Notifications"):
+        """
+        Evicts games changed by other processes, and everything if changes may have been missed.
+        """
+        notifications.subscribe("games", lambda op, row: self.evict_channel(row["guild"], row["channel"]))
+        notifications.subscribe("active_games", lambda op, row: self.forget_channel(row["id"]))
+        notifications.on_reset(self.clear)
@@ -0,0 +1,280 @@
+import asyncio
+import functools
+import inspect
+import math
+import time
+
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from discord import app_commands as apc
+from discord.webhook.async_ import AsyncWebhookAdapter
+from typing import TYPE_CHECKING, Callable, Deque, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from bureaucrat import Bureaucrat
+    from bureaucrat.utility.watchdog import Stall
+
+
+PHASES = ("db", "rest", "render", "state")
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Sample:
+    """
+    The timings of a single command invocation, in seconds.
+    Time spent in each phase is attributed to the outermost timer for that phase, so nested timers don't double count.
+    """
+
+    __slots__ = ("command", "total", "phases", "active", "queries")
+
+    def __init__(self, command: str):
+        self.command = command
+        self.total = 0.0
+        self.phases: Dict[str, float] = {name: 0.0 for name in PHASES}
+        self.active = set()
+        self.queries = 0
+
+
+_current: ContextVar[Optional[Sample]] = ContextVar("bureaucrat_sample", default=None)
+
+
+def current() -> Optional[Sample]:
+    """
+    Gets the sample for the command being run in this context, if any.
+    """
+    return _current.get()
+
+
+@contextmanager
+def phase(name: str):
+    """
+    Attributes the time spent inside this block to a phase of the current command.
+    Outside of a command, this does nothing.
+    """
+    sample = _current.get()
+    if sample is None or name in sample.active:
+        yield
+        return
+
+    sample.active.add(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        sample.phases[name] += time.perf_counter() - start
+        sample.active.discard(name)
+
+
+def timed(name: str):
+    """
+    Decorates a function or coroutine function so that its running time is attributed to a phase.
+    """
+
+    def decorator(func: Callable):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                with phase(name):
+                    return await func(*args, **kwargs)
+
+        else:
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with phase(name):
+                    return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def quantile(values: List[float], q: float):
+    """
+    Gets the nearest-rank quantile of a sorted list.
+    """
+    if not values:
+        return 0.0
+    rank = max(0, min(len(values) - 1, math.ceil(q * len(values)) - 1))
+    return values[rank]
+
+
+class Metrics:
+    """
+    Keeps a sliding window of timings for every app command, and reports latency quantiles per phase.
+    Commands are measured by wrapping their callbacks; REST time is measured by wrapping both HTTP clients discord.py uses
+    (the bot's own, and the webhook adapter behind interaction responses and followups).
+    """
+
+    WINDOW = 1024
+
+    def __init__(self, bot: "Bureaucrat", window: int = WINDOW) -> None:
+        self.bot = bot
+        self.samples: Dict[str, Deque[Sample]] = defaultdict(lambda: deque(maxlen=window))
+        self.counts: Dict[str, int] = defaultdict(int)
+        self.sums: Dict[str, Dict[str, float]] = defaultdict(lambda: dict.fromkeys(("total", *PHASES), 0.0))
+        self.lag: Deque[float] = deque(maxlen=window)
+        self.lag_sum = 0.0
+        self.lag_count = 0
+        self.stalls = 0
+        self.last_stall: Optional["Stall"] = None
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    @asynccontextmanager
+    async def measure(self, command: str):
+        """
+        Times everything inside this block as one invocation of the given command.
+        """
+        sample = Sample(command)
+        token = _current.set(sample)
+        start = time.perf_counter()
+        try:
+            yield sample
+        finally:
+            sample.total = time.perf_counter() - start
+            _current.reset(token)
+            self.record(sample)
+
+    def record(self, sample: Sample):
+        self.samples[sample.command].append(sample)
+        self.counts[sample.command] += 1
+        sums = self.sums[sample.command]
+        sums["total"] += sample.total
+        for name in PHASES:
+            sums[name] += sample.phases[name]
+
+    def record_lag(self, lag: float):
+        self.lag.append(lag)
+        self.lag_sum += lag
+        self.lag_count += 1
+
+    def record_stall(self, stall: "Stall"):
+        self.stalls += 1
+        self.last_stall = stall
+
+    def instrument(self):
+        """
+        Wraps every app command registered by a cog, along with the REST clients.
+        """
+        for cog in self.bot.cogs.values():
+            for command in cog.walk_app_commands():
+                if isinstance(command, apc.Command):
+                    self.wrap(command)
+
+        self.bot.http.request = timed("rest")(self.bot.http.request)
+        if not getattr(AsyncWebhookAdapter.request, "__measured__", False):
+            AsyncWebhookAdapter.request = timed("rest")(AsyncWebhookAdapter.request)
+            AsyncWebhookAdapter.request.__measured__ = True
+
+    def wrap(self, command: apc.Command):
+        """
+        Wraps a single app command so that each invocation is measured.
+        """
+        callback = command._callback
+        if getattr(callback, "__measured__", False):
+            return
+
+        name = f"/{command.qualified_name}"
+
+        @functools.wraps(callback)
+        async def wrapper(*args, **kwargs):
+            async with self.measure(name):
+                return await callback(*args, **kwargs)
+
+        wrapper.__measured__ = True
+        command._callback = wrapper
+
+    def summary(self) -> Dict[str, Tuple[int, Dict[str, Tuple[float, ...]]]]:
+        """
+        Gets the invocation count and the latency quantiles of each phase (and the total) for every command.
+        """
+        result = {}
+        for command, samples in sorted(self.samples.items()):
+            window = list(samples)
+            quantiles = {"total": tuple(quantile(sorted(s.total for s in window), q) for q in QUANTILES)}
+            for name in PHASES:
+                values = sorted(s.phases[name] for s in window)
+                quantiles[name] = tuple(quantile(values, q) for q in QUANTILES)
+            result[command] = (self.counts[command], quantiles)
+        return result
+
+    def loop_summary(self) -> Tuple[int, Tuple[float, ...]]:
+        """
+        Gets the number of stalls, and the quantiles of the event loop's lag.
+        """
+        lag = sorted(self.lag)
+        return self.stalls, tuple(quantile(lag, q) for q in QUANTILES)
+
+    def exposition(self) -> str:
+        """
+        Renders the summary in the Prometheus text format.
+        """
+        summary = self.summary()
+        lines = [
+            "# HELP bureaucrat_command_seconds Latency of app commands.",
+            "# TYPE bureaucrat_command_seconds summary",
+        ]
+        for command, (count, quantiles) in summary.items():
+            for q, value in zip(QUANTILES, quantiles["total"]):
+                lines.append(f'bureaucrat_command_seconds{{command="{command}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'bureaucrat_command_seconds_sum{{command="{command}"}} {self.sums[command]["total"]:.6f}')
+            lines.append(f'bureaucrat_command_seconds_count{{command="{command}"}} {count}')
+
+        # Phases get their own family, since a summary's _sum and _count have to carry the same labels as its quantiles.
+        lines += [
+            "# HELP bureaucrat_command_phase_seconds Time app commands spend in each phase.",
+            "# TYPE bureaucrat_command_phase_seconds summary",
+        ]
+        for command, (count, quantiles) in summary.items():
+            for name in PHASES:
+                labels = f'command="{command}",phase="{name}"'
+                for q, value in zip(QUANTILES, quantiles[name]):
+                    lines.append(f'bureaucrat_command_phase_seconds{{{labels},quantile="{q}"}} {value:.6f}')
+                lines.append(f"bureaucrat_command_phase_seconds_sum{{{labels}}} {self.sums[command][name]:.6f}")
+                lines.append(f"bureaucrat_command_phase_seconds_count{{{labels}}} {count}")
+
+        stalls, lag = self.loop_summary()
+        lines += [
+            "# HELP bureaucrat_loop_lag_seconds How late the event loop runs a timer.",
+            "# TYPE bureaucrat_loop_lag_seconds summary",
+            *(f'bureaucrat_loop_lag_seconds{{quantile="{q}"}} {value:.6f}' for q, value in zip(QUANTILES, lag)),
+            f"bureaucrat_loop_lag_seconds_sum {self.lag_sum:.6f}",
+            f"bureaucrat_loop_lag_seconds_count {self.lag_count}",
+            "# HELP bureaucrat_loop_stalls_total Times the event loop was blocked for longer than the watchdog threshold.",
+            "# TYPE bureaucrat_loop_stalls_total counter",
+            f"bureaucrat_loop_stalls_total {stalls}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    async def serve(self, *, host: str = "127.0.0.1", port: int):
+        """
+        Starts a minimal HTTP endpoint that answers every request with the current exposition.
+        """
+
+        async def respond(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            try:
+                # Every path gets the same answer, so the request is only read far enough to be polite.
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                body = self.exposition().encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: text/plain; version=0.0.4\r\n"
+                    + f"Content-Length: {len(body)}\r\n".encode()
+                    + b"Connection: close\r\n\r\n"
+                    + body
+                )
+                await writer.drain()
+            finally:
+                writer.close()
+
+        self.server = await asyncio.start_server(respond, host=host, port=port)
+        self.bot.logger.info(f"Serving metrics on http://{host}:{port}/metrics.")
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
@@ -0,0 +1,121 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+
+from bureaucrat.utility import metrics
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from bureaucrat import Bureaucrat
+
+
+class Stall:
+    """
+    A moment when the event loop stopped turning: what it was running, and where.
+    """
+
+    __slots__ = ("when", "command", "task", "stack", "lag")
+
+    def __init__(self, *, command: Optional[str], task: Optional[str], stack: str):
+        self.when = datetime.now()
+        self.command = command
+        self.task = task
+        self.stack = stack
+        self.lag = 0.0
+
+
+class Watchdog:
+    """
+    Watches the event loop for blocking calls.
+    A heartbeat on the loop measures how late its timer fires (the loop lag). A thread beside the loop notices when the
+    heartbeat goes quiet for longer than the threshold, and captures the loop thread's stack while it is still blocked,
+    so the report points at the offending call rather than at whatever ran after it.
+    """
+
+    INTERVAL_MS = 100
+    THRESHOLD_MS = 250
+
+    def __init__(self, bot: "Bureaucrat", *, interval_ms: float = INTERVAL_MS, threshold_ms: float = THRESHOLD_MS):
+        self.bot = bot
+        self.interval = interval_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self.beat = time.monotonic()
+        self.stall: Optional[Stall] = None
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.loop_thread: Optional[int] = None
+        self.task: Optional[asyncio.Task] = None
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """
+        Starts watching the running loop.
+        """
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread = threading.get_ident()
+        self.beat = time.monotonic()
+        self.stopping.clear()
+        self.task = self.loop.create_task(self.heartbeat(), name="bureaucrat-watchdog")
+        self.thread = threading.Thread(target=self.watch, name="bureaucrat-watchdog", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopping.set()
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    async def heartbeat(self):
+        """
+        Runs on the loop, recording how late each tick is, and reporting a stall once the loop has recovered from it.
+        """
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - start - self.interval)
+
+            with self.lock:
+                self.beat = now
+                stall, self.stall = self.stall, None
+
+            self.bot.metrics.record_lag(lag)
+            if stall is not None:
+                stall.lag = lag
+                self.bot.metrics.record_stall(stall)
+                self.bot.logger.warning(f"The event loop recovered after being blocked for {lag * 1000:.0f} ms.")
+
+    def watch(self):
+        """
+        Runs on its own thread, capturing the loop thread's stack once per stall.
+        """
+        while not self.stopping.wait(self.interval / 2):
+            with self.lock:
+                if self.stall is not None or time.monotonic() - self.beat < self.interval + self.threshold:
+                    continue
+                self.stall = stall = self.capture()
+
+            blame = f" in {stall.command}" if stall.command else ""
+            self.bot.logger.warning(
+                f"The event loop has been blocked for over {self.threshold * 1000:.0f} ms{blame} (task {stall.task}):\n{stall.stack}"
+            )
+
+    def capture(self) -> Stall:
+        """
+        Snapshots what the loop thread is doing right now.
+        """
+        frame = sys._current_frames().get(self.loop_thread)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else "(no stack)"
+
+        # The task that is running is the one blocking the loop; its context says which command it belongs to.
+        task = asyncio.current_task(self.loop)
+        command = None
+        if task is not None:
+            sample = task.get_context().get(metrics._current)
+            command = sample.command if sample is not None else None
+
+        return Stall(command=command, task=task.get_name() if task is not None else None, stack=stack)
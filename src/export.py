@@ -0,0 +1,36 @@
+import argparse
+import asyncio
+import dotenv
+import sys
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Export every game's seating, nominations, votes and outcomes.")
+    parser.add_argument("--env", help="path to a .env file", default=".env")
+    parser.add_argument("--format", help="one JSON record per game, or one CSV row per vote", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--out", help="path to write to (defaults to stdout)", default=None)
+    parser.add_argument("--guild", help="only export games in this guild", type=int, default=None)
+    args = parser.parse_args()
+
+    dotenv.load_dotenv(args.env, override=True)
+
+    from bureaucrat import models
+    from bureaucrat.utility import export
+
+    async def run():
+        await models.setup()
+        try:
+            if args.out is None:
+                return await export.export(sys.stdout, format=args.format, guild=args.guild)
+            with open(args.out, "w", encoding="utf-8", newline="") as out:
+                return await export.export(out, format=args.format, guild=args.guild)
+        finally:
+            await models.CONFIG.database.disconnect()
+
+    count = asyncio.run(run())
+    print(f"Exported {count} games.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
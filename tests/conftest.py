@@ -0,0 +1,30 @@
+import os
+import pytest
+import sys
+
+# Bureaucrat lives under src/, which isn't on the path when running from the repository root.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+# Only tests that need a database use it, and only a scratch database named by DATABASE_URL; importing Bureaucrat
+# configures the database without connecting to it, so the others just need some URL.
+DATABASE = "DATABASE_URL" in os.environ
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/bureaucrat")
+
+
+@pytest.fixture(scope="session")
+def database():
+    """
+    Brings the scratch database up to the latest migration, or skips the test without one.
+    """
+    if not DATABASE:
+        pytest.skip("set DATABASE_URL to a scratch database to run this test")
+
+    from alembic import command
+    from alembic.config import Config
+
+    cwd = os.getcwd()
+    os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    try:
+        command.upgrade(Config("alembic.ini"), "head")
+    finally:
+        os.chdir(cwd)
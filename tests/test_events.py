@@ -0,0 +1,70 @@
+import asyncio
+import contextvars
+
+from bureaucrat import models
+from bureaucrat.models import CONFIG
+from bureaucrat.models.events import APPLIERS, EventLog
+from bureaucrat.models.games import Game
+from bureaucrat.models.state import State
+from bureaucrat.models.state.seating import Seat
+from datetime import datetime
+
+ID = "test-events"
+
+
+def make_state() -> dict:
+    state = State()
+    state.seating.seats = [Seat(id=f"s{i}", member=i, alias=f"P{i}") for i in range(5)]
+    state.seating.recount()
+    state.nominations.create(state=state, nominator="s0", nominee="s1")
+    return state.dump()
+
+
+def test_appliers_report_changes_that_no_longer_apply():
+    state = State.load(make_state())
+    nominate = {"nominator": "s2", "nominee": "s1", "message": None}
+    lock = {"voter": "s2", "nominee": "s1", "result": 1}
+
+    assert APPLIERS["nomination.create"](state, nominate) is not None
+    assert APPLIERS["vote.lock"](state, lock) is None
+    assert APPLIERS["vote.set"](state, {"voter": "s2", "nominee": "s1", "vote": "no", "private": False}) is not None
+    assert APPLIERS["seat.swap"](state, {"lhs": "s0", "rhs": "gone"}) is not None
+
+
+async def vote(game: Game, voter: str, text: str):
+    async with CONFIG.database.transaction():
+        state = State.load(game.state)
+        state.nominations.set_vote(state=state, voter=voter, nominee="s1", vote=text, private=False)
+        await EventLog.append(game, state, "vote.set", voter=voter, nominee="s1", vote=text, private=False)
+
+
+def test_concurrent_appends_both_land(database):
+    async def run():
+        await models.setup()
+        try:
+            await Game.objects.filter(id=ID).delete()
+            state = State.load(make_state())
+            await Game.objects.create(
+                id=ID, created=datetime.now(), guild=1, channel=2, owner=3, player_role=4, st_role=5, config={},
+                state=state.dump(),
+            )
+
+            # Both commands start from the same copy of the game, as if they had loaded it at the same time; each runs on
+            # its own connection.
+            first, second = await Game.objects.get(id=ID), await Game.objects.get(id=ID)
+            await asyncio.gather(
+                asyncio.create_task(vote(first, "s2", "yes"), context=contextvars.Context()),
+                asyncio.create_task(vote(second, "s3", "no"), context=contextvars.Context()),
+            )
+
+            game = await EventLog.materialize(await Game.objects.get(id=ID))
+            nomination = State.load(game.state).nominations.get_specific_nomination(1, "s1")
+            votes = {vote.id: vote.vote for vote in nomination.voters}
+            assert game.revision == 2
+            assert (votes["s2"], votes["s3"]) == ("yes", "no")
+            assert [event.revision for event in await EventLog.history(game)] == [1, 2]
+        finally:
+            await Game.objects.filter(id=ID).delete()
+            await CONFIG.database.disconnect()
+
+    asyncio.run(run())
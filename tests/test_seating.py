@@ -0,0 +1,48 @@
+import random
+
+from bureaucrat.models.state import State, Status, Type
+from bureaucrat.models.state.seating import Seat
+
+
+class User:
+    def __init__(self, id: int):
+        self.id = id
+        self.display_name = f"P{id}"
+
+
+def test_counts_follow_every_change():
+    rng = random.Random(0)
+    state = State()
+    for id in range(12):
+        state.seating.add_player(user=User(id), kind=rng.choice(list(Type)), role=None, apparent=None)
+
+    for _ in range(200):
+        seat = rng.choice(state.seating.seats)
+        match rng.randrange(3):
+            case 0:
+                state.seating.set_status(id=seat.id, status=rng.choice(list(Status)))
+            case 1:
+                state.seating.set_type(id=seat.id, type=rng.choice(list(Type)))
+            case 2:
+                state.seating.remove_player(id=seat.id)
+
+        seats = state.seating.seats
+        assert state.seating.alive == sum(seat.status == Status.Alive for seat in seats)
+        assert state.seating.dead == sum(seat.status == Status.Dead for seat in seats)
+        assert state.seating.spent == sum(seat.status == Status.Spent for seat in seats)
+        assert state.seating.travellers == sum(seat.kind == Type.Traveller for seat in seats)
+        assert state.seating.removed == sum(seat.removed for seat in seats)
+
+
+def test_removed_seats_still_count_towards_requirements():
+    state = State()
+    state.seating.seats = [Seat(id=f"s{i}", member=i, alias=f"P{i}", removed=i < 2) for i in range(6)]
+    state.seating.recount()
+
+    assert state.seating.get_required_votes_for(Type.Player) == 3
+    assert state.seating.get_required_votes_for(Type.Traveller) == 3
+
+    state.seating.set_status(id="s0", status=Status.Dead)
+    assert state.seating.get_required_votes_for(Type.Player) == 3
+    state.seating.set_status(id="s2", status=Status.Dead)
+    assert state.seating.get_required_votes_for(Type.Player) == 2
@@ -0,0 +1,57 @@
+from bureaucrat.models.state import State, Status, VoteResult
+from bureaucrat.models.state.seating import Seat
+from bureaucrat.nominations.batch import parse_batch
+
+
+def make_state(count: int = 5) -> State:
+    state = State()
+    state.seating.seats = [Seat(id=f"s{i}", member=i, alias=f"P{i}") for i in range(count)]
+    state.seating.recount()
+    state.nominations.create(state=state, nominator="s0", nominee="s1")
+    return state
+
+
+def test_parse_reads_yes_and_no():
+    assert VoteResult.parse("Yes!") == VoteResult.Yes
+    assert VoteResult.parse("hand down") == VoteResult.No
+    assert VoteResult.parse(None) == VoteResult.No
+    assert VoteResult.parse("yes if they claim chef") is None
+
+
+def test_parse_ignores_modifiers():
+    assert VoteResult.parse("bureaucrat") is None
+    assert VoteResult.parse("Thief") is None
+
+
+def test_clockhand_stops_at_a_written_modifier():
+    state = make_state()
+    nomination = state.nominations.get_specific_nomination(1, "s1")
+    nomination.voters[0].vote = "yes"
+    nomination.voters[1].vote = "bureaucrat"
+
+    locked, halted = nomination.advance(state=state)
+
+    assert (locked, halted) == (1, nomination.voters[1].id)
+    assert nomination.voters[1].locked is None
+    assert nomination.tally == 1
+
+
+def test_storytellers_can_still_lock_modifiers():
+    state = make_state()
+    nomination = state.nominations.get_specific_nomination(1, "s1")
+
+    results, errors = parse_batch("bureaucrat, thief, yes", state=state, nomination=nomination)
+
+    assert errors == []
+    assert [results[vote.id] for vote in nomination.voters[:3]] == [VoteResult.Bureaucrat, VoteResult.Thief, VoteResult.Yes]
+
+
+def test_spent_ghost_votes_lock_as_no():
+    state = make_state()
+    nomination = state.nominations.get_specific_nomination(1, "s1")
+    state.seating.set_status(id=nomination.voters[0].id, status=Status.Spent)
+    nomination.voters[0].vote = "yes"
+
+    nomination.advance(state=state, limit=1)
+
+    assert nomination.voters[0].locked == VoteResult.No